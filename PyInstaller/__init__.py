@@ -34,11 +34,23 @@
 # Where to put all the temporary files; .log, .pyz, etc.
 DEFAULT_WORKPATH = os.path.join(os.getcwd(), 'build')
 
-PLATFORM = compat.system + '-' + compat.architecture
-# Include machine name in path to bootloader for some machines (e.g., 'arm'). Explicitly avoid doing this on macOS,
-# where we keep universal2 bootloaders in Darwin-64bit folder regardless of whether we are on x86_64 or arm64.
-if compat.machine and not compat.is_darwin:
-    PLATFORM += '-' + compat.machine
-# Similarly, disambiguate musl Linux from glibc Linux.
-if compat.is_musl:
-    PLATFORM += '-musl'
+
+def _get_platform():
+    platform = compat.system + '-' + compat.architecture
+    # Include machine name in path to bootloader for some machines (e.g., 'arm'). Explicitly avoid doing this on macOS,
+    # where we keep universal2 bootloaders in Darwin-64bit folder regardless of whether we are on x86_64 or arm64.
+    if compat.machine and not compat.is_darwin:
+        platform += '-' + compat.machine
+    # Similarly, disambiguate musl Linux from glibc Linux.
+    if compat.is_musl:
+        platform += '-musl'
+    return platform
+
+
+def __getattr__(name):
+    # `PLATFORM` is computed on first access, as it requires probing the environment (see `compat.__getattr__`).
+    if name == 'PLATFORM':
+        global PLATFORM
+        PLATFORM = _get_platform()
+        return PLATFORM
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -70,6 +70,16 @@ def run_build(pyi_config, spec_file, **kwargs):
     PyInstaller.building.build_main.main(pyi_config, spec_file, **kwargs)
 
 
+class _ServerAction(argparse.Action):
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        import PyInstaller.building.server
+        PyInstaller.building.server.serve()
+        parser.exit()
+
+
 def __add_options(parser):
     parser.add_argument(
         '-v',
@@ -78,6 +88,13 @@ def __add_options(parser):
         version=__version__,
         help='Show program version info and exit.',
     )
+    parser.add_argument(
+        '--server',
+        action=_ServerAction,
+        help="Run a build server that keeps PyInstaller's state warm between builds, and exit when interrupted. While "
+        "the server is running, the pyinstaller command forwards builds to it if the PYINSTALLER_USE_SERVER "
+        "environment variable is set. Not available on Windows.",
+    )
 
 
 class _PyiArgumentParser(argparse.ArgumentParser):
@@ -167,6 +184,16 @@ def run(pyi_args: list | None = None, pyi_config: dict | None = None):
 
     import PyInstaller.log
 
+    # Forward the command-line build to the build server, if requested and if one is running.
+    if pyi_args is None and '--server' not in sys.argv[1:] and compat.getenv('PYINSTALLER_USE_SERVER', '0') != '0':
+        import PyInstaller.building.server
+        try:
+            exit_code = PyInstaller.building.server.forward_build(sys.argv[1:])
+        except KeyboardInterrupt:
+            raise SystemExit("Aborted by user request.")
+        if exit_code is not None:
+            raise SystemExit(exit_code)
+
     old_sys_argv = sys.argv
     try:
         parser = generate_parser()
@@ -12,16 +12,99 @@
 Python-based CArchive (PKG) reader implementation. Used only in the archive_viewer utility.
 """
 
+import io
 import os
 import struct
+import zlib
 
-from PyInstaller.loader.pyimod01_archive import ZlibArchiveReader, ArchiveReadError
+from PyInstaller.loader import pyimod01_archive
+from PyInstaller.loader.pyimod01_archive import ArchiveReadError
 
 
 class NotAnArchiveError(TypeError):
     pass
 
 
+def _copy_entry_data(source, offset, length, fileobj, compressed, chunk_size):
+    """
+    Copy `length` bytes of entry data, located at `offset` in `source`, into the writable binary file object `fileobj`.
+    The `source` is either an open binary file, or a memory map of the whole file; the latter is accessed via slicing
+    only, so that a single map can be shared between threads. If `compressed` is set, the data is inflated on the fly.
+    Both reading and inflating are performed in chunks of at most `chunk_size` bytes. Returns the number of bytes
+    written.
+    """
+    if hasattr(source, 'readinto'):
+        # Binary file.
+        def _read(position, size):
+            source.seek(position, os.SEEK_SET)
+            return source.read(size)
+    else:
+        # Memory map.
+        def _read(position, size):
+            return source[position:position + size]
+
+    decompressor = zlib.decompressobj() if compressed else None
+    written = 0
+    position = offset
+    end = offset + length
+    while position < end:
+        chunk = _read(position, min(chunk_size, end - position))
+        if not chunk:
+            raise ArchiveReadError("Unexpected end of archive data!")
+        position += len(chunk)
+        if decompressor is None:
+            fileobj.write(chunk)
+            written += len(chunk)
+            continue
+        # Limit the size of each inflated block, so that highly-compressed data does not blow up the memory usage.
+        while chunk:
+            data = decompressor.decompress(chunk, chunk_size)
+            fileobj.write(data)
+            written += len(data)
+            chunk = decompressor.unconsumed_tail
+
+    if decompressor is not None:
+        data = decompressor.flush()
+        fileobj.write(data)
+        written += len(data)
+        if length and not decompressor.eof:
+            raise ArchiveReadError("Truncated compressed archive data!")
+
+    return written
+
+
+class ZlibArchiveReader(pyimod01_archive.ZlibArchiveReader):
+    """
+    Reader for PyInstaller's PYZ (ZlibArchive) archive, extended with the functionality that is needed only by the
+    archive_viewer utility (and is thus kept out of the bootstrap module).
+    """
+
+    # Size of the chunks in which `extract_to` reads and inflates the entry data.
+    _EXTRACT_CHUNK_SIZE = 1024 * 1024
+
+    def extract_to(self, name, fileobj, mapping=None):
+        """
+        Extract raw (decompressed, but not unmarshaled) data from entry with the given name into the writable binary
+        file object `fileobj`, without holding the whole entry in memory. Returns the number of bytes written.
+
+        If `mapping` is given, it must be a memory map of the whole archive file, which is then read from instead of
+        opening the file. Unlike an open file, the map can be shared by multiple threads extracting at the same time.
+        """
+        if name in self._shared_entries:
+            return self._shared_entries[name].extract_to(name, fileobj)
+
+        entry = self.toc.get(name)
+        if entry is None:
+            raise KeyError(f"No entry named {name} found in the archive!")
+        typecode, entry_offset, entry_length = entry
+
+        offset = self._start_offset + entry_offset
+        if mapping is not None:
+            return _copy_entry_data(mapping, offset, entry_length, fileobj, True, self._EXTRACT_CHUNK_SIZE)
+        with open(self._filename, "rb") as fp:
+            return _copy_entry_data(fp, offset, entry_length, fileobj, True, self._EXTRACT_CHUNK_SIZE)
+
+
 # Type codes for CArchive TOC entries
 PKG_ITEM_BINARY = 'b'  # binary
 PKG_ITEM_DEPENDENCY = 'd'  # runtime option
@@ -74,6 +157,9 @@ class CArchiveReader:
     _TOC_ENTRY_FORMAT = '!IIIIBc'
     _TOC_ENTRY_LENGTH = struct.calcsize(_TOC_ENTRY_FORMAT)
 
+    # Size of the chunks in which `extract_to` reads and inflates the entry data.
+    _EXTRACT_CHUNK_SIZE = 1024 * 1024
+
     def __init__(self, filename):
         self._filename = filename
         self._start_offset = 0
@@ -169,21 +255,29 @@ def extract(self, name):
         """
         Extract data for the given entry name.
         """
+        with io.BytesIO() as fp:
+            self.extract_to(name, fp)
+            return fp.getvalue()
+
+    def extract_to(self, name, fileobj, mapping=None):
+        """
+        Extract data for the given entry name into the writable binary file object `fileobj`. The data is read and
+        decompressed in chunks, so the whole entry is never held in memory. Returns the number of bytes written.
+
+        If `mapping` is given, it must be a memory map of the whole archive file, which is then read from instead of
+        opening the file. Unlike an open file, the map can be shared by multiple threads extracting at the same time.
+        """
 
         entry = self.toc.get(name)
         if entry is None:
             raise KeyError(f"No entry named {name} found in the archive!")
 
         entry_offset, data_length, uncompressed_length, compression_flag, typecode = entry
+        offset = self._start_offset + entry_offset
+        if mapping is not None:
+            return _copy_entry_data(mapping, offset, data_length, fileobj, compression_flag, self._EXTRACT_CHUNK_SIZE)
         with open(self._filename, "rb") as fp:
-            fp.seek(self._start_offset + entry_offset, os.SEEK_SET)
-            data = fp.read(data_length)
-
-        if compression_flag:
-            import zlib
-            data = zlib.decompress(data)
-
-        return data
+            return _copy_entry_data(fp, offset, data_length, fileobj, compression_flag, self._EXTRACT_CHUNK_SIZE)
 
     def open_embedded_archive(self, name):
         """
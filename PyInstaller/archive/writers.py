@@ -12,6 +12,9 @@
 Utilities to create data structures for embedding Python modules and additional files into the executable.
 """
 
+import collections
+import concurrent.futures
+import hashlib
 import marshal
 import os
 import shutil
@@ -19,9 +22,13 @@
 import sys
 import zlib
 
-from PyInstaller.building.utils import get_code_object, strip_paths_in_code
+from PyInstaller import log as logging
+from PyInstaller.building.utils import _get_file_digest, get_code_object, strip_paths_in_code
 from PyInstaller.compat import BYTECODE_MAGIC, is_win, strict_collect_mode
-from PyInstaller.loader.pyimod01_archive import PYZ_ITEM_MODULE, PYZ_ITEM_NSPKG, PYZ_ITEM_PKG
+from PyInstaller.loader.pyimod01_archive import PYZ_ITEM_DATA, PYZ_ITEM_MODULE, PYZ_ITEM_NSPKG, PYZ_ITEM_PKG, \
+    PYZ_ITEM_SHARED
+
+logger = logging.getLogger(__name__)
 
 
 class ZlibArchiveWriter:
@@ -33,18 +40,27 @@ class ZlibArchiveWriter:
     _HEADER_LENGTH = 12 + 5
     _COMPRESSION_LEVEL = 6  # zlib compression level
 
-    def __init__(self, filename, entries, code_dict=None):
+    def __init__(self, filename, entries, code_dict=None, blob_cache=None):
         """
         filename
             Target filename of the archive.
         entries
             An iterable containing entries in the form of tuples: (name, src_path, typecode), where `name` is the name
             under which the resource is stored (e.g., python module name, without suffix), `src_path` is name of the
-            file from which the resource is read, and `typecode` is the Analysis-level TOC typecode (`PYMODULE`).
+            file from which the resource is read, and `typecode` is the Analysis-level TOC typecode (`PYMODULE`, or
+            `DATA` for packed data files, which are stored under their destination path, using '/' as separator, or
+            `PYZ-SHARED` for the references to modules in the shared PYZ archive of a `MERGE`'d suite, whose
+            `src_path` is the path to the shared archive).
+            The references are stored as a single entry per shared archive, named by the archive's base name, whose
+            data is the marshaled list of the referenced module names.
         code_dict
             Optional code dictionary containing code objects for analyzed/collected python modules.
+        blob_cache
+            Optional `PyInstaller.building.cache.BlobCache` instance, used to look up (and store) the compressed data
+            of entries instead of re-compressing it.
         """
         code_dict = code_dict or {}
+        self._blob_cache = blob_cache
 
         with open(filename, "wb") as fp:
             # Reserve space for the header.
@@ -52,10 +68,22 @@ def __init__(self, filename, entries, code_dict=None):
 
             # Write entries' data and collect TOC entries
             toc = []
+            shared_refs = collections.defaultdict(list)
             for entry in entries:
+                name, src_path, typecode = entry
+                if typecode == 'PYZ-SHARED':
+                    shared_refs[src_path].append(name)
+                    continue
                 toc_entry = self._write_entry(fp, entry, code_dict)
                 toc.append(toc_entry)
 
+            # Write references to shared PYZ archives.
+            for src_path, names in shared_refs.items():
+                toc_entry = self._write_blob(
+                    fp, os.path.basename(src_path), PYZ_ITEM_SHARED, marshal.dumps(sorted(names))
+                )
+                toc.append(toc_entry)
+
             # Write TOC
             toc_offset = fp.tell()
             toc_data = marshal.dumps(toc)
@@ -72,10 +100,16 @@ def __init__(self, filename, entries, code_dict=None):
             fp.write(BYTECODE_MAGIC)
             fp.write(struct.pack('!i', toc_offset))
 
-    @classmethod
-    def _write_entry(cls, fp, entry, code_dict):
+    def _write_entry(self, fp, entry, code_dict):
         name, src_path, typecode = entry
-        assert typecode in {'PYMODULE', 'PYMODULE-1', 'PYMODULE-2'}
+        assert typecode in {'PYMODULE', 'PYMODULE-1', 'PYMODULE-2', 'DATA'}
+
+        if typecode == 'DATA':
+            # Packed data file; use '/' as path separator regardless of the OS, so that the names never collide with
+            # module names and can be looked up directly at run-time.
+            with open(src_path, 'rb') as src_fp:
+                data = src_fp.read()
+            return self._write_blob(fp, name.replace(os.sep, '/'), PYZ_ITEM_DATA, data)
 
         typecode = PYZ_ITEM_MODULE
         if src_path in ('-', None):
@@ -88,8 +122,10 @@ def _write_entry(cls, fp, entry, code_dict):
                 typecode = PYZ_ITEM_PKG
         data = marshal.dumps(code_dict[name])
 
-        # First compress, then encrypt.
-        obj = zlib.compress(data, cls._COMPRESSION_LEVEL)
+        return self._write_blob(fp, name, typecode, data)
+
+    def _write_blob(self, fp, name, typecode, data):
+        obj = self._compress(data)
 
         # Create TOC entry
         toc_entry = (name, (typecode, fp.tell(), len(obj)))
@@ -99,6 +135,20 @@ def _write_entry(cls, fp, entry, code_dict):
 
         return toc_entry
 
+    def _compress(self, data):
+        if self._blob_cache is None:
+            return zlib.compress(data, self._COMPRESSION_LEVEL)
+
+        key = self._blob_cache.make_key(hashlib.sha1(data).hexdigest(), 'zlib', self._COMPRESSION_LEVEL)
+        blob_file = self._blob_cache.lookup(key, len(data))
+        if blob_file is not None:
+            with open(blob_file, 'rb') as fp:
+                return fp.read()
+
+        obj = zlib.compress(data, self._COMPRESSION_LEVEL)
+        self._blob_cache.store(key, obj)
+        return obj
+
 
 class CArchiveWriter:
     """
@@ -118,28 +168,77 @@ class CArchiveWriter:
     _TOC_ENTRY_FORMAT = '!IIIIBc'
     _TOC_ENTRY_LENGTH = struct.calcsize(_TOC_ENTRY_FORMAT)
 
-    _COMPRESSION_LEVEL = 9  # zlib compression level
+    _COMPRESSION_LEVEL = 9  # Default zlib compression level
+
+    # Size of the data sample that is used in trial compression, when `compress_min_ratio` is specified.
+    _COMPRESSION_SAMPLE_SIZE = 64 * 1024
 
-    def __init__(self, filename, entries, pylib_name):
+    # Files larger than the chunk size are compressed as a sequence of independently-deflated chunks, which allows the
+    # chunks to be compressed concurrently. Each chunk uses the preceding 32 kB of data as the preset dictionary, and
+    # the chunks are joined into a single zlib stream, so the compression ratio is practically unaffected and the
+    # bootloader can inflate the stream as usual. The output does not depend on the number of worker threads.
+    _COMPRESSION_CHUNK_SIZE = 1024 * 1024
+    _COMPRESSION_WINDOW_SIZE = 32 * 1024
+
+    # CArchive typecodes of entries that are subject to content deduplication (binaries and data files).
+    _DEDUP_TYPECODES = {'b', 'x'}
+
+    def __init__(self, filename, entries, pylib_name, compress_min_ratio=None, blob_cache=None, dedup=False):
         """
         filename
             Target filename of the archive.
         entries
             An iterable containing entries in the form of tuples: (dest_name, src_name, compress, typecode), where
             `dest_name` is the name under which the resource is stored in the archive (and name under which it is
-            extracted at runtime), `src_name` is name of the file from which the resouce is read, `compress` is a
-            boolean compression flag, and `typecode` is the Analysis-level TOC typecode.
+            extracted at runtime), `src_name` is name of the file from which the resouce is read, `compress` is either
+            a boolean compression flag or a zlib compression level (with level 0 meaning no compression), and
+            `typecode` is the Analysis-level TOC typecode.
         pylib_name
             Name of the python shared library.
+        compress_min_ratio
+            Optional minimal compression ratio (uncompressed size divided by compressed size). If specified, a sample of
+            each entry that is to be compressed is first compressed at the fastest compression level, and if the ratio
+            falls below the given value, the entry is stored without compression.
+        blob_cache
+            Optional `PyInstaller.building.cache.BlobCache` instance, used to look up (and store) the compressed data
+            of entries instead of re-compressing it.
+        dedup
+            If True, the data of binaries and data files with identical contents (and compression setting) is written
+            only once, and their TOC entries refer to the same data in the archive.
         """
         self._collected_names = set()  # Track collected names for strict package mode.
+        self._blob_cache = blob_cache
+        self._blob_cache_writer = None  # Writer for the compressed data of the entry that is being written.
+
+        self._compress_min_ratio = compress_min_ratio
+        self._stored_entries = []  # Entries that were stored without compression due to low trial compression ratio.
+
+        self._dedup = dedup
+        self._dedup_keys = set()  # Keys (digest, compress) of entries whose data has been queued for writing.
+        self._dedup_toc_entries = {}  # Keys of entries whose data has been written, and their TOC entries.
+        self._entry_dedup_key = None  # Key of the entry that is being written.
+        self._dedup_count = 0
+        self._dedup_saved = 0
+
+        # The compression is performed by a pool of worker threads (zlib releases the GIL while compressing). The data
+        # is written to the archive in the order in which the entries are given; the queue holds the pending output,
+        # and the number of outstanding compression jobs is bounded in order to limit the memory usage.
+        self._queue = collections.deque()
+        self._num_pending_jobs = 0
+        self._toc = []
+        self._entry_offset = None
+
+        num_workers = os.cpu_count() or 1
+        self._max_pending_jobs = 2 * num_workers
+
+        with open(filename, "wb") as fp, concurrent.futures.ThreadPoolExecutor(num_workers) as executor:
+            self._executor = executor
 
-        with open(filename, "wb") as fp:
             # Write entries' data and collect TOC entries
-            toc = []
             for entry in entries:
-                toc_entry = self._write_entry(fp, entry)
-                toc.append(toc_entry)
+                self._write_entry(fp, entry)
+            self._flush_queue(fp, 0)
+            toc = self._toc
 
             # Write TOC
             toc_offset = fp.tell()
@@ -163,6 +262,23 @@ def __init__(self, filename, entries, pylib_name):
 
             fp.write(cookie_data)
 
+        if self._stored_entries:
+            logger.info(
+                "Stored %d entries (%d bytes) without compression due to compression ratio below %.2f.",
+                len(self._stored_entries),
+                sum(data_length for _, data_length in self._stored_entries),
+                self._compress_min_ratio,
+            )
+            for dest_name, data_length in self._stored_entries:
+                logger.debug("Stored without compression: %s (%d bytes)", dest_name, data_length)
+
+        if self._dedup_count:
+            logger.info(
+                "Deduplicated %d entries with identical contents, saving %d bytes.",
+                self._dedup_count,
+                self._dedup_saved,
+            )
+
     def _write_entry(self, fp, entry):
         dest_name, src_name, compress, typecode = entry
 
@@ -234,37 +350,225 @@ def _write_entry(self, fp, entry):
 
     def _write_blob(self, out_fp, blob: bytes, dest_name, typecode, compress=False):
         """
-        Write the binary contents (**blob**) of a small file to the archive and return the corresponding CArchive TOC
-        entry.
+        Queue the binary contents (**blob**) of a small file for writing to the archive; if compression is enabled, the
+        blob is compressed by a worker thread.
         """
-        data_offset = out_fp.tell()
-        data_length = len(blob)
-        if compress:
-            blob = zlib.compress(blob, level=self._COMPRESSION_LEVEL)
-        out_fp.write(blob)
+        level = self._get_compression_level(compress)
+        if level and self._compress_min_ratio:
+            level = self._check_compression_ratio(level, blob, dest_name, len(blob))
+
+        if level and self._blob_cache is not None and blob:
+            cache_key = self._blob_cache.make_key(hashlib.sha1(blob).hexdigest(), 'zlib', level)
+            if self._write_cached_blob(cache_key, len(blob), typecode, dest_name):
+                return
+        else:
+            cache_key = None
 
-        return (data_offset, len(blob), data_length, int(compress), typecode, dest_name)
+        self._queue.append(('begin', cache_key))
+        if level:
+            self._submit_job(out_fp, zlib.compress, blob, level)
+        else:
+            self._queue.append(('data', blob))
+        self._queue.append(('end', (len(blob), int(bool(level)), typecode, dest_name)))
 
     def _write_file(self, out_fp, src_name, dest_name, typecode, compress=False):
         """
-        Stream copy a large file into the archive and return the corresponding CArchive TOC entry.
+        Queue a large file for stream copying into the archive; if compression is enabled, the file is read and
+        compressed in chunks by worker threads.
         """
-        data_offset = out_fp.tell()
         data_length = os.stat(src_name).st_size
-        with open(src_name, 'rb') as in_fp:
-            if compress:
-                tmp_buffer = bytearray(16 * 1024)
-                compressor = zlib.compressobj(self._COMPRESSION_LEVEL)
-                while True:
-                    num_read = in_fp.readinto(tmp_buffer)
-                    if not num_read:
-                        break
-                    out_fp.write(compressor.compress(tmp_buffer[:num_read]))
-                out_fp.write(compressor.flush())
+
+        # If the contents of the file (with the same compression setting) have already been written, refer to the
+        # existing data instead.
+        if self._dedup and typecode in self._DEDUP_TYPECODES and data_length:
+            dedup_key = (_get_file_digest(src_name), compress)
+            if dedup_key in self._dedup_keys:
+                self._queue.append(('alias', (dedup_key, typecode, dest_name)))
+                return
+            self._dedup_keys.add(dedup_key)
+            self._queue.append(('dedup', dedup_key))
+
+        level = self._get_compression_level(compress)
+
+        # Look up the compressed data in the blob cache. The key is based on the (memoized) digest of the file, which
+        # avoids reading unchanged files altogether. Large files are compressed in chunks (see below), so the chunking
+        # parameters are part of the codec name. With trial compression, the minimal compression ratio is part of the
+        # codec name as well; a cached blob implies that the (deterministic) trial compression of the same data with the
+        # same ratio succeeded, so the sample does not need to be read again.
+        if level and self._blob_cache is not None and data_length:
+            if data_length <= self._COMPRESSION_CHUNK_SIZE:
+                codec = 'zlib'
             else:
-                shutil.copyfileobj(in_fp, out_fp)
+                codec = f'zlib-chunked-{self._COMPRESSION_CHUNK_SIZE}-{self._COMPRESSION_WINDOW_SIZE}'
+            if self._compress_min_ratio:
+                codec += f'-min-ratio-{self._compress_min_ratio}'
+            cache_key = self._blob_cache.make_key(_get_file_digest(src_name), codec, level)
+            if self._write_cached_blob(cache_key, data_length, typecode, dest_name):
+                return
+        else:
+            cache_key = None
+
+        if level and self._compress_min_ratio:
+            with open(src_name, 'rb') as in_fp:
+                sample = in_fp.read(self._COMPRESSION_SAMPLE_SIZE)
+            level = self._check_compression_ratio(level, sample, dest_name, data_length)
+
+        if not level:
+            self._queue.append(('begin', None))
+            self._queue.append(('file', src_name))
+            self._queue.append(('end', (data_length, 0, typecode, dest_name)))
+            return
+
+        if data_length <= self._COMPRESSION_CHUNK_SIZE:
+            with open(src_name, 'rb') as in_fp:
+                data = in_fp.read()
+            self._queue.append(('begin', cache_key))
+            self._submit_job(out_fp, zlib.compress, data, level)
+            self._queue.append(('end', (data_length, 1, typecode, dest_name)))
+            return
+
+        self._queue.append(('begin', cache_key))
+        self._queue.append(('data', self._zlib_header(level)))
+        checksum = zlib.adler32(b'')
+        zdict = None
+        with open(src_name, 'rb') as in_fp:
+            while True:
+                chunk = in_fp.read(self._COMPRESSION_CHUNK_SIZE)
+                if not chunk:
+                    break
+                checksum = zlib.adler32(chunk, checksum)
+                self._submit_job(out_fp, self._deflate_chunk, chunk, level, zdict)
+                zdict = chunk[-self._COMPRESSION_WINDOW_SIZE:]
+        # Terminate the deflate stream with an empty final block, and append the checksum of uncompressed data.
+        self._queue.append(('data', zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS).flush()))
+        self._queue.append(('data', struct.pack('!I', checksum)))
+        self._queue.append(('end', (data_length, 1, typecode, dest_name)))
+
+    def _write_cached_blob(self, cache_key, data_length, typecode, dest_name):
+        """
+        Look up the compressed data in the blob cache, and if found, queue the cached blob for copying into the archive.
+        Returns True on cache hit, False on cache miss.
+        """
+        blob_file = self._blob_cache.lookup(cache_key, data_length)
+        if blob_file is None:
+            return False
+        self._queue.append(('begin', None))
+        self._queue.append(('file', blob_file))
+        self._queue.append(('end', (data_length, 1, typecode, dest_name)))
+        return True
+
+    def _get_compression_level(self, compress):
+        """
+        Resolve the `compress` value of an entry (boolean flag or compression level) into zlib compression level, with
+        0 meaning that the entry should be stored without compression.
+        """
+        if compress is True:
+            return self._COMPRESSION_LEVEL
+        return int(compress)
 
-        return (data_offset, out_fp.tell() - data_offset, data_length, int(compress), typecode, dest_name)
+    def _check_compression_ratio(self, level, sample, dest_name, data_length):
+        """
+        Perform trial compression of (the beginning of) the given data **sample**; return the given compression level
+        if the data compresses at least by the minimal compression ratio, and 0 otherwise.
+        """
+        if sample:
+            sample = sample[:self._COMPRESSION_SAMPLE_SIZE]
+            ratio = len(sample) / len(zlib.compress(sample, 1))
+            if ratio >= self._compress_min_ratio:
+                return level
+
+        if data_length:
+            self._stored_entries.append((dest_name, data_length))
+        return 0
+
+    @staticmethod
+    def _zlib_header(level):
+        # The header produced by zlib for the given compression level; the stream data itself is empty.
+        return zlib.compress(b'', level)[:2]
+
+    @staticmethod
+    def _deflate_chunk(data, level, zdict):
+        """
+        Compress a chunk of data into raw deflate blocks, without marking the last block as final. The output is
+        byte-aligned, so it can be directly concatenated with the compressed data of subsequent chunk.
+        """
+        if zdict:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict)
+        else:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def _submit_job(self, out_fp, func, *args):
+        self._queue.append(('job', self._executor.submit(func, *args)))
+        self._num_pending_jobs += 1
+        self._flush_queue(out_fp, self._max_pending_jobs)
+
+    def _flush_queue(self, out_fp, max_pending_jobs):
+        """
+        Write out the queued data until the number of pending compression jobs drops to **max_pending_jobs** (or until
+        the queue is empty, if **max_pending_jobs** is 0), and collect the corresponding CArchive TOC entries.
+        """
+        while self._queue and (self._num_pending_jobs > max_pending_jobs or max_pending_jobs == 0):
+            kind, value = self._queue.popleft()
+            if kind == 'dedup':
+                # The following entry's TOC entry should be recorded for deduplication.
+                self._entry_dedup_key = value
+            elif kind == 'alias':
+                dedup_key, typecode, dest_name = value
+                data_offset, compressed_length, data_length, compress, _, _ = self._dedup_toc_entries[dedup_key]
+                self._toc.append((data_offset, compressed_length, data_length, compress, typecode, dest_name))
+                self._dedup_count += 1
+                self._dedup_saved += compressed_length
+            elif kind == 'begin':
+                self._entry_offset = out_fp.tell()
+                # If cache key is given, the entry's compressed data is also stored in the blob cache.
+                if value is not None:
+                    self._blob_cache_writer = self._blob_cache.open_writer(value)
+            elif kind == 'data':
+                out_fp.write(value)
+                if self._blob_cache_writer is not None:
+                    self._blob_cache_writer.write(value)
+            elif kind == 'job':
+                data = value.result()
+                out_fp.write(data)
+                if self._blob_cache_writer is not None:
+                    self._blob_cache_writer.write(data)
+                self._num_pending_jobs -= 1
+            elif kind == 'file':
+                self._copy_file(value, out_fp)
+            else:  # 'end'
+                data_length, compress, typecode, dest_name = value
+                compressed_length = out_fp.tell() - self._entry_offset
+                self._toc.append((self._entry_offset, compressed_length, data_length, compress, typecode, dest_name))
+                if self._entry_dedup_key is not None:
+                    self._dedup_toc_entries[self._entry_dedup_key] = self._toc[-1]
+                    self._entry_dedup_key = None
+                if self._blob_cache_writer is not None:
+                    self._blob_cache_writer.commit()
+                    self._blob_cache_writer = None
+
+    @staticmethod
+    def _copy_file(src_name, out_fp):
+        """
+        Copy the contents of the given file to the output file; if available, use `os.copy_file_range`, which avoids
+        copying the data through user space (and on some file systems, shares the data blocks between the files).
+        """
+        with open(src_name, 'rb') as in_fp:
+            if hasattr(os, 'copy_file_range'):
+                out_fp.flush()
+                offset = out_fp.tell()
+                try:
+                    while True:
+                        copied = os.copy_file_range(in_fp.fileno(), out_fp.fileno(), 1 << 30, offset_dst=offset)
+                        if not copied:
+                            break
+                        offset += copied
+                    out_fp.seek(offset)
+                    return
+                except OSError:
+                    # Not supported by the file system (or kernel); copy whatever is left.
+                    out_fp.seek(offset)
+            shutil.copyfileobj(in_fp, out_fp)
 
     @classmethod
     def _serialize_toc(cls, toc):
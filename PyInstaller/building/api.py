@@ -15,6 +15,8 @@
 is a way how PyInstaller does the dependency analysis and creates executable.
 """
 
+import collections
+import fnmatch
 import os
 import subprocess
 import time
@@ -25,10 +27,11 @@
 from PyInstaller import HOMEPATH, PLATFORM
 from PyInstaller import log as logging
 from PyInstaller.archive.writers import CArchiveWriter, ZlibArchiveWriter
+from PyInstaller.building import cache
 from PyInstaller.building.datastruct import Target, _check_guts_eq, normalize_pyz_toc, normalize_toc
 from PyInstaller.building.utils import (
-    _check_guts_toc, _make_clean_directory, _rmtree, process_collected_binary, get_code_object, strip_paths_in_code,
-    compile_pymodule
+    _check_guts_toc, _get_file_digest, _link_collected_file, _make_clean_directory, _rmtree, _save_file_digest_cache,
+    process_collected_binaries, get_code_object, strip_paths_in_code, compile_pymodule, is_upx_available
 )
 from PyInstaller.building.splash import Splash  # argument type validation in EXE
 from PyInstaller.compat import is_cygwin, is_darwin, is_linux, is_win, strict_collect_mode, is_nogil
@@ -52,7 +55,9 @@ class PYZ(Target):
     def __init__(self, *tocs, **kwargs):
         """
         tocs
-            One or more TOC (Table of Contents) lists, usually an `Analysis.pure`.
+            One or more TOC (Table of Contents) lists, usually an `Analysis.pure`. Besides the python modules, the
+            lists may contain `DATA` entries, which are packed into the archive (see `Analysis(packed_data=...)`), and
+            `PYZ-SHARED` references to modules in a shared PYZ archive (see `MERGE(shared_pyz=True)`).
 
         kwargs
             Possible keyword arguments:
@@ -112,8 +117,9 @@ def __init__(self, *tocs, **kwargs):
 
             for entry in toc:
                 name, _, typecode = entry
-                # PYZ expects only PYMODULE entries (python code objects).
-                assert typecode in {'PYMODULE', 'PYMODULE-1', 'PYMODULE-2'}, f"Invalid entry passed to PYZ: {entry}!"
+                # PYZ expects only PYMODULE entries (python code objects), packed DATA entries, and PYZ references.
+                assert typecode in {'PYMODULE', 'PYMODULE-1', 'PYMODULE-2', 'DATA', 'PYZ-SHARED'}, \
+                    f"Invalid entry passed to PYZ: {entry}!"
                 # Module required during bootstrap; skip to avoid collecting a duplicate.
                 if name in bootstrap_module_names:
                     continue
@@ -135,6 +141,8 @@ def __init__(self, *tocs, **kwargs):
     )
 
     def assemble(self):
+        from PyInstaller.config import CONF
+
         logger.info("Building PYZ (ZlibArchive) %s", self.name)
 
         # Ensure code objects are available for all modules we are about to collect.
@@ -142,6 +150,10 @@ def assemble(self):
         archive_toc = []
         for entry in self.toc:
             name, src_path, typecode = entry
+            if typecode in ('DATA', 'PYZ-SHARED'):
+                # Packed data file, or reference to the shared PYZ; stored as-is.
+                archive_toc.append(entry)
+                continue
             if name not in self.code_dict:
                 # The code object is not available from the ModuleGraph's cache; re-create it.
                 optim_level = {'PYMODULE': 0, 'PYMODULE-1': 1, 'PYMODULE-2': 2}[typecode]
@@ -155,8 +167,15 @@ def assemble(self):
         # Remove leading parts of paths in code objects.
         self.code_dict = {name: strip_paths_in_code(code) for name, code in self.code_dict.items()}
 
-        # Create the archive
-        ZlibArchiveWriter(self.name, archive_toc, code_dict=self.code_dict)
+        # Create the archive; if enabled, the compressed entries are cached, so that only modified modules need to be
+        # re-compressed.
+        ZlibArchiveWriter(
+            self.name,
+            archive_toc,
+            code_dict=self.code_dict,
+            blob_cache=cache.BlobCache(CONF['cachedir']) if CONF.get('archive_cache') else None,
+        )
+        cache.save_stats(CONF['cachedir'])
         logger.info("Building PYZ (ZlibArchive) %s completed successfully.", self.name)
 
 
@@ -199,7 +218,10 @@ def __init__(
         upx_exclude=None,
         target_arch=None,
         codesign_identity=None,
-        entitlements_file=None
+        entitlements_file=None,
+        compress_patterns=None,
+        compress_min_ratio=None,
+        dedup=False,
     ):
         """
         toc
@@ -210,8 +232,19 @@ def __init__(
             An optional filename for the PKG.
         cdict
             Dictionary that specifies compression by typecode. For Example, PYZ is left uncompressed so that it
-            can be accessed inside the PKG. The default uses sensible values. If zlib is not available, no
-            compression is used.
+            can be accessed inside the PKG. The values are either COMPRESSED/UNCOMPRESSED flags, or zlib compression
+            levels (0 to 9, with 0 meaning no compression). The default uses sensible values.
+        compress_patterns
+            An optional list of (pattern, compress) tuples that override the `cdict` setting for data files and binaries
+            whose destination name matches the given glob pattern. The first matching pattern applies. The `compress`
+            value is either a compression flag or a compression level, same as in `cdict`.
+        compress_min_ratio
+            Minimal trial compression ratio (uncompressed size divided by compressed size) for an entry to be stored
+            compressed. Entries that compress worse (for example, already-compressed images and archives) are stored
+            without compression. Defaults to None, which disables trial compression.
+        dedup
+            If True, the contents of binaries and data files that are identical to the contents of previously stored
+            entries are not stored again; instead, the entries refer to the already stored data.
         exclude_binaries
             If True, EXTENSIONs and BINARYs will be left out of the PKG, and forwarded to its container (usually
             a COLLECT).
@@ -234,6 +267,9 @@ def __init__(
         self.target_arch = target_arch
         self.codesign_identity = codesign_identity
         self.entitlements_file = entitlements_file
+        self.compress_patterns = [tuple(entry) for entry in compress_patterns or []]
+        self.compress_min_ratio = compress_min_ratio
+        self.dedup = dedup
 
         # This dict tells PyInstaller what items embedded in the executable should be compressed.
         if self.cdict is None:
@@ -251,8 +287,37 @@ def __init__(
                 'SYMLINK': UNCOMPRESSED,
             }
 
+        # Validate the compression settings.
+        for typecode, compress in self.cdict.items():
+            self._check_compression_setting(compress, f"typecode {typecode!r}")
+        for pattern, compress in self.compress_patterns:
+            self._check_compression_setting(compress, f"pattern {pattern!r}")
+
         self.__postinit__()
 
+    # Typecodes of entries to which the `compress_patterns` apply.
+    _COMPRESS_PATTERNS_TYPECODES = {'BINARY', 'EXTENSION', 'EXECUTABLE', 'DATA', 'ZIPFILE'}
+
+    @staticmethod
+    def _check_compression_setting(compress, description):
+        if isinstance(compress, bool):
+            return
+        if not isinstance(compress, int) or not 0 <= compress <= 9:
+            raise ValueError(
+                f"Invalid compression setting for {description}: {compress!r}! Expected COMPRESSED, UNCOMPRESSED, or "
+                "zlib compression level between 0 and 9."
+            )
+
+    def _get_compression(self, dest_name, typecode):
+        """
+        Determine the compression setting (flag or level) for the entry, based on `compress_patterns` and `cdict`.
+        """
+        if typecode in self._COMPRESS_PATTERNS_TYPECODES:
+            for pattern, compress in self.compress_patterns:
+                if fnmatch.fnmatch(dest_name, pattern):
+                    return compress
+        return self.cdict.get(typecode, False)
+
     _GUTS = (  # input parameters
         ('name', _check_guts_eq),
         ('cdict', _check_guts_eq),
@@ -265,10 +330,15 @@ def __init__(
         ('target_arch', _check_guts_eq),
         ('codesign_identity', _check_guts_eq),
         ('entitlements_file', _check_guts_eq),
+        ('compress_patterns', _check_guts_eq),
+        ('compress_min_ratio', _check_guts_eq),
+        ('dedup', _check_guts_eq),
         # no calculated/analysed values
     )
 
     def assemble(self):
+        from PyInstaller.config import CONF
+
         logger.info("Building PKG (CArchive) %s", os.path.basename(self.name))
 
         pkg_file = pathlib.Path(self.name).resolve()  # Used to detect attempts at PKG feeding itself
@@ -276,6 +346,21 @@ def assemble(self):
         bootstrap_toc = []  # TOC containing bootstrap scripts and modules, which must not be sorted.
         archive_toc = []  # TOC containing all other elements. Sorted to enable reproducible builds.
 
+        # Process the binaries (onefile mode) up-front, in parallel.
+        if self.exclude_binaries:
+            processed_binaries = {}
+        else:
+            processed_binaries = process_collected_binaries(
+                [(src_name, dest_name, typecode == 'EXTENSION') for dest_name, src_name, typecode in self.toc
+                 if typecode in ('BINARY', 'EXTENSION') and os.path.exists(src_name)],
+                use_strip=self.strip_binaries,
+                use_upx=self.upx_binaries,
+                upx_exclude=self.upx_exclude,
+                target_arch=self.target_arch,
+                codesign_identity=self.codesign_identity,
+                entitlements_file=self.entitlements_file,
+            )
+
         for dest_name, src_name, typecode in self.toc:
             # Ensure that the source file exists, if necessary. Skip the check for OPTION entries, where 'src_name' is
             # None. Also skip DEPENDENCY entries due to special contents of 'dest_name' and/or 'src_name'. Same for the
@@ -309,20 +394,12 @@ def assemble(self):
                     # container's TOC de-duplication should take care of them (same as with EXTENSION ones, really).
                     self.dependencies.append((dest_name, src_name, typecode))
                 else:
-                    # This is onefile-specific codepath. The binaries (both EXTENSION and BINARY entries) need to be
-                    # processed using `process_collected_binary` helper.
-                    src_name = process_collected_binary(
-                        src_name,
-                        dest_name,
-                        use_strip=self.strip_binaries,
-                        use_upx=self.upx_binaries,
-                        upx_exclude=self.upx_exclude,
-                        target_arch=self.target_arch,
-                        codesign_identity=self.codesign_identity,
-                        entitlements_file=self.entitlements_file,
-                        strict_arch_validation=(typecode == 'EXTENSION'),
+                    # This is onefile-specific codepath. The binaries (both EXTENSION and BINARY entries) have been
+                    # processed using `process_collected_binaries` helper.
+                    src_name = processed_binaries[(src_name, dest_name)]
+                    archive_toc.append(
+                        (dest_name, src_name, self._get_compression(dest_name, typecode), self.xformdict[typecode])
                     )
-                    archive_toc.append((dest_name, src_name, self.cdict.get(typecode, False), self.xformdict[typecode]))
             elif typecode in ('DATA', 'ZIPFILE'):
                 # Same logic as above for BINARY and EXTENSION; if `exclude_binaries` is set, we are in onedir mode;
                 # we should exclude DATA (and ZIPFILE) entries and instead pass them on via PKG's `dependencies`. This
@@ -337,21 +414,36 @@ def assemble(self):
                         carchive_typecode = 'b'
                     else:
                         carchive_typecode = self.xformdict[typecode]
-                    archive_toc.append((dest_name, src_name, self.cdict.get(typecode, False), carchive_typecode))
+                    archive_toc.append(
+                        (dest_name, src_name, self._get_compression(dest_name, typecode), carchive_typecode)
+                    )
             elif typecode == 'OPTION':
                 archive_toc.append((dest_name, '', False, 'o'))
             elif typecode in {'PYSOURCE', 'PYSOURCE-1', 'PYSOURCE-2', 'PYMODULE', 'PYMODULE-1', 'PYMODULE-2'}:
                 # Collect python script and modules in a TOC that will not be sorted.
-                bootstrap_toc.append((dest_name, src_name, self.cdict.get(typecode, False), self.xformdict[typecode]))
+                bootstrap_toc.append(
+                    (dest_name, src_name, self._get_compression(dest_name, typecode), self.xformdict[typecode])
+                )
             else:
                 # PYZ, PKG, DEPENDENCY, SPLASH, SYMLINK
-                archive_toc.append((dest_name, src_name, self.cdict.get(typecode, False), self.xformdict[typecode]))
+                archive_toc.append(
+                    (dest_name, src_name, self._get_compression(dest_name, typecode), self.xformdict[typecode])
+                )
 
         # Sort content alphabetically by type and name to enable reproducible builds.
         archive_toc.sort(key=itemgetter(3, 0))
         # Do *not* sort modules and scripts, as their order is important.
         # TODO: Think about having all modules first and then all scripts.
-        CArchiveWriter(self.name, bootstrap_toc + archive_toc, pylib_name=self.python_lib_name)
+        CArchiveWriter(
+            self.name,
+            bootstrap_toc + archive_toc,
+            pylib_name=self.python_lib_name,
+            compress_min_ratio=self.compress_min_ratio,
+            blob_cache=cache.BlobCache(CONF['cachedir']) if CONF.get('archive_cache') else None,
+            dedup=self.dedup,
+        )
+        _save_file_digest_cache()
+        cache.save_stats(CONF['cachedir'])
 
         logger.info("Building PKG (CArchive) %s completed successfully.", os.path.basename(self.name))
 
@@ -418,6 +510,10 @@ def __init__(self, *args, **kwargs):
             entitlements_file
                 macOS only. Optional path to entitlements file to use with code signing of collected binaries
                 (--entitlements option to codesign utility).
+            memfd_binaries
+                Linux onefile mode only. If True, the bootloader extracts the collected binaries (shared libraries and
+                extension modules) into anonymous memory-backed files (memfd) instead of writing them to the temporary
+                directory, where they are represented by symbolic links. Data files are still written to the disk.
             contents_directory
                 Onedir mode only. Specifies the name of the directory where all files par the executable will be placed.
                 Setting the name to '.' (or '' or None) re-enables old onedir layout without contents directory.
@@ -451,6 +547,7 @@ def __init__(self, *args, **kwargs):
 
         # macOS argv emulation
         self.argv_emulation = kwargs.get('argv_emulation', False)
+        self.memfd_binaries = kwargs.get('memfd_binaries', False)
 
         # Target architecture (macOS only)
         self.target_arch = kwargs.get('target_arch', None)
@@ -475,7 +572,7 @@ def __init__(self, *args, **kwargs):
         self.entitlements_file = kwargs.get('entitlements_file', None)
 
         # UPX needs to be both available and enabled for the target.
-        self.upx = CONF['upx_available'] and kwargs.get('upx', False)
+        self.upx = bool(kwargs.get('upx', False)) and is_upx_available()
 
         # Catch and clear options that are unsupported on specific platforms.
         if self.versrsrc and not is_win:
@@ -569,6 +666,15 @@ def __init__(self, *args, **kwargs):
             # no value; presence means "true"
             self.toc.append(("pyi-macos-argv-emulation", "", "OPTION"))
 
+        if self.memfd_binaries:
+            if not is_linux:
+                logger.warning("The memfd_binaries option is supported only on Linux; ignoring it.")
+            elif self.exclude_binaries:
+                logger.warning("The memfd_binaries option has no effect in onedir mode; ignoring it.")
+            else:
+                # no value; presence means "true"
+                self.toc.append(("pyi-memfd-binaries", "", "OPTION"))
+
         if self.contents_directory:
             self.toc.append(("pyi-contents-directory " + self.contents_directory, "", "OPTION"))
 
@@ -647,7 +753,10 @@ def __init__(self, *args, **kwargs):
             upx_exclude=self.upx_exclude,
             target_arch=self.target_arch,
             codesign_identity=self.codesign_identity,
-            entitlements_file=self.entitlements_file
+            entitlements_file=self.entitlements_file,
+            compress_patterns=kwargs.get('compress_patterns', None),
+            compress_min_ratio=kwargs.get('compress_min_ratio', None),
+            dedup=kwargs.get('dedup', False),
         )
         self.dependencies = self.pkg.dependencies
 
@@ -670,6 +779,7 @@ def __init__(self, *args, **kwargs):
         ('manifest', _check_guts_eq),
         ('append_pkg', _check_guts_eq),
         ('argv_emulation', _check_guts_eq),
+        ('memfd_binaries', _check_guts_eq),
         ('target_arch', _check_guts_eq),
         ('codesign_identity', _check_guts_eq),
         ('entitlements_file', _check_guts_eq),
@@ -1065,12 +1175,16 @@ def __init__(self, *args, **kwargs):
 
             name
                 The name of the directory to be built.
+            dedup
+                If True, binaries and data files with contents identical to a previously collected file are collected
+                as links to that file: relative symbolic links, or hard links on Windows.
         """
         from PyInstaller.config import CONF
 
         super().__init__()
 
         self.strip_binaries = kwargs.get('strip', False)
+        self.dedup = kwargs.get('dedup', False)
         self.upx_exclude = kwargs.get("upx_exclude", [])
         self.console = True
         self.target_arch = None
@@ -1078,7 +1192,7 @@ def __init__(self, *args, **kwargs):
         self.entitlements_file = None
 
         # UPX needs to be both available and enabled for the taget.
-        self.upx_binaries = CONF['upx_available'] and kwargs.get('upx', False)
+        self.upx_binaries = bool(kwargs.get('upx', False)) and is_upx_available()
 
         # The `name` should be the output directory name, without the parent path (the directory is created in the
         # DISTPATH). Old .spec formats included parent path, so strip it away.
@@ -1133,6 +1247,25 @@ def _check_guts(self, data, last_build):
     def assemble(self):
         _make_clean_directory(self.name)
         logger.info("Building COLLECT %s", self.tocbasename)
+
+        # Process the binaries up-front, in parallel.
+        processed_binaries = process_collected_binaries(
+            [(src_name, dest_name, typecode == 'EXTENSION') for dest_name, src_name, typecode in self.toc
+             if typecode in ('BINARY', 'EXTENSION') and os.path.exists(src_name)],
+            use_strip=self.strip_binaries,
+            use_upx=self.upx_binaries,
+            upx_exclude=self.upx_exclude,
+            target_arch=self.target_arch,
+            codesign_identity=self.codesign_identity,
+            entitlements_file=self.entitlements_file,
+        )
+
+        # Destination paths of collected binaries and data files, keyed by their contents' digest and executable flag;
+        # used for deduplication.
+        collected_files = {}
+        dedup_count = 0
+        dedup_saved = 0
+
         for dest_name, src_name, typecode in self.toc:
             # Ensure that the source file exists, if necessary. Skip the check for DEPENDENCY entries due to special
             # contents of 'dest_name' and/or 'src_name'. Same for the SYMLINK entries, where 'src_name' is relative
@@ -1165,17 +1298,7 @@ def assemble(self):
                     "but there already exists a file at that path!"
                 )
             if typecode in ('EXTENSION', 'BINARY'):
-                src_name = process_collected_binary(
-                    src_name,
-                    dest_name,
-                    use_strip=self.strip_binaries,
-                    use_upx=self.upx_binaries,
-                    upx_exclude=self.upx_exclude,
-                    target_arch=self.target_arch,
-                    codesign_identity=self.codesign_identity,
-                    entitlements_file=self.entitlements_file,
-                    strict_arch_validation=(typecode == 'EXTENSION'),
-                )
+                src_name = processed_binaries[(src_name, dest_name)]
             if typecode == 'SYMLINK':
                 # On Windows, ensure that symlink target path (stored in src_name) is using Windows-style back slash
                 # separators.
@@ -1192,16 +1315,33 @@ def assemble(self):
                     raise ValueError(
                         f"Attempting to collect a duplicated file into COLLECT: {dest_name} (type: {typecode})"
                     )
+                is_executable = (
+                    typecode in ('EXTENSION', 'BINARY', 'EXECUTABLE')
+                    or (typecode == 'DATA' and os.access(src_name, os.X_OK))
+                )
+                # If deduplication is enabled, link binaries and data files to previously collected identical files.
+                if self.dedup and typecode in ('BINARY', 'DATA'):
+                    dedup_key = (_get_file_digest(src_name), is_executable)
+                    if dedup_key in collected_files:
+                        _link_collected_file(collected_files[dedup_key], dest_path)
+                        dedup_count += 1
+                        dedup_saved += os.path.getsize(src_name)
+                        continue
+                    collected_files[dedup_key] = dest_path
                 # Use `shutil.copyfile` to copy file with default permissions. We do not attempt to preserve original
                 # permissions nor metadata, as they might be too restrictive and cause issues either during subsequent
                 # re-build attempts or when trying to move the application bundle. For binaries (and data files with
                 # executable bit set), we manually set the executable bits after copying the file.
                 shutil.copyfile(src_name, dest_path)
-            if (
-                typecode in ('EXTENSION', 'BINARY', 'EXECUTABLE')
-                or (typecode == 'DATA' and os.access(src_name, os.X_OK))
-            ):
-                os.chmod(dest_path, 0o755)
+                if is_executable:
+                    os.chmod(dest_path, 0o755)
+        if self.dedup:
+            _save_file_digest_cache()
+            logger.info(
+                "Deduplicated %d files with identical contents, saving %d bytes.",
+                dedup_count,
+                dedup_saved,
+            )
         logger.info("Building COLLECT %s completed successfully.", self.tocbasename)
 
 
@@ -1212,8 +1352,11 @@ class MERGE:
     reducing the disk space used by multiple executables. Every executable (even onedir ones!) obtained from a
     MERGE-processed Analysis gains onefile semantics, because it needs to extract its referenced dependencies from other
     executables into temporary directory before they can run.
+
+    Optionally, the pure python modules that are used by more than one executable can be moved into a single shared
+    PYZ archive, which is then collected and referenced in the same way as data and binary files.
     """
-    def __init__(self, *args):
+    def __init__(self, *args, shared_pyz=False):
         """
         args
             Dependencies as a list of (analysis, identifier, path_to_exe) tuples. `analysis` is an instance of
@@ -1222,9 +1365,19 @@ def __init__(self, *args):
             filename component). For onefile executables, `path_to_exe` is usually just executable's base name
             (e.g., `myexecutable`). For onedir executables, `path_to_exe` usually comprises both the application's
             directory name and executable name (e.g., `myapp/myexecutable`).
+        shared_pyz
+            If set, the entries of `Analysis.pure` that are shared by two or more of the analyses are removed from them
+            and built into a shared PYZ archive (available as the `shared_pyz` attribute). The archive is added to
+            `Analysis.datas` of the first executable that uses it, and referenced from the others; each executable's
+            own PYZ then contains only the modules that are unique to it, and references to the shared modules that it
+            uses.
         """
         self._dependencies = {}
         self._symlinks = set()
+        self.shared_pyz = None
+
+        if shared_pyz:
+            self._create_shared_pyz([analysis for analysis, identifier, path_to_exe in args])
 
         # Process all given (analysis, identifier, path_to_exe) tuples
         for analysis, identifier, path_to_exe in args:
@@ -1245,6 +1398,43 @@ def __init__(self, *args):
             analysis.datas = normalize_toc(datas)
             analysis.dependencies += binaries_refs + datas_refs
 
+    def _create_shared_pyz(self, analyses):
+        from PyInstaller.config import CONF
+
+        # Entries are compared as a whole; a module that is collected from different source files (or with different
+        # optimization levels) by different analyses remains private to each of them.
+        usage_counts = collections.Counter(entry for analysis in analyses for entry in set(analysis.pure))
+        shared_entries = {entry for entry, count in usage_counts.items() if count > 1}
+        if not shared_entries:
+            logger.info("MERGE: no python modules are shared between the executables; not creating shared PYZ.")
+            return
+
+        # Gather the code objects of the shared modules from the analyses' code caches.
+        shared_toc = sorted(shared_entries)
+        shared_names = {name for name, src_path, typecode in shared_toc}
+        code_dict = {}
+        for analysis in analyses:
+            code_cache = CONF['code_cache'].get(id(analysis.pure)) or {}
+            code_dict.update((name, code) for name, code in code_cache.items() if name in shared_names)
+        CONF['code_cache'][id(shared_toc)] = code_dict
+
+        self.shared_pyz = PYZ(shared_toc)
+        logger.info("MERGE: %d entries are shared between the executables.", len(shared_toc))
+
+        # The shared archive is collected as a data file; in the executables that come after the first one, the data
+        # entry is turned into a reference by the subsequent TOC processing. The `Analysis.pure` lists are modified in
+        # place, to retain their association with the code caches. Each shared module is replaced by a `PYZ-SHARED`
+        # reference to the shared archive, so that at run time, an executable can import only the shared modules that
+        # it collected itself (and not those collected only by the other executables).
+        shared_name = os.path.basename(self.shared_pyz.name)
+        for analysis in analyses:
+            used_entries = shared_entries.intersection(analysis.pure)
+            if not used_entries:
+                continue
+            analysis.pure[:] = [entry for entry in analysis.pure if entry not in shared_entries]
+            analysis.pure.extend((name, self.shared_pyz.name, 'PYZ-SHARED') for name, _, _ in sorted(used_entries))
+            analysis.datas.append((shared_name, self.shared_pyz.name, 'DATA'))
+
     def _process_toc(self, toc, path_to_exe):
         # NOTE: unfortunately, these need to keep two separate lists. See the comment in the calling code on why this
         # is so.
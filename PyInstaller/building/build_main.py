@@ -14,7 +14,11 @@
 NOTE: All global variables, classes and imported modules create API for .spec files.
 """
 
+import concurrent.futures
 import glob
+import json
+import marshal
+import multiprocessing
 import os
 import pathlib
 import pprint
@@ -38,10 +42,10 @@
 from PyInstaller.compat import is_win, is_conda, is_darwin, is_linux
 from PyInstaller.depend import bindepend
 from PyInstaller.depend.analysis import initialize_modgraph, HOOK_PRIORITY_USER_HOOKS
-from PyInstaller.depend.utils import create_py3_base_library, scan_code_for_ctypes
+from PyInstaller.depend.utils import create_py3_base_library, scan_code_for_ctypes, _reset_ctypes_library_cache
 from PyInstaller import isolated
 from PyInstaller.utils.misc import absnormpath, get_path_to_toplevel_modules, mtime
-from PyInstaller.utils.hooks import get_package_paths
+from PyInstaller.utils.hooks import get_package_paths, _reset_distribution_index
 from PyInstaller.utils.hooks.gi import compile_glib_schema_files
 
 if is_darwin:
@@ -82,6 +86,17 @@
 """
 
 
+def _import_type(dep_info):
+    """
+    Describe the type of import represented by the given modulegraph edge data, using the `IMPORT_TYPES` strings.
+    """
+    if not dep_info or isinstance(dep_info, str):  # e.g., 'direct'
+        imptype = 0
+    else:
+        imptype = (dep_info.conditional + 2 * dep_info.function + 4 * dep_info.tryexcept)
+    return IMPORT_TYPES[imptype]
+
+
 @isolated.decorate
 def discover_hook_directories():
     """
@@ -130,6 +145,30 @@ def discover_hook_directories():
     return hook_directories
 
 
+# Hook directories discovered via entry points; shared by all analyses of a build.
+_hook_directories = None
+
+
+def _get_hook_directories():
+    """
+    Return the hook directories discovered via entry points. The discovery (which loads all `pyinstaller40` entry
+    points in an isolated subprocess) is performed on first use, and its result is reused by subsequent analyses.
+    """
+    global _hook_directories
+    if _hook_directories is None:
+        _hook_directories = discover_hook_directories()
+    return list(_hook_directories)
+
+
+def _reset_hook_directories():
+    """
+    Discard the discovered hook directories, so that they are discovered again on the next use. Called at the start of
+    each build, in case distributions were installed or removed in the meantime.
+    """
+    global _hook_directories
+    _hook_directories = None
+
+
 def find_binary_dependencies(binaries, import_packages, symlink_suppression_patterns):
     """
     Find dynamic dependencies (linked shared libraries) for the provided list of binaries.
@@ -378,7 +417,7 @@ class Analysis(Target):
     scripts
             The scripts you gave Analysis as input, with any runtime hook scripts prepended.
     pure
-            The pure Python modules.
+            The pure Python modules, and the data files packed into the PYZ archive (see `packed_data`).
     binaries
             The extension modules and their dependencies.
     datas
@@ -413,6 +452,9 @@ def __init__(
         noarchive=False,
         module_collection_mode=None,
         optimize=-1,
+        lazy_modules=None,
+        lazy_modules_exclude=None,
+        packed_data=None,
         **_kwargs,
     ):
         """
@@ -449,7 +491,40 @@ def __init__(
         optimize
                 Optimization level for collected bytecode. If not specified or set to -1, it is set to the value of
                 `sys.flags.optimize` of the running build process.
+        lazy_modules
+                An optional list of module name patterns (e.g., 'pkg.*'), whose execution in the frozen application
+                should be deferred until the first attribute access on the imported module.
+        lazy_modules_exclude
+                An optional list of module name patterns that should be executed eagerly even if they match one of the
+                `lazy_modules` patterns (e.g., modules with import-time side effects).
+        packed_data
+                An optional list of package names, whose data files should be packed into the PYZ archive instead of
+                being collected as separate files. In the frozen application, the packed files are accessible via
+                `importlib.resources` and the loader's `get_data()`, but not via their filesystem paths.
         """
+        # Keep the constructor arguments; with concurrent analysis, the analysis is re-created from them in a worker
+        # process.
+        init_kwargs = dict(
+            scripts=scripts,
+            pathex=pathex,
+            binaries=binaries,
+            datas=datas,
+            hiddenimports=hiddenimports,
+            hookspath=hookspath,
+            hooksconfig=hooksconfig,
+            excludes=excludes,
+            runtime_hooks=runtime_hooks,
+            cipher=cipher,
+            win_no_prefer_redirects=win_no_prefer_redirects,
+            win_private_assemblies=win_private_assemblies,
+            noarchive=noarchive,
+            module_collection_mode=module_collection_mode,
+            optimize=optimize,
+            lazy_modules=lazy_modules,
+            lazy_modules_exclude=lazy_modules_exclude,
+            packed_data=packed_data,
+        )
+
         if cipher is not None:
             from PyInstaller.exceptions import RemovedCipherFeatureError
             raise RemovedCipherFeatureError(
@@ -529,7 +604,7 @@ def __init__(
             self.hookspath.extend([(os.path.expanduser(path), HOOK_PRIORITY_USER_HOOKS) for path in hookspath])
 
         # Add hook directories from PyInstaller entry points.
-        self.hookspath += discover_hook_directories()
+        self.hookspath += _get_hook_directories()
 
         self.hooksconfig = {}
         if hooksconfig:
@@ -558,6 +633,10 @@ def __init__(
         if self.optimize not in {0, 1, 2}:
             raise ValueError(f"Unsupported bytecode optimization level: {self.optimize!r}")
 
+        self.lazy_modules = list(lazy_modules or [])
+        self.lazy_modules_exclude = list(lazy_modules_exclude or [])
+        self.packed_data = list(packed_data or [])
+
         # Expand the `binaries` and `datas` lists specified in the .spec file, and ensure that the lists are normalized
         # and sorted before guts comparison.
         #
@@ -578,7 +657,11 @@ def __init__(
                                  for dest_name, src_name in format_binaries_and_datas(datas, workingdir=spec_dir)]
             self._input_datas = sorted(normalize_toc(self._input_datas))
 
-        self.__postinit__()
+        self._pending_assembly = None
+        if CONF.get('analysis_jobs'):
+            self._submit_assembly(init_kwargs)
+        else:
+            self.__postinit__()
 
     _GUTS = (  # input parameters
         ('inputs', _check_guts_eq),  # parameter `scripts`
@@ -591,6 +674,9 @@ def __init__(
         ('noarchive', _check_guts_eq),
         ('module_collection_mode', _check_guts_eq),
         ('optimize', _check_guts_eq),
+        ('lazy_modules', _check_guts_eq),
+        ('lazy_modules_exclude', _check_guts_eq),
+        ('packed_data', _check_guts_eq),
 
         ('_input_binaries', _check_guts_toc),
         ('_input_datas', _check_guts_toc),
@@ -606,6 +692,55 @@ def __init__(
         # TODO: Need to add "dependencies"?
     )
 
+    # Attributes holding the results of the analysis. With concurrent analysis, accessing any of them waits for the
+    # worker process to finish the analysis.
+    _RESULT_ATTRIBUTES = ('scripts', 'pure', 'binaries', 'zipfiles', 'zipped_data', 'datas')
+
+    def _submit_assembly(self, init_kwargs):
+        """
+        Submit the analysis to the pool of worker processes (see the `--analysis-jobs` option). The worker re-creates
+        the analysis from the constructor arguments and stores its results in the guts file (`tocfilename`), from where
+        `_finish_assembly()` loads them, just like the results of an up-to-date analysis from a previous build.
+        """
+        from PyInstaller.config import CONF
+
+        conf = {key: value for key, value in CONF.items() if key not in ('code_cache', 'lstat_cache')}
+        for name in self._RESULT_ATTRIBUTES:
+            delattr(self, name)
+        executor = _get_analysis_executor(CONF['analysis_jobs'])
+        self._pending_assembly = executor.submit(_assemble_analysis, conf, self.invcnum, init_kwargs)
+        _pending_analyses.append(self)
+        logger.info("Submitted %s to concurrent analysis", self.tocbasename)
+
+    def __getattr__(self, name):
+        # Called only for attributes that are not set, such as the result attributes of a pending analysis.
+        if name in self._RESULT_ATTRIBUTES and self.__dict__.get('_pending_assembly') is not None:
+            self._finish_assembly()
+            return getattr(self, name)
+        raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {name!r}")
+
+    def _finish_assembly(self):
+        """
+        Wait for the worker process to finish the analysis, and load its results.
+        """
+        from PyInstaller.config import CONF
+
+        future = self._pending_assembly
+        self._pending_assembly = None
+        _pending_analyses.remove(self)
+        code_cache = future.result()
+
+        logger.info("Collecting results of concurrent analysis %s", self.tocbasename)
+        for name in self._RESULT_ATTRIBUTES:
+            setattr(self, name, [])
+        # Loads the guts written by the worker; if they are unusable for whatever reason, the analysis is (re)assembled
+        # here.
+        self.__postinit__()
+
+        # Pass on the code objects compiled by the worker, so that PYZ does not need to compile the modules again.
+        if code_cache is not None and id(self.pure) not in CONF['code_cache']:
+            CONF['code_cache'][id(self.pure)] = marshal.loads(code_cache)
+
     def _extend_pathex(self, spec_pathex, scripts):
         """
         Normalize additional paths where PyInstaller will look for modules and add paths with scripts to the list of
@@ -747,7 +882,7 @@ def assemble(self):
         #
         # For entries added to `binaries` and `datas` after this point, we trust their typecodes due to the nature of
         # their origin.
-        combined_toc = normalize_toc(self.datas + self.binaries)
+        combined_toc = normalize_toc(self.datas, self.binaries)
 
         logger.info('Performing binary vs. data reclassification (%d entries)', len(combined_toc))
 
@@ -798,6 +933,11 @@ def assemble(self):
         # Analyze run-time hooks.
         rhtook_scripts = self.graph.analyze_runtime_hooks(self.custom_runtime_hooks)
 
+        # Enable deferred module execution, if requested. The generated run-time hook is placed after all other
+        # run-time hooks, so that modules imported by those are still executed eagerly.
+        if self.lazy_modules:
+            rhtook_scripts.append(self.graph.add_script(self._write_lazy_modules_rthook()))
+
         # -- Extract the nodes of the graph as TOCs for further processing. --
 
         # Initialize the scripts list: run-time hooks (custom ones, followed by regular ones), followed by program
@@ -988,7 +1128,7 @@ def assemble(self):
         #  - normalize both TOCs together (to avoid having duplicates across the lists)
         #  - process the combined normalized TOC for symlinks
         #  - split back into `binaries` (BINARY, EXTENSION) and `datas` (everything else)
-        combined_toc = normalize_toc(self.datas + self.binaries)
+        combined_toc = normalize_toc(self.datas, self.binaries)
         combined_toc = toc_process_symbolic_links(combined_toc)
 
         # On macOS, look for binaries collected from .framework bundles, and collect their Info.plist files.
@@ -1013,10 +1153,17 @@ def assemble(self):
             self.datas = [(dest_name, src_name, typecode) for dest_name, src_name, typecode in self.datas
                           if os.path.basename(src_name) != '.DS_Store']
 
+        # Move the data files of packages listed in `packed_data` into `pure`, for collection into the PYZ archive.
+        if self.packed_data:
+            self._pack_datas()
+
         # Write warnings about missing modules.
         self._write_warnings()
         # Write debug information about the graph
         self._write_graph_debug()
+        # Write the records of why each module and binary was collected; used by bundle pruning reports.
+        if CONF.get('collection_origins'):
+            self._write_collection_origins()
 
         # On macOS, check the SDK version of the binaries to be collected, and warn when the SDK version is either
         # invalid or too low. Such binaries will likely refuse to be loaded when hardened runtime is enabled and
@@ -1040,18 +1187,69 @@ def assemble(self):
                     logger.warning(" * %r, collected as %r; version: %r", src_name, dest_name, sdk_version)
                 logger.warning("These binaries will likely cause issues with code-signing and hardened runtime!")
 
+    def _pack_datas(self):
+        """
+        Move the data files of the packages listed in `packed_data` from `datas` into `pure`. Python source and
+        bytecode files are kept on the filesystem, where they can be found by the import machinery.
+        """
+        package_dirs = tuple(package.replace('.', os.sep) + os.sep for package in self.packed_data)
+
+        datas = []
+        packed_datas = []
+        for entry in self.datas:
+            dest_name, src_name, typecode = entry
+            if typecode == 'DATA' and dest_name.startswith(package_dirs) and not dest_name.endswith(('.py', '.pyc')):
+                packed_datas.append(entry)
+            else:
+                datas.append(entry)
+
+        logger.info("Packing %d data file(s) of packages %r into PYZ archive", len(packed_datas), self.packed_data)
+        self.datas = datas
+        # Extend the list in-place, to preserve its association with the code cache. The entries are already normalized,
+        # and their names (paths) cannot collide with module names.
+        self.pure.extend(packed_datas)
+
+    def _write_lazy_modules_rthook(self):
+        """
+        Generate the run-time hook that passes `lazy_modules` and `lazy_modules_exclude` patterns to the frozen
+        importer, and return its path.
+        """
+        from PyInstaller.config import CONF
+
+        logger.info("Deferring execution of modules matching: %r", self.lazy_modules)
+        if self.lazy_modules_exclude:
+            logger.info("Excluding modules from deferred execution: %r", self.lazy_modules_exclude)
+
+        hook_source = (
+            "def _pyi_rthook():\n"
+            "    import pyimod02_importers  # PyInstaller's bootstrap module\n"
+            "\n"
+            f"    pyimod02_importers.set_lazy_modules({self.lazy_modules!r}, {self.lazy_modules_exclude!r})\n"
+            "\n"
+            "\n"
+            "_pyi_rthook()\n"
+            "del _pyi_rthook\n"
+        )
+
+        # Avoid re-writing unchanged file, so that its modification time remains stable across rebuilds.
+        hook_file = os.path.join(CONF['workpath'], 'pyi_rth__lazy_modules.py')
+        try:
+            with open(hook_file, 'r', encoding='utf-8') as fp:
+                if fp.read() == hook_source:
+                    return hook_file
+        except FileNotFoundError:
+            pass
+
+        with open(hook_file, 'w', encoding='utf-8') as fp:
+            fp.write(hook_source)
+
+        return hook_file
+
     def _write_warnings(self):
         """
         Write warnings about missing modules. Get them from the graph and use the graph to figure out who tried to
         import them.
         """
-        def dependency_description(name, dep_info):
-            if not dep_info or dep_info == 'direct':
-                imptype = 0
-            else:
-                imptype = (dep_info.conditional + 2 * dep_info.function + 4 * dep_info.tryexcept)
-            return '%s (%s)' % (name, IMPORT_TYPES[imptype])
-
         from PyInstaller.config import CONF
         miss_toc = self.graph.make_missing_toc()
         with open(CONF['warnfile'], 'w', encoding='utf-8') as wf:
@@ -1063,26 +1261,67 @@ def dependency_description(name, dep_info):
                     'module named',
                     n,
                     '- imported by',
-                    ', '.join(dependency_description(name, data) for name, data in importers),
+                    ', '.join('%s (%s)' % (name, _import_type(data)) for name, data in importers),
                     file=wf
                 )
         logger.info("Warnings written to %s", CONF['warnfile'])
 
     def _write_graph_debug(self):
         """
-        Write a xref (in html) and with `--log-level DEBUG` a dot-drawing of the graph.
+        Write the module graph in JSON Lines format. HTML cross-reference and GraphViz renderings can be created from
+        it using `pyi-render_graph`.
         """
         from PyInstaller.config import CONF
-        with open(CONF['xref-file'], 'w', encoding='utf-8') as fh:
-            self.graph.create_xref(fh)
-            logger.info("Graph cross-reference written to %s", CONF['xref-file'])
-        if logger.getEffectiveLevel() > logging.DEBUG:
-            return
-        # The `DOT language's <https://www.graphviz.org/doc/info/lang.html>`_ default character encoding (see the end
-        # of the linked page) is UTF-8.
-        with open(CONF['dot-file'], 'w', encoding='utf-8') as fh:
-            self.graph.graphreport(fh)
-            logger.info("Graph drawing written to %s", CONF['dot-file'])
+        with open(CONF['graph-file'], 'w', encoding='utf-8') as fh:
+            self.graph.write_graph_dump(fh, self.hiddenimports)
+        logger.info("Module graph written to %s", CONF['graph-file'])
+
+    def _write_collection_origins(self):
+        """
+        Write the origins of collected modules and binaries (i.e., which import, hook, or analysis step pulled each of
+        them in) into a JSON file, which can be cross-referenced with run-time import traces using `pyi-prune_report`.
+        """
+        from PyInstaller.config import CONF
+
+        def _file_size(filename):
+            try:
+                return os.path.getsize(filename)
+            except (OSError, TypeError):
+                return 0
+
+        # Map source paths of extension modules and hook-collected binaries back to their module names.
+        extension_modules = {src_name: name for name, src_name, typecode in self.graph.make_binaries_toc()}
+        hook_binaries = {}
+        for node in self.graph.iter_graph(start=self.graph._top_script_node):
+            module_name = str(node.identifier)
+            for dest_name, src_name in self.graph._additional_files_cache.binaries(module_name):
+                hook_binaries.setdefault(src_name, module_name)
+
+        pure_modules = [(name, src_name) for name, src_name, typecode in self.pure if typecode != 'DATA']
+        module_names = [name for name, src_name in pure_modules] + list(extension_modules.values())
+        origins = self.graph.get_collection_origins(module_names, self.hiddenimports)
+
+        modules = {}
+        for name, src_name in pure_modules:
+            modules[name] = {"path": src_name, "size": _file_size(src_name)}
+        for src_name, name in extension_modules.items():
+            modules[name] = {"path": src_name, "size": _file_size(src_name), "extension": True}
+        for name, entry in modules.items():
+            entry["importers"] = [(importer, _import_type(edge_data), origin)
+                                  for importer, edge_data, origin in origins.get(name, [])]
+
+        binaries = {}
+        for dest_name, src_name, typecode in self.binaries:
+            entry = {"path": src_name, "size": _file_size(src_name), "typecode": typecode}
+            if src_name in extension_modules:
+                entry["module"] = extension_modules[src_name]
+            elif src_name in hook_binaries:
+                entry["hook"] = hook_binaries[src_name]
+            binaries[dest_name] = entry
+
+        with open(CONF['origins-file'], 'w', encoding='utf-8') as fh:
+            json.dump({"modules": modules, "binaries": binaries}, fh, indent=1, sort_keys=True)
+        logger.info("Collection origins written to %s", CONF['origins-file'])
 
     def exclude_system_libraries(self, list_of_exceptions=None):
         """
@@ -1096,6 +1335,74 @@ def exclude_system_libraries(self, list_of_exceptions=None):
         ]
 
 
+# Pool of worker processes for concurrent analysis, and the analyses submitted to it that have not been finished yet, in
+# the order of their creation.
+_analysis_executor = None
+_pending_analyses = []
+
+
+def _get_analysis_executor(max_workers):
+    """
+    Return the pool of worker processes for concurrent analysis, creating it on first use.
+    """
+    global _analysis_executor
+
+    if _analysis_executor is None:
+        # Use the `spawn` start method, so that the worker processes start from a clean state regardless of the
+        # platform's default; the base-module graph, the binary dependency cache, and the file digests are shared
+        # between them via the on-disk cache. The worker processes do not inherit the log level set via the
+        # `--log-level` option (or from the spec file), so pass it on explicitly.
+        _analysis_executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_analysis_worker,
+            initargs=(logging.getLogger('PyInstaller').getEffectiveLevel(),),
+        )
+    return _analysis_executor
+
+
+def _init_analysis_worker(log_level):
+    """
+    Initialize a worker process for concurrent analysis.
+    """
+    logging.getLogger('PyInstaller').setLevel(log_level)
+
+
+def _assemble_analysis(conf, invcnum, init_kwargs):
+    """
+    Run the analysis in a worker process for `Analysis._submit_assembly()`. Returns the marshaled code cache of the
+    analysis (or None, if the analysis was up-to-date).
+    """
+    from PyInstaller.config import CONF
+
+    CONF.update(conf)
+    CONF['code_cache'] = dict()
+    CONF['lstat_cache'] = dict()
+    CONF['analysis_jobs'] = None
+
+    Analysis.invcnum = invcnum
+    analysis = Analysis(**init_kwargs)
+
+    code_cache = CONF['code_cache'].pop(id(analysis.pure), None)
+    return marshal.dumps(code_cache) if code_cache else None
+
+
+def _finish_concurrent_analyses():
+    """
+    Collect the results of the analyses that are still pending in spec order, and shut down the worker processes.
+    """
+    global _analysis_executor
+
+    try:
+        while _pending_analyses:
+            _pending_analyses[0]._finish_assembly()
+    finally:
+        _pending_analyses.clear()
+        if _analysis_executor is not None:
+            _analysis_executor.shutdown()
+            _analysis_executor = None
+
+
 class ExecutableBuilder:
     """
     Class that constructs the executable.
@@ -1130,10 +1437,14 @@ def build(spec, distpath, workpath, clean_build):
     CONF['workpath'] = workpath
 
     CONF['warnfile'] = os.path.join(workpath, 'warn-%s.txt' % CONF['specnm'])
-    CONF['dot-file'] = os.path.join(workpath, 'graph-%s.dot' % CONF['specnm'])
-    CONF['xref-file'] = os.path.join(workpath, 'xref-%s.html' % CONF['specnm'])
+    CONF['graph-file'] = os.path.join(workpath, 'graph-%s.jsonl' % CONF['specnm'])
+    CONF['origins-file'] = os.path.join(workpath, 'origins-%s.json' % CONF['specnm'])
 
     CONF['code_cache'] = dict()
+    CONF['lstat_cache'] = dict()
+    _reset_distribution_index()
+    _reset_ctypes_library_cache()
+    _reset_hook_directories()
 
     # Clean PyInstaller cache (CONF['cachedir']) and temporary files (workpath) to be able start a clean build.
     if clean_build:
@@ -1189,7 +1500,10 @@ def build(spec, distpath, workpath, clean_build):
             code = compile(f.read(), spec, 'exec')
     except FileNotFoundError:
         raise SystemExit(f'Spec file "{spec}" not found!')
-    exec(code, spec_namespace)
+    try:
+        exec(code, spec_namespace)
+    finally:
+        _finish_concurrent_analyses()
 
 
 def __add_options(parser):
@@ -1224,6 +1538,29 @@ def __add_options(parser):
         default=False,
         help="Clean PyInstaller cache and remove temporary files before building.",
     )
+    parser.add_argument(
+        '--analysis-jobs',
+        metavar='N',
+        type=int,
+        default=None,
+        help="Run the analyses of the .spec file concurrently, in up to N worker processes. Useful for .spec files "
+        "with multiple Analysis objects, such as multipackage bundles. (default: analyze sequentially)",
+    )
+    parser.add_argument(
+        '--archive-cache',
+        action='store_true',
+        default=False,
+        help="Cache the compressed entries of the PYZ and PKG archives in PyInstaller's cache directory, so that "
+        "entries whose contents did not change do not need to be compressed again in subsequent builds. The size of "
+        "the cache directory can be limited with the PYINSTALLER_CACHE_MAX_SIZE environment variable.",
+    )
+    parser.add_argument(
+        '--collection-origins',
+        action='store_true',
+        default=False,
+        help="Record why each module and shared library was collected in the origins-<specname>.json file in the work "
+        "directory, for use with pyi-prune_report. (default: only with --log-level DEBUG)",
+    )
 
 
 def main(
@@ -1248,5 +1585,13 @@ def main(
 
     CONF['ui_admin'] = kw.get('ui_admin', False)
     CONF['ui_access'] = kw.get('ui_uiaccess', False)
+    CONF['analysis_jobs'] = kw.get('analysis_jobs')
+    CONF['archive_cache'] = kw.get('archive_cache', False)
+    CONF['collection_origins'] = kw.get('collection_origins', False) or logger.isEnabledFor(logging.DEBUG)
 
     build(specfile, distpath, workpath, clean_build)
+
+    # Keep the cache directory within the configured size limit.
+    if CONF.get('cache_max_size'):
+        from PyInstaller.building import cache
+        cache.prune(CONF['cachedir'], CONF['cache_max_size'])
@@ -0,0 +1,467 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Management of the content-addressed caches in PyInstaller's cache directory (CONF['cachedir']).
+
+Each cache is a top-level directory in the cache directory (for example, `bincache10py31164bit`), and stores its
+entries in `<key[:2]>/<key>` sub-directories (possibly nested under further option-specific directories). The
+modification time of an entry directory serves as its last-access record, and is bumped on every cache hit; this allows
+least-recently-used entries to be evicted when the cache directory exceeds the configured size limit.
+
+The hit/miss statistics are accumulated in memory during the build, and merged into the `cache-stats.json` file in the
+cache directory.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+from PyInstaller import log as logging
+
+logger = logging.getLogger(__name__)
+
+STATS_FILENAME = 'cache-stats.json'
+DIGESTS_FILENAME = 'bincache-digests.json'
+HOOK_INDEX_FILENAME = 'hook-index.json'
+
+# Stale temporary directories (left behind by interrupted builds) older than this (in seconds) are removed when pruning
+# the cache.
+STALE_TMPDIR_AGE = 3600
+
+_SIZE_SUFFIXES = {'': 1, 'K': 1024, 'M': 1024**2, 'G': 1024**3, 'T': 1024**4}
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class CacheEntry:
+    """
+    Entry in one of the caches.
+    """
+    def __init__(self, cache_name, path, size, last_access):
+        self.cache_name = cache_name
+        self.path = path
+        self.size = size
+        self.last_access = last_access
+
+    def __repr__(self):
+        return f"CacheEntry({self.cache_name!r}, {self.path!r}, size={self.size}, last_access={self.last_access})"
+
+
+def parse_size(value):
+    """
+    Parse the size specification (a number of bytes, optionally followed by a K, M, G, or T suffix, e.g., `500M`).
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*', str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size specification: {value!r}")
+    return int(float(match.group(1)) * _SIZE_SUFFIXES[match.group(2).upper()])
+
+
+def format_size(size):
+    """
+    Format the size in bytes as a human-readable string.
+    """
+    for suffix in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        suffix = 'TiB'
+    return f"{size:.1f} {suffix}" if suffix != 'B' else f"{size} B"
+
+
+# Recording of cache accesses during the build.
+def record_hit(cache_name, entry_dir, bytes_saved):
+    """
+    Record a cache hit: update entry's last-access record, and account for the `bytes_saved` (i.e., the size of the
+    input whose processing was avoided).
+    """
+    try:
+        os.utime(entry_dir)
+    except OSError:
+        pass
+    _update_stats(cache_name, hits=1, bytes_saved=bytes_saved)
+
+
+def record_miss(cache_name):
+    """
+    Record a cache miss.
+    """
+    _update_stats(cache_name, misses=1)
+
+
+def _update_stats(cache_name, hits=0, misses=0, bytes_saved=0):
+    with _stats_lock:
+        stats = _stats.setdefault(cache_name, {'hits': 0, 'misses': 0, 'bytes_saved': 0})
+        stats['hits'] += hits
+        stats['misses'] += misses
+        stats['bytes_saved'] += bytes_saved
+
+
+def save_stats(cache_dir):
+    """
+    Merge the statistics accumulated in memory into the statistics file in the given cache directory.
+    """
+    with _stats_lock:
+        if not _stats:
+            return
+        stats = load_stats(cache_dir)
+        for cache_name, cache_stats in _stats.items():
+            merged_stats = stats.setdefault(cache_name, {})
+            for key, value in cache_stats.items():
+                merged_stats[key] = merged_stats.get(key, 0) + value
+        try:
+            _write_json_atomic(os.path.join(cache_dir, STATS_FILENAME), stats)
+        except OSError:
+            logger.warning("Failed to save cache statistics in %r!", cache_dir, exc_info=True)
+            return
+        _stats.clear()
+
+
+def load_stats(cache_dir):
+    """
+    Load the statistics from the statistics file in the given cache directory.
+    """
+    try:
+        with open(os.path.join(cache_dir, STATS_FILENAME), 'r', encoding='utf-8') as fp:
+            stats = json.load(fp)
+        if not isinstance(stats, dict):
+            raise ValueError("Invalid statistics file!")
+    except FileNotFoundError:
+        stats = {}
+    except Exception:
+        logger.warning("Cache statistics file in %r is corrupted; ignoring it.", cache_dir)
+        stats = {}
+    return stats
+
+
+def _write_json_atomic(filename, data):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(filename))
+    try:
+        with open(fd, 'w', encoding='utf-8') as fp:
+            json.dump(data, fp)
+        os.replace(tmp_file, filename)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+
+
+class BlobCache:
+    """
+    Persistent cache of compressed data blobs, used by the archive writers. The blobs are keyed by the digest of the
+    uncompressed payload, the codec, and the compression level, so an archive entry needs to be re-compressed only if
+    its contents have changed.
+    """
+    CACHE_NAME = 'blobcache'
+    BLOB_FILENAME = 'blob'
+
+    def __init__(self, cache_dir):
+        self.root = os.path.join(cache_dir, self.CACHE_NAME)
+
+    @staticmethod
+    def make_key(payload_digest, codec, level):
+        """
+        Compute the cache key for the payload with given (hex) digest, compressed with the given codec and level.
+        """
+        return hashlib.sha1(f"{codec}:{level}:{payload_digest}".encode('utf-8')).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def lookup(self, key, bytes_saved=0):
+        """
+        Look up the blob with the given key; return the path to the cached blob file, or None if not cached.
+        """
+        entry_dir = self._entry_dir(key)
+        blob_file = os.path.join(entry_dir, self.BLOB_FILENAME)
+        if os.path.isfile(blob_file):
+            record_hit(self.CACHE_NAME, entry_dir, bytes_saved)
+            return blob_file
+        record_miss(self.CACHE_NAME)
+        return None
+
+    def store(self, key, data):
+        """
+        Store the given blob under the given key.
+        """
+        writer = self.open_writer(key)
+        if writer is not None:
+            writer.write(data)
+            writer.commit()
+
+    def open_writer(self, key):
+        """
+        Open a writer for incrementally storing the blob under the given key. The blob becomes visible only after the
+        writer's `commit` method is called. Returns None if the blob cannot be stored (e.g., read-only cache directory).
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(prefix='.tmp-', dir=entry_dir)
+        except OSError:
+            logger.debug("Failed to create blob cache entry in %r!", entry_dir, exc_info=True)
+            return None
+        return _BlobCacheWriter(open(fd, 'wb'), tmp_file, os.path.join(entry_dir, self.BLOB_FILENAME))
+
+
+class _BlobCacheWriter:
+    def __init__(self, fp, tmp_file, blob_file):
+        self._fp = fp
+        self._tmp_file = tmp_file
+        self._blob_file = blob_file
+
+    def write(self, data):
+        self._fp.write(data)
+
+    def commit(self):
+        self._fp.close()
+        try:
+            os.replace(self._tmp_file, self._blob_file)
+        except OSError:
+            # The blob might have been stored in the mean time by another build, and be currently in use.
+            self.discard()
+
+    def discard(self):
+        self._fp.close()
+        try:
+            os.remove(self._tmp_file)
+        except OSError:
+            pass
+
+
+class SnapshotCache(BlobCache):
+    """
+    Persistent cache of build-independent intermediate results (for example, the module graph with analyzed base
+    modules), keyed by the fingerprint of the inputs they were created from.
+    """
+    CACHE_NAME = 'snapshots'
+
+    @staticmethod
+    def make_key(fingerprint, name):
+        """
+        Compute the cache key for the snapshot with given name, created from inputs with given (hex) fingerprint.
+        """
+        return hashlib.sha1(f"{name}:{fingerprint}".encode('utf-8')).hexdigest()
+
+
+# Inspection and maintenance of the cache directory.
+def _is_entry_dir(name, parent_name):
+    return len(name) > 2 and name[:2] == parent_name and not name.startswith('.')
+
+
+def _get_tree_size(path):
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for filename in files:
+            try:
+                size += os.lstat(os.path.join(root, filename)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def iter_entries(cache_dir):
+    """
+    Iterate over the entries of all caches in the given cache directory, yielding `CacheEntry` instances.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    for cache_name in sorted(os.listdir(cache_dir)):
+        cache_root = os.path.join(cache_dir, cache_name)
+        if not os.path.isdir(cache_root) or cache_name.startswith('.'):
+            continue
+        for root, dirs, files in os.walk(cache_root):
+            parent_name = os.path.basename(root)
+            entry_dirs = [name for name in dirs if _is_entry_dir(name, parent_name)]
+            for name in entry_dirs:
+                entry_dir = os.path.join(root, name)
+                try:
+                    last_access = os.stat(entry_dir).st_mtime
+                except OSError:
+                    continue
+                yield CacheEntry(cache_name, entry_dir, _get_tree_size(entry_dir), last_access)
+            # Do not descend into entries, nor into temporary directories.
+            dirs[:] = [name for name in dirs if name not in entry_dirs and not name.startswith('.')]
+
+
+def iter_stale_tmpdirs(cache_dir, max_age=STALE_TMPDIR_AGE):
+    """
+    Iterate over temporary directories and files left behind by interrupted builds.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    now = time.time()
+    for root, dirs, files in os.walk(cache_dir):
+        for name in dirs + files:
+            if not name.startswith('.tmp-'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                if now - os.lstat(path).st_mtime > max_age:
+                    yield path
+            except OSError:
+                pass
+        dirs[:] = [name for name in dirs if not name.startswith('.tmp-')]
+
+
+def get_stats(cache_dir):
+    """
+    Collect the per-cache statistics: number of entries, their total size, and the recorded hits, misses, and saved
+    bytes.
+    """
+    recorded_stats = load_stats(cache_dir)
+    stats = {}
+    for entry in iter_entries(cache_dir):
+        cache_stats = stats.setdefault(entry.cache_name, {'entries': 0, 'size': 0})
+        cache_stats['entries'] += 1
+        cache_stats['size'] += entry.size
+    for cache_name in set(stats) | set(recorded_stats):
+        cache_stats = stats.setdefault(cache_name, {'entries': 0, 'size': 0})
+        for key in ('hits', 'misses', 'bytes_saved'):
+            cache_stats[key] = recorded_stats.get(cache_name, {}).get(key, 0)
+    return dict(sorted(stats.items()))
+
+
+def _remove(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def prune(cache_dir, max_size, dry_run=False):
+    """
+    Evict the least-recently-used cache entries until their total size does not exceed `max_size` bytes. Files that are
+    not cache entries (for example, the statistics and index files) are not counted, as they cannot be evicted; instead,
+    the records of files and directories that no longer exist are dropped from the memoized file digests and the hook
+    index. Stale temporary directories are always removed. Returns the list of evicted entries.
+    """
+    if not dry_run:
+        for path in iter_stale_tmpdirs(cache_dir):
+            logger.debug("Removing stale temporary path %r", path)
+            _remove(path)
+        _compact_json_files(cache_dir)
+
+    entries = list(iter_entries(cache_dir))
+    total_size = sum(entry.size for entry in entries)
+
+    evicted = []
+    for entry in sorted(entries, key=lambda entry: entry.last_access):
+        if total_size <= max_size:
+            break
+        logger.debug("Evicting cache entry %r (%d bytes)", entry.path, entry.size)
+        if not dry_run:
+            _remove(entry.path)
+        total_size -= entry.size
+        evicted.append(entry)
+
+    if evicted and not dry_run:
+        logger.info(
+            "Evicted %d cache entries (%s) to bring the cache size under %s.", len(evicted),
+            format_size(sum(entry.size for entry in evicted)), format_size(max_size)
+        )
+    return evicted
+
+
+def _compact_json_files(cache_dir):
+    # Drop the records of files (memoized digests, see `PyInstaller.building.utils`) and directories (hook index, see
+    # `PyInstaller.depend.imphook`) that no longer exist. Both files are mappings keyed by absolute paths.
+    for filename, exists in ((DIGESTS_FILENAME, os.path.isfile), (HOOK_INDEX_FILENAME, os.path.isdir)):
+        filename = os.path.join(cache_dir, filename)
+        try:
+            with open(filename, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, dict):
+            continue
+        compacted = {path: record for path, record in data.items() if exists(path)}
+        if len(compacted) == len(data):
+            continue
+        logger.debug("Dropping %d stale records from %r", len(data) - len(compacted), filename)
+        try:
+            _write_json_atomic(filename, compacted)
+        except OSError:
+            logger.debug("Failed to write %r!", filename, exc_info=True)
+
+
+def verify(cache_dir, fix=False):
+    """
+    Check the caches in the given cache directory for damaged entries: entries that contain no files or an empty file,
+    and leftover temporary files. (An entry usually contains one file, but a bincache entry contains a file for each
+    base name under which binaries with its contents were collected.) If `fix` is True, the offending entries are
+    removed. Returns the list of (path, problem) tuples.
+    """
+    problems = []
+    for entry in iter_entries(cache_dir):
+        files = []
+        for root, dirs, filenames in os.walk(entry.path):
+            files += [os.path.join(root, filename) for filename in filenames if not filename.startswith('.tmp-')]
+            dirs[:] = [name for name in dirs if not name.startswith('.tmp-')]
+        if not files:
+            problems.append((entry.path, "entry contains no files"))
+        elif any(os.path.getsize(filename) == 0 for filename in files):
+            problems.append((entry.path, "entry contains an empty file"))
+
+    for path in iter_stale_tmpdirs(cache_dir):
+        problems.append((path, "stale temporary file or directory"))
+
+    problems += _verify_json_files(cache_dir)
+
+    if fix:
+        for path, problem in problems:
+            logger.info("Removing %r (%s)", path, problem)
+            _remove(path)
+
+    return problems
+
+
+def _verify_json_files(cache_dir):
+    # The statistics file and the memoized file digests (see `PyInstaller.building.utils`).
+    from PyInstaller.building.utils import _compute_file_digest
+
+    problems = []
+    if not os.path.isdir(cache_dir):
+        return problems
+    for filename in sorted(os.listdir(cache_dir)):
+        if not filename.endswith('.json'):
+            continue
+        filename = os.path.join(cache_dir, filename)
+        try:
+            with open(filename, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+        except Exception:
+            problems.append((filename, "corrupted file"))
+            continue
+        if os.path.basename(filename) != DIGESTS_FILENAME:
+            continue
+        # Re-compute the digests of unchanged files, and compare them with memoized ones.
+        for src_name, (size, mtime_ns, digest, *_) in data.items():
+            try:
+                src_stat = os.stat(src_name)
+            except OSError:
+                continue
+            if src_stat.st_size != size or src_stat.st_mtime_ns != mtime_ns:
+                continue
+            if _compute_file_digest(src_name) != digest:
+                problems.append((filename, f"invalid memoized digest for {src_name!r}"))
+                break
+    return problems
@@ -10,7 +10,8 @@
 #-----------------------------------------------------------------------------
 
 import os
-import pathlib
+import stat
+import sys
 import warnings
 
 from PyInstaller import log as logging
@@ -306,9 +307,87 @@ def assemble(self):
         self[:] = result
 
 
-def normalize_toc(toc):
+class IndexedTOC(list):
+    """
+    A normalized TOC list, as returned by `normalize_toc` and `normalize_pyz_toc`.
+
+    This is a plain list of (dest_name, src_name, typecode) tuples, which additionally carries the index of its entries
+    by their normalized destination name. The index allows re-normalization of an already-normalized TOC, as well as
+    merging of additional entries into it, without re-processing all of its entries. Any in-place modification of the
+    list invalidates the index, so the object can be freely used as a regular list (e.g., in .spec files).
+    """
+    __slots__ = ('_index',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._index = None
+
+    def __reduce_ex__(self, protocol):
+        # Pickle and copy as a plain list; the index is transient.
+        return list, (list(self),)
+
+    # In-place modifications invalidate the index.
+    def append(self, entry):
+        self._index = None
+        super().append(entry)
+
+    def extend(self, other):
+        self._index = None
+        super().extend(other)
+
+    def insert(self, pos, entry):
+        self._index = None
+        super().insert(pos, entry)
+
+    def pop(self, *args):
+        self._index = None
+        return super().pop(*args)
+
+    def remove(self, entry):
+        self._index = None
+        super().remove(entry)
+
+    def clear(self):
+        self._index = None
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._index = None
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._index = None
+        super().reverse()
+
+    def __setitem__(self, key, value):
+        self._index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._index = None
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self._index = None
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self._index = None
+        return super().__imul__(other)
+
+
+class _TOCNormalization:
+    """
+    De-duplication rules for a kind of TOC lists.
+    """
+    def __init__(self, type_priorities, case_normalize):
+        self.type_priorities = type_priorities
+        self.case_normalize = case_normalize
+
+
+_TOC_NORMALIZATION = _TOCNormalization(
     # Default priority: 0
-    _TOC_TYPE_PRIORITIES = {
+    type_priorities={
         # DEPENDENCY entries need to replace original entries, so they need the highest priority.
         'DEPENDENCY': 3,
         # SYMLINK entries have higher priority than other regular entries
@@ -316,62 +395,118 @@ def normalize_toc(toc):
         # BINARY/EXTENSION entries undergo additional processing, so give them precedence over DATA and other entries.
         'BINARY': 1,
         'EXTENSION': 1,
-    }
-
-    def _type_case_normalization_fcn(typecode):
-        # Case-normalize all entries except OPTION.
-        return typecode not in {
-            "OPTION",
-        }
-
-    return _normalize_toc(toc, _TOC_TYPE_PRIORITIES, _type_case_normalization_fcn)
+    },
+    case_normalize=True,
+)
 
-
-def normalize_pyz_toc(toc):
+_PYZ_TOC_NORMALIZATION = _TOCNormalization(
     # Default priority: 0
-    _TOC_TYPE_PRIORITIES = {
+    type_priorities={
         # Ensure that entries with higher optimization level take precedence.
         'PYMODULE-2': 2,
         'PYMODULE-1': 1,
         'PYMODULE': 0,
-    }
-
-    return _normalize_toc(toc, _TOC_TYPE_PRIORITIES)
+    },
+    case_normalize=False,
+)
 
 
-def _normalize_toc(toc, toc_type_priorities, type_case_normalization_fcn=lambda typecode: False):
-    options_toc = []
-    tmp_toc = dict()
-    for dest_name, src_name, typecode in toc:
-        # Exempt OPTION entries from de-duplication processing. Some options might allow being specified multiple times.
-        if typecode == 'OPTION':
-            options_toc.append(((dest_name, src_name, typecode)))
-            continue
+def normalize_toc(*tocs):
+    """
+    Normalize (de-duplicate) the given TOC list(s), and return the result as a new `IndexedTOC` list. Passing multiple
+    lists is equivalent to normalizing their concatenation, but avoids creating the concatenated list, as well as
+    re-processing the first list if it is an already-normalized `IndexedTOC`.
+    """
+    return _normalize_toc(tocs, _TOC_NORMALIZATION)
 
-        # Always sanitize the dest_name with `os.path.normpath` to remove any local loops with parent directory path
-        # components. `pathlib` does not seem to offer equivalent functionality.
-        dest_name = os.path.normpath(dest_name)
 
-        # Normalize the destination name for uniqueness. Use `pathlib.PurePath` to ensure that keys are both
-        # case-normalized (on OSes where applicable) and directory-separator normalized (just in case).
-        if type_case_normalization_fcn(typecode):
-            entry_key = pathlib.PurePath(dest_name)
-        else:
-            entry_key = dest_name
+def normalize_pyz_toc(*tocs):
+    """
+    Normalize (de-duplicate) the given PYZ TOC list(s); see `normalize_toc`.
+    """
+    return _normalize_toc(tocs, _PYZ_TOC_NORMALIZATION)
+
+
+def _normalize_toc(tocs, normalization):
+    toc_type_priorities = normalization.type_priorities
+    case_normalize = normalization.case_normalize
+    intern = sys.intern
+
+    # Start from the index of the first TOC, if it is an already-normalized TOC with valid index.
+    index = None
+    if tocs and isinstance(tocs[0], IndexedTOC) and tocs[0]._index is not None:
+        index_normalization, options_toc, tmp_toc = tocs[0]._index
+        if index_normalization is normalization:
+            index = (list(options_toc), dict(tmp_toc))
+    if index is not None:
+        options_toc, tmp_toc = index
+        tocs = tocs[1:]
+    else:
+        options_toc = []
+        tmp_toc = dict()
+
+    for toc in tocs:
+        for dest_name, src_name, typecode in toc:
+            # Exempt OPTION entries from de-duplication processing. Some options might allow being specified multiple
+            # times.
+            if typecode == 'OPTION':
+                options_toc.append(((dest_name, src_name, typecode)))
+                continue
 
-        existing_entry = tmp_toc.get(entry_key)
-        if existing_entry is None:
-            # Entry does not exist - insert
-            tmp_toc[entry_key] = (dest_name, src_name, typecode)
-        else:
-            # Entry already exists - replace if its typecode has higher priority
-            _, _, existing_typecode = existing_entry
-            if toc_type_priorities.get(typecode, 0) > toc_type_priorities.get(existing_typecode, 0):
+            # Always sanitize the dest_name with `os.path.normpath` to remove any local loops with parent directory
+            # path components. The strings are interned, as the same names are repeated in many TOC lists throughout
+            # the build.
+            dest_name = intern(os.path.normpath(dest_name))
+            if type(src_name) is str:
+                src_name = intern(src_name)
+            typecode = intern(typecode)
+
+            # Normalize the destination name for uniqueness. The name is already directory-separator normalized by
+            # `os.path.normpath`; `os.path.normcase` additionally case-normalizes it on OSes where applicable.
+            entry_key = os.path.normcase(dest_name) if case_normalize else dest_name
+
+            existing_entry = tmp_toc.get(entry_key)
+            if existing_entry is None:
+                # Entry does not exist - insert
                 tmp_toc[entry_key] = (dest_name, src_name, typecode)
+            else:
+                # Entry already exists - replace if its typecode has higher priority
+                _, _, existing_typecode = existing_entry
+                if toc_type_priorities.get(typecode, 0) > toc_type_priorities.get(existing_typecode, 0):
+                    tmp_toc[entry_key] = (dest_name, src_name, typecode)
 
     # Return the items as list. The order matches the original order due to python dict maintaining the insertion order.
     # The exception are OPTION entries, which are now placed at the beginning of the TOC.
-    return options_toc + list(tmp_toc.values())
+    normalized_toc = IndexedTOC([*options_toc, *tmp_toc.values()])
+    normalized_toc._index = (normalization, options_toc, tmp_toc)
+    return normalized_toc
+
+
+def _lstat(path):
+    """
+    Cached `os.lstat`, using the build-wide CONF['lstat_cache'] dictionary, if available. Returns None if the path
+    does not exist. Intended for the collected source files, which are not expected to change during the build.
+    """
+    from PyInstaller.config import CONF
+
+    lstat_cache = CONF.get('lstat_cache')
+    if lstat_cache is not None:
+        try:
+            return lstat_cache[path]
+        except KeyError:
+            pass
+    try:
+        st = os.lstat(path)
+    except (OSError, ValueError):
+        st = None
+    if lstat_cache is not None:
+        lstat_cache[path] = st
+    return st
+
+
+def _islink(path):
+    st = _lstat(path)
+    return st is not None and stat.S_ISLNK(st.st_mode)
 
 
 def toc_process_symbolic_links(toc):
@@ -398,7 +533,7 @@ def toc_process_symbolic_links(toc):
             continue
 
         # Source path is not a symbolic link (i.e., it is a regular file or directory)
-        if not os.path.islink(src_name):
+        if not _islink(src_name):
             new_toc.append(entry)
             continue
 
@@ -427,7 +562,7 @@ def _try_preserving_symbolic_link(dest_name, src_name, all_dest_files):
         seen_src_files.add(ref_src_file)
 
         # Stop when referenced source file is not a symbolic link anymore.
-        if not os.path.islink(ref_src_file):
+        if not _islink(ref_src_file):
             break
 
         # Read the symbolic link's target, but do not fully resolve it using os.path.realpath(), because there might be
@@ -17,7 +17,7 @@
 
 from PyInstaller.building.api import COLLECT, EXE
 from PyInstaller.building.datastruct import Target, logger, normalize_toc
-from PyInstaller.building.utils import _check_path_overlap, _rmtree, process_collected_binary
+from PyInstaller.building.utils import _check_path_overlap, _rmtree, process_collected_binaries
 from PyInstaller.compat import is_darwin, strict_collect_mode
 from PyInstaller.building.icon import normalize_icon_type
 import PyInstaller.utils.misc as miscutils
@@ -603,8 +603,23 @@ def assemble(self):
         # Pre-process the TOC into its final BUNDLE-compatible form.
         bundle_toc = self._process_bundle_toc(self.toc)
 
-        # Perform the actual collection.
+        # Process the binaries up-front, in parallel. The binaries are processed using their *original* destination
+        # path (see the comment below).
         CONTENTS_FRAMEWORKS_PATH = pathlib.PurePath('Contents/Frameworks')
+        processed_binaries = process_collected_binaries(
+            [(
+                src_name, str(pathlib.PurePath(dest_name).relative_to(CONTENTS_FRAMEWORKS_PATH)), typecode
+                == 'EXTENSION'
+            ) for dest_name, src_name, typecode in bundle_toc if typecode in ('EXTENSION', 'BINARY')],
+            use_strip=self.strip,
+            use_upx=self.upx,
+            upx_exclude=self.upx_exclude,
+            target_arch=self.target_arch,
+            codesign_identity=self.codesign_identity,
+            entitlements_file=self.entitlements_file,
+        )
+
+        # Perform the actual collection.
         for dest_name, src_name, typecode in bundle_toc:
             # Create parent directory structure, if necessary
             dest_path = os.path.join(self.name, dest_name)  # Absolute destination path
@@ -624,17 +639,7 @@ def assemble(self):
             # `Contents/MacOS`).
             if typecode in ('EXTENSION', 'BINARY'):
                 orig_dest_name = str(pathlib.PurePath(dest_name).relative_to(CONTENTS_FRAMEWORKS_PATH))
-                src_name = process_collected_binary(
-                    src_name,
-                    orig_dest_name,
-                    use_strip=self.strip,
-                    use_upx=self.upx,
-                    upx_exclude=self.upx_exclude,
-                    target_arch=self.target_arch,
-                    codesign_identity=self.codesign_identity,
-                    entitlements_file=self.entitlements_file,
-                    strict_arch_validation=(typecode == 'EXTENSION'),
-                )
+                src_name = processed_binaries[(src_name, orig_dest_name)]
             if typecode == 'SYMLINK':
                 os.symlink(src_name, dest_path)  # Create link at dest_path, pointing at (relative) src_name
             else:
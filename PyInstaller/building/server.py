@@ -0,0 +1,409 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Build server for repeated PyInstaller invocations (``pyinstaller --server``).
+
+The server keeps a warm process with PyInstaller's modules imported, the ldconfig cache loaded, and the module graph
+snapshots of recent builds (see `PyInstaller.depend.analysis.preload_base_snapshot`) held in memory. It listens on a
+UNIX socket in the user's runtime directory; if the ``PYINSTALLER_USE_SERVER`` environment variable is set, the
+`pyinstaller` command forwards its arguments, working directory and environment to the server, if one is running for the
+same python interpreter, PyInstaller version, and cache directory.
+
+Each build runs in a process forked from the server, so builds cannot affect each other's state. The build's stdout and
+stderr output are relayed to the client, followed by its exit code. Cached state is re-validated by the build itself
+(module graph snapshots are fingerprinted and their module files are re-checked; the ldconfig cache is discarded if
+``/etc/ld.so.cache`` has been modified). Builds run without a terminal (their stdin is redirected from ``/dev/null``),
+so they cannot ask for confirmation; use ``--noconfirm`` to allow removal of existing output directories.
+"""
+
+import hashlib
+import json
+import logging as _logging
+import os
+import signal
+import selectors
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import time
+import traceback
+
+from PyInstaller import __version__
+from PyInstaller import compat
+from PyInstaller import log as logging
+
+logger = logging.getLogger(__name__)
+
+# Message types of the protocol between the client and the server. Each message consists of the type byte, the length
+# of the payload (a 32-bit unsigned big-endian integer) and the payload.
+MSG_REQUEST = b'B'  # Client -> server; JSON-encoded build request.
+MSG_STDOUT = b'O'  # Server -> client; chunk of the build's stdout output.
+MSG_STDERR = b'E'  # Server -> client; chunk of the build's stderr output.
+MSG_EXIT = b'X'  # Server -> client; exit code of the build.
+MSG_REFUSED = b'R'  # Server -> client; the request cannot be handled by this server (reason in payload).
+
+_HEADER = struct.Struct('>cI')
+
+_LDCONFIG_CACHE_FILE = '/etc/ld.so.cache'
+
+
+def get_server_address():
+    """
+    Return the path of the UNIX socket of the build server for the running python interpreter, PyInstaller version, and
+    cache directory.
+    """
+    from PyInstaller import configure
+
+    digest = hashlib.sha256(
+        f"{sys.executable}\n{__version__}\n{configure._get_pyinstaller_cache_dir()}".encode('utf-8')
+    ).hexdigest()[:12]
+    return os.path.join(_get_socket_dir(), f'pyinstaller-server-{digest}.sock')
+
+
+def _get_socket_dir():
+    """
+    Return the directory for the server socket: the user's runtime directory (``$XDG_RUNTIME_DIR``) if available, or a
+    per-user directory in the temporary directory. The socket is kept out of the cache directory, which is emptied by
+    ``--clean``, and its path is kept short, as the length of UNIX socket paths is limited (to 104 bytes on macOS).
+    """
+    runtime_dir = compat.getenv('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return runtime_dir
+    return os.path.join(tempfile.gettempdir(), f'pyinstaller-{os.getuid()}')
+
+
+def _is_private_dir(path):
+    """
+    Check that the given directory is owned by the current user, and not accessible by anyone else; otherwise, another
+    user could intercept the builds (including their environment).
+    """
+    try:
+        dir_stat = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(dir_stat.st_mode) and dir_stat.st_uid == os.getuid() and not dir_stat.st_mode & 0o077
+
+
+def _send_message(sock, msg_type, payload=b''):
+    sock.sendall(_HEADER.pack(msg_type, len(payload)) + payload)
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError("Connection closed.")
+        data += chunk
+    return bytes(data)
+
+
+def _recv_message(sock):
+    msg_type, size = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return msg_type, _recv_exactly(sock, size)
+
+
+def forward_build(args, address=None):
+    """
+    Forward the build with the given command-line arguments to the build server, relay its output to stdout and stderr,
+    and return its exit code. Returns None if no compatible server is running; the build should then be run locally.
+    """
+    if compat.is_win:
+        return None
+    if address is None:
+        address = get_server_address()
+    if not os.path.exists(address) or not _is_private_dir(os.path.dirname(address)):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        request = {
+            'version': __version__,
+            'executable': sys.executable,
+            'args': list(args),
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+            'path': list(sys.path),
+        }
+        try:
+            _send_message(sock, MSG_REQUEST, json.dumps(request).encode('utf-8'))
+            logger.info("Forwarding build to PyInstaller server at %s", address)
+            while True:
+                msg_type, payload = _recv_message(sock)
+                if msg_type in (MSG_STDOUT, MSG_STDERR):
+                    stream = sys.stdout if msg_type == MSG_STDOUT else sys.stderr
+                    stream.buffer.write(payload)
+                    stream.buffer.flush()
+                elif msg_type == MSG_EXIT:
+                    return int(payload)
+                elif msg_type == MSG_REFUSED:
+                    logger.debug("PyInstaller server refused the build: %s", payload.decode('utf-8', errors='replace'))
+                    return None
+        except (EOFError, OSError) as e:
+            raise SystemExit(f"Error: lost connection to PyInstaller server at {address}: {e}")
+
+
+def _warm_up():
+    """
+    Import the modules used by the builds and load the state that does not depend on the build, so that the forked
+    build processes inherit them.
+    """
+    import PyInstaller.building.build_main  # noqa: F401
+    import PyInstaller.utils.hooks  # noqa: F401
+
+    if compat.is_unix:
+        from PyInstaller.depend import utils
+        utils.load_ldconfig_cache()
+
+
+def _get_ldconfig_cache_mtime():
+    try:
+        return os.stat(_LDCONFIG_CACHE_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _apply_client_state(request):
+    """
+    Take over the client's environment, working directory and module search path, and re-compute the settings that are
+    derived from them when PyInstaller's modules are imported.
+    """
+    import PyInstaller
+    import PyInstaller.building.build_main
+    import PyInstaller.building.makespec
+
+    os.environ.clear()
+    os.environ.update(request['env'])
+    os.chdir(request['cwd'])
+    sys.path[:] = request['path']
+
+    cwd = os.getcwd()
+    PyInstaller.DEFAULT_SPECPATH = PyInstaller.building.makespec.DEFAULT_SPECPATH = cwd
+    PyInstaller.DEFAULT_DISTPATH = PyInstaller.building.build_main.DEFAULT_DISTPATH = os.path.join(cwd, 'dist')
+    PyInstaller.DEFAULT_WORKPATH = PyInstaller.building.build_main.DEFAULT_WORKPATH = os.path.join(cwd, 'build')
+
+    compat.strict_collect_mode = compat.getenv("PYINSTALLER_STRICT_COLLECT_MODE", "0") != "0"
+
+    env_level = compat.getenv("PYI_LOG_LEVEL", "INFO")
+    try:
+        _logging.getLogger().setLevel(logging.LEVELS[env_level.upper()])
+    except KeyError:
+        raise SystemExit(f"Invalid PYI_LOG_LEVEL value '{env_level}'. Should be one of {list(logging.LEVELS)}.")
+    # Report the time relative to the start of the build, not to the start of the server.
+    formatter = _BuildLogFormatter(time.time())
+    for handler in _logging.getLogger().handlers:
+        handler.setFormatter(formatter)
+
+
+class _BuildLogFormatter(_logging.Formatter):
+    """
+    Log formatter that reports the time of records (`relativeCreated`) relative to the given start time of the build.
+    """
+    def __init__(self, start_time):
+        super().__init__(logging.FORMAT)
+        self.start_time = start_time
+
+    def formatMessage(self, record):
+        record.relativeCreated = (record.created - self.start_time) * 1000
+        return super().formatMessage(record)
+
+
+def _run_build(request, stdout_fd, stderr_fd, ldconfig_cache_mtime):
+    """
+    Run the build in the forked process. Returns the exit code.
+    """
+    import PyInstaller.__main__
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    # Redirect the output to the server process, and detach from its terminal.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    null_fd = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null_fd, 0)
+    os.close(null_fd)
+    os.dup2(stdout_fd, 1)
+    os.dup2(stderr_fd, 2)
+    os.close(stdout_fd)
+    os.close(stderr_fd)
+
+    if compat.is_unix and _get_ldconfig_cache_mtime() != ldconfig_cache_mtime:
+        from PyInstaller.depend import utils
+        utils.LDCONFIG_CACHE = None
+
+    try:
+        _apply_client_state(request)
+        PyInstaller.__main__.run(request['args'])
+        exit_code = 0
+    except SystemExit as e:
+        # Mirror the interpreter's handling of SystemExit.
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return exit_code
+
+
+def _handle_connection(conn, ldconfig_cache_mtime):
+    msg_type, payload = _recv_message(conn)
+    if msg_type != MSG_REQUEST:
+        raise ValueError(f"Unexpected message type {msg_type!r}.")
+    request = json.loads(payload)
+    if request.get('version') != __version__ or request.get('executable') != sys.executable:
+        _send_message(conn, MSG_REFUSED, b'Incompatible python interpreter or PyInstaller version.')
+        return
+
+    logger.info("Building %s in %s", ' '.join(request['args']), request['cwd'])
+    stdout_read, stdout_write = os.pipe()
+    stderr_read, stderr_write = os.pipe()
+    status_read, status_write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            os.close(stdout_read)
+            os.close(stderr_read)
+            os.close(status_read)
+            conn.close()
+            exit_code = _run_build(request, stdout_write, stderr_write, ldconfig_cache_mtime)
+            from PyInstaller.depend import analysis
+            os.write(status_write, json.dumps(analysis._base_snapshots_used).encode('utf-8'))
+        finally:
+            os._exit(exit_code)
+
+    os.close(stdout_write)
+    os.close(stderr_write)
+    os.close(status_write)
+    try:
+        client_connected = True
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout_read, selectors.EVENT_READ, MSG_STDOUT)
+            selector.register(stderr_read, selectors.EVENT_READ, MSG_STDERR)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    chunk = os.read(key.fd, 64 * 1024)
+                    if not chunk:
+                        selector.unregister(key.fd)
+                        os.close(key.fd)
+                        continue
+                    if client_connected:
+                        try:
+                            _send_message(conn, key.data, chunk)
+                        except OSError:
+                            # The client went away (e.g., it was interrupted); abort the build.
+                            client_connected = False
+                            os.kill(pid, signal.SIGINT)
+        with os.fdopen(status_read, 'rb') as status:
+            snapshots_used = status.read()
+    finally:
+        _, wait_status = os.waitpid(pid, 0)
+
+    if os.WIFSIGNALED(wait_status):
+        exit_code = 128 + os.WTERMSIG(wait_status)  # Terminated by a signal; report it the same way as shells do.
+    else:
+        exit_code = os.WEXITSTATUS(wait_status)
+    logger.info("Build finished with exit code %d.", exit_code)
+    if client_connected:
+        try:
+            _send_message(conn, MSG_EXIT, str(exit_code).encode('ascii'))
+        except OSError:
+            pass
+
+    # Keep the module graph snapshots used by the build in memory, for the next builds.
+    from PyInstaller.depend import analysis
+    try:
+        snapshots_used = json.loads(snapshots_used) if snapshots_used else []
+    except ValueError:
+        snapshots_used = []
+    for cachedir, fingerprint in snapshots_used:
+        analysis.preload_base_snapshot(cachedir, fingerprint)
+
+
+def serve(address=None):
+    """
+    Run the build server, until it is interrupted or terminated.
+    """
+    if compat.is_win:
+        raise SystemExit("Error: the PyInstaller build server is not supported on Windows.")
+    if address is None:
+        address = get_server_address()
+
+    if os.path.exists(address):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(address)
+        except OSError:
+            os.unlink(address)  # Left behind by a server that did not shut down cleanly.
+        else:
+            raise SystemExit(f"Error: a PyInstaller server is already running at {address}.")
+        finally:
+            probe.close()
+
+    logger.info("Starting PyInstaller server...")
+    _warm_up()
+    ldconfig_cache_mtime = _get_ldconfig_cache_mtime()
+
+    os.makedirs(os.path.dirname(address), mode=0o700, exist_ok=True)
+    if not _is_private_dir(os.path.dirname(address)):
+        raise SystemExit(
+            f"Error: the directory for the server socket, {os.path.dirname(address)}, must be owned by the current "
+            "user, and not be accessible by other users."
+        )
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Only the user running the server may connect to it.
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(address)
+    except OSError as e:
+        server.close()
+        raise SystemExit(f"Error: failed to create server socket {address}: {e}")
+    finally:
+        os.umask(old_umask)
+
+    # Shut down cleanly (and remove the socket) on SIGTERM, too.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        server.listen()
+        logger.info("PyInstaller server listening on %s", address)
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    _handle_connection(conn, ldconfig_cache_mtime)
+                except (EOFError, OSError, ValueError) as e:
+                    logger.warning("Failed to handle build request: %s", e)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info("Shutting down PyInstaller server.")
+        server.close()
+        try:
+            os.unlink(address)
+        except OSError:
+            pass
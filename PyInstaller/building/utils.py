@@ -9,10 +9,12 @@
 # SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
 #-----------------------------------------------------------------------------
 
+import concurrent.futures
 import fnmatch
 import glob
 import hashlib
 import io
+import json
 import marshal
 import os
 import pathlib
@@ -21,10 +23,14 @@
 import struct
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 import zipfile
 
 from PyInstaller import compat
 from PyInstaller import log as logging
+from PyInstaller.building import cache
 from PyInstaller.compat import EXTENSION_SUFFIXES, is_darwin, is_win, is_linux
 from PyInstaller.config import CONF
 from PyInstaller.exceptions import InvalidSrcDestTupleError
@@ -77,6 +83,17 @@ def _check_guts_toc(attr_name, old_toc, new_toc, last_build):
         _check_guts_toc_mtime(attr_name, old_toc, new_toc, last_build)
 
 
+def is_upx_available():
+    """
+    Return whether UPX is available for the build. Unless explicitly configured, the availability is checked on first
+    use.
+    """
+    if CONF.get('upx_available') is None:
+        from PyInstaller import configure
+        CONF['upx_available'] = configure.get_upx_availability(CONF.get('upx_dir'))
+    return CONF['upx_available']
+
+
 def add_suffix_to_extension(dest_name, src_name, typecode):
     """
     Take a TOC entry (dest_name, src_name, typecode) and adjust the dest_name for EXTENSION to include the full library
@@ -120,6 +137,9 @@ def process_collected_binary(
     this rewrites the library paths in the headers, and (re-)signs the binary. On-disk cache is used to avoid processing
     the same binary with same options over and over.
 
+    The cache is content-addressed; the processed files are stored under the digest of the source file's contents, and
+    are written atomically, so the cache can be safely shared by concurrently running builds.
+
     In addition to given arguments, this function also uses CONF['cachedir'] and CONF['upx_dir'].
     """
     from PyInstaller.config import CONF
@@ -174,10 +194,8 @@ def process_collected_binary(
     # Prepare cache directory path. Cache is tied to python major/minor version, but also to various processing options.
     pyver = f'py{sys.version_info[0]}{sys.version_info[1]}'
     arch = platform.architecture()[0]
-    cache_dir = os.path.join(
-        CONF['cachedir'],
-        f'bincache{use_strip:d}{use_upx:d}{pyver}{arch}',
-    )
+    cache_name = f'bincache{use_strip:d}{use_upx:d}{pyver}{arch}'
+    cache_dir = os.path.join(CONF['cachedir'], cache_name)
     if target_arch:
         cache_dir = os.path.join(cache_dir, target_arch)
     if is_darwin:
@@ -196,35 +214,65 @@ def process_collected_binary(
             cache_dir = os.path.join(cache_dir, ef_hash.hexdigest())
         else:
             cache_dir = os.path.join(cache_dir, 'no-entitlements')
-    os.makedirs(cache_dir, exist_ok=True)
 
-    # Load cache index, if available
-    cache_index_file = os.path.join(cache_dir, "index.dat")
+    # Look up the file in cache. The processed file is stored under the digest of the source file; on macOS, the
+    # processing also depends on the location of the binary within the bundle (rpath). The base name of the destination
+    # is preserved, as it is used, for example, as the identifier in the code signature.
+    cache_key = _get_file_digest(src_name)
+    if is_darwin:
+        cache_key += f"-{len(pathlib.PurePath(dest_name).parent.parts)}"
+    cache_entry_dir = os.path.join(cache_dir, cache_key[:2], cache_key)
+    cached_name = os.path.join(cache_entry_dir, os.path.basename(dest_name))
+
+    if os.path.isfile(cached_name):
+        cache.record_hit(cache_name, cache_entry_dir, os.path.getsize(src_name))
+        return cached_name
+    cache.record_miss(cache_name)
+
+    # Process the file in a private temporary directory, and then atomically move it into place.
+    os.makedirs(cache_entry_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=cache_entry_dir)
     try:
-        cache_index = misc.load_py_data_struct(cache_index_file)
-    except FileNotFoundError:
-        cache_index = {}
-    except Exception:
-        # Tell the user they may want to fix their cache... However, do not delete it for them; if it keeps getting
-        # corrupted, we will never find out.
-        logger.warning("PyInstaller bincache may be corrupted; use pyinstaller --clean to fix it.")
-        raise
-
-    # Look up the file in cache; use case-normalized destination name as identifier.
-    cached_id = os.path.normcase(dest_name)
-    cached_name = os.path.join(cache_dir, dest_name)
-    src_digest = _compute_file_digest(src_name)
+        processed_name = os.path.join(tmp_dir, os.path.basename(dest_name))
+        _process_binary_file(
+            src_name,
+            dest_name,
+            processed_name,
+            use_strip=use_strip,
+            use_upx=use_upx,
+            target_arch=target_arch,
+            codesign_identity=codesign_identity,
+            entitlements_file=entitlements_file,
+            strict_arch_validation=strict_arch_validation,
+        )
+        try:
+            os.replace(processed_name, cached_name)
+        except OSError:
+            # On Windows, replacing the file fails if the file was created in the mean time by another build, and is
+            # currently in use.
+            if not os.path.isfile(cached_name):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
-    if cached_id in cache_index:
-        # If digest matches to the cached digest, return the cached file...
-        if src_digest == cache_index[cached_id]:
-            return cached_name
+    return cached_name
 
-        # ... otherwise remove it.
-        os.remove(cached_name)
 
-    # Ensure parent path exists
-    os.makedirs(os.path.dirname(cached_name), exist_ok=True)
+def _process_binary_file(
+    src_name,
+    dest_name,
+    cached_name,
+    use_strip,
+    use_upx,
+    target_arch,
+    codesign_identity,
+    entitlements_file,
+    strict_arch_validation,
+):
+    """
+    Copy the binary to the given cache location, and process it in-place. Helper for `process_collected_binary`.
+    """
+    from PyInstaller.config import CONF
 
     # Use `shutil.copyfile` to copy the file with default permissions bits, then manually set executable
     # bits. This way, we avoid copying permission bits and metadata from the original file, which might be too
@@ -333,11 +381,139 @@ def process_collected_binary(
         except Exception as e:
             raise SystemError(f"Failed to process binary {cached_name!r}!") from e
 
-    # Update cache index
-    cache_index[cached_id] = src_digest
-    misc.save_py_data_struct(cache_index_file, cache_index)
 
-    return cached_name
+def process_collected_binaries(binaries, **kwargs):
+    """
+    Process multiple collected binaries using `process_collected_binary`, in a pool of worker threads (the processing
+    is dominated by the external strip, UPX, and codesign utilities).
+
+    `binaries` is an iterable of (src_name, dest_name, strict_arch_validation) tuples; the remaining keyword arguments
+    are passed to `process_collected_binary`. Returns a dictionary that maps (src_name, dest_name) tuples to the names
+    of processed files.
+    """
+    from PyInstaller.config import CONF
+
+    binaries = list(binaries)
+    if not binaries:
+        return {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        futures = {}
+        for src_name, dest_name, strict_arch_validation in binaries:
+            futures[(src_name, dest_name)] = executor.submit(
+                process_collected_binary,
+                src_name,
+                dest_name,
+                strict_arch_validation=strict_arch_validation,
+                **kwargs,
+            )
+        processed = {key: future.result() for key, future in futures.items()}
+
+    _save_file_digest_cache()
+    cache.save_stats(CONF['cachedir'])
+
+    return processed
+
+
+# Memoized digests of files' contents, keyed by the file path, and validated using the file size and modification
+# time. The memo is persisted in the cache directory, so that unchanged source files are not re-hashed in subsequent
+# builds. Each record is a `[size, mtime_ns, digest, last_used]` list, where `last_used` is the time (in seconds since
+# the epoch) at which the record was last used by a build.
+_file_digest_cache = None
+_file_digest_cache_file = None
+_file_digest_cache_modified = False
+_file_digest_cache_used = set()
+_file_digest_cache_lock = threading.Lock()
+
+# The `last_used` time of a record is refreshed (and the memo written) at most once per this many seconds.
+_FILE_DIGEST_TOUCH_INTERVAL = 24 * 60 * 60
+
+# Records that were not used for this many seconds are dropped when the memo is written; so are the records of files
+# that no longer exist.
+_FILE_DIGEST_MAX_UNUSED_AGE = 30 * 24 * 60 * 60
+
+
+def _load_file_digest_cache():
+    global _file_digest_cache, _file_digest_cache_file, _file_digest_cache_modified
+
+    from PyInstaller.config import CONF
+
+    cache_file = os.path.join(CONF['cachedir'], cache.DIGESTS_FILENAME)
+    if _file_digest_cache is not None and _file_digest_cache_file == cache_file:
+        return _file_digest_cache
+
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as fp:
+            data = json.load(fp)
+        # Skip malformed records (e.g., from an older version of the memo).
+        _file_digest_cache = {
+            filename: record
+            for filename, record in data.items() if isinstance(record, list) and len(record) == 4
+        }
+    except FileNotFoundError:
+        _file_digest_cache = {}
+    except Exception:
+        logger.warning("PyInstaller bincache digest file %r is corrupted; ignoring it.", cache_file)
+        _file_digest_cache = {}
+    _file_digest_cache_file = cache_file
+    _file_digest_cache_modified = False
+    _file_digest_cache_used.clear()
+
+    return _file_digest_cache
+
+
+def _save_file_digest_cache():
+    global _file_digest_cache_modified
+
+    with _file_digest_cache_lock:
+        if _file_digest_cache is None or not _file_digest_cache_modified:
+            return
+
+        # Drop the records that were not used by this process, if they are too old or if their file no longer exists.
+        now = time.time()
+        for filename, (_, _, _, last_used) in list(_file_digest_cache.items()):
+            if filename in _file_digest_cache_used:
+                continue
+            if now - last_used > _FILE_DIGEST_MAX_UNUSED_AGE or not os.path.isfile(filename):
+                del _file_digest_cache[filename]
+
+        os.makedirs(os.path.dirname(_file_digest_cache_file), exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(_file_digest_cache_file))
+        with open(fd, 'w', encoding='utf-8') as fp:
+            json.dump(_file_digest_cache, fp)
+        os.replace(tmp_file, _file_digest_cache_file)
+        _file_digest_cache_modified = False
+
+
+def _get_file_digest(filename):
+    """
+    Return hex digest of the file's contents, using the memoized value if file's size and modification time have not
+    changed.
+    """
+    global _file_digest_cache_modified
+
+    filename = os.path.abspath(filename)
+    file_stat = os.stat(filename)
+
+    now = time.time()
+    with _file_digest_cache_lock:
+        cache = _load_file_digest_cache()
+        cached_entry = cache.get(filename)
+        if cached_entry and cached_entry[0] == file_stat.st_size and cached_entry[1] == file_stat.st_mtime_ns:
+            _file_digest_cache_used.add(filename)
+            if now - cached_entry[3] > _FILE_DIGEST_TOUCH_INTERVAL:
+                cached_entry[3] = int(now)
+                _file_digest_cache_modified = True
+            return cached_entry[2]
+
+    digest = _compute_file_digest(filename)
+
+    with _file_digest_cache_lock:
+        cache[filename] = [file_stat.st_size, file_stat.st_mtime_ns, digest, int(now)]
+        _file_digest_cache_used.add(filename)
+        _file_digest_cache_modified = True
+
+    return digest
 
 
 def _compute_file_digest(filename):
@@ -345,7 +521,7 @@ def _compute_file_digest(filename):
     with open(filename, "rb") as fp:
         for chunk in iter(lambda: fp.read(16 * 1024), b""):
             hasher.update(chunk)
-    return bytearray(hasher.digest())
+    return hasher.hexdigest()
 
 
 def _check_path_overlap(path):
@@ -385,6 +561,23 @@ def _make_clean_directory(path):
         os.makedirs(path, exist_ok=True)
 
 
+def _link_collected_file(target_path, link_path):
+    """
+    Create a link to the already-collected file at **target_path**; a relative symbolic link on POSIX systems (so that
+    the bundle remains relocatable), and a hard link on Windows (where creating symbolic links requires elevated
+    privileges). Falls back to copying the file if the link cannot be created.
+    """
+    try:
+        if is_win:
+            os.link(target_path, link_path)
+        else:
+            os.symlink(os.path.relpath(target_path, os.path.dirname(link_path)), link_path)
+    except OSError:
+        logger.debug("Failed to link %r to %r; copying the file instead.", link_path, target_path, exc_info=True)
+        shutil.copyfile(target_path, link_path)
+        shutil.copymode(target_path, link_path)
+
+
 def _rmtree(path):
     """
     Remove directory and all its contents, but only after user confirmation, or if the -y option is set.
@@ -392,7 +585,7 @@ def _rmtree(path):
     from PyInstaller.config import CONF
     if CONF['noconfirm']:
         choice = 'y'
-    elif sys.stdout.isatty():
+    elif sys.stdin.isatty() and sys.stdout.isatty():
         choice = input(
             'WARNING: The output directory "%s" and ALL ITS CONTENTS will be REMOVED! Continue? (y/N)' % path
         )
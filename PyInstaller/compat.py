@@ -35,25 +35,24 @@
 # nor are they required during that phase.
 _setup_py_mode = os.environ.get('_PYINSTALLER_SETUP_PY', '0') != '0'
 
-# PyInstaller requires importlib.metadata from python >= 3.10 stdlib, or equivalent importlib-metadata >= 4.6.
+# PyInstaller requires importlib.metadata from python >= 3.10 stdlib, or equivalent importlib-metadata >= 4.6. The
+# stdlib module is imported lazily, on the first access to `importlib_metadata` (see `__getattr__` below), as it is
+# comparatively expensive to import, and not needed by the command-line utilities that do not perform a build.
 if _setup_py_mode:
     importlib_metadata = None
-else:
-    if sys.version_info >= (3, 10):
-        import importlib.metadata as importlib_metadata
-    else:
-        try:
-            import importlib_metadata
-        except ImportError as e:
-            from PyInstaller.exceptions import ImportlibMetadataError
-            raise ImportlibMetadataError() from e
+elif sys.version_info < (3, 10):
+    try:
+        import importlib_metadata
+    except ImportError as e:
+        from PyInstaller.exceptions import ImportlibMetadataError
+        raise ImportlibMetadataError() from e
 
-        import packaging.version  # For importlib_metadata version check
+    import packaging.version  # For importlib_metadata version check
 
-        # Validate the version
-        if packaging.version.parse(importlib_metadata.version("importlib-metadata")) < packaging.version.parse("4.6"):
-            from PyInstaller.exceptions import ImportlibMetadataError
-            raise ImportlibMetadataError()
+    # Validate the version
+    if packaging.version.parse(importlib_metadata.version("importlib-metadata")) < packaging.version.parse("4.6"):
+        from PyInstaller.exceptions import ImportlibMetadataError
+        raise ImportlibMetadataError()
 
 # Strict collect mode, which raises error when trying to collect duplicate files into PKG/CArchive or COLLECT.
 strict_collect_mode = os.environ.get("PYINSTALLER_STRICT_COLLECT_MODE", "0") != "0"
@@ -92,10 +91,6 @@
 # Mac OS is not considered as unix since there are many platform-specific details for Mac in PyInstaller.
 is_unix = is_linux or is_solar or is_aix or is_freebsd or is_hpux or is_openbsd
 
-# Linux distributions such as Alpine or OpenWRT use musl as their libc implementation and resultantly need specially
-# compiled bootloaders. On musl systems, ldd with no arguments prints 'musl' and its version.
-is_musl = is_linux and "musl" in subprocess.run(["ldd"], capture_output=True, encoding="utf-8").stderr
-
 # macOS version
 _macos_ver = tuple(int(x) for x in platform.mac_ver()[0].split('.')) if is_darwin else None
 
@@ -255,13 +250,6 @@
                 del sys.modules['cffi']
             del orig_cffi
 
-# macOS's platform.architecture() can be buggy, so we do this manually here. Based off the python documentation:
-# https://docs.python.org/3/library/platform.html#platform.architecture
-if is_darwin:
-    architecture = '64bit' if sys.maxsize > 2**32 else '32bit'
-else:
-    architecture = platform.architecture()[0]
-
 # Cygwin needs special handling, because platform.system() contains identifiers such as MSYS_NT-10.0-19042 and
 # CYGWIN_NT-10.0-19042 that do not fit PyInstaller's OS naming scheme. Explicitly set `system` to 'Cygwin'.
 system = 'Cygwin' if is_cygwin else platform.system()
@@ -274,6 +262,47 @@
 else:
     machine = _pyi_machine(platform.machine(), platform.system())
 
+# Attributes that require probing the environment (for example, by running external programs) are evaluated lazily, on
+# first access, by the module-level `__getattr__` below. The computed value is stored in the module globals, so that
+# subsequent accesses bypass `__getattr__`.
+
+
+def _is_musl():
+    # Linux distributions such as Alpine or OpenWRT use musl as their libc implementation and resultantly need specially
+    # compiled bootloaders. On musl systems, ldd with no arguments prints 'musl' and its version.
+    return is_linux and "musl" in subprocess.run(["ldd"], capture_output=True, encoding="utf-8").stderr
+
+
+def _get_architecture():
+    # macOS's platform.architecture() can be buggy, so we do this manually here. Based off the python documentation:
+    # https://docs.python.org/3/library/platform.html#platform.architecture
+    if is_darwin:
+        return '64bit' if sys.maxsize > 2**32 else '32bit'
+    # On other platforms, platform.architecture() runs the `file` utility on the python executable.
+    return platform.architecture()[0]
+
+
+def _import_importlib_metadata():
+    import importlib.metadata
+    return importlib.metadata
+
+
+_LAZY_ATTRIBUTES = {
+    'is_musl': _is_musl,
+    'architecture': _get_architecture,
+}
+if not _setup_py_mode and sys.version_info >= (3, 10):
+    _LAZY_ATTRIBUTES['importlib_metadata'] = _import_importlib_metadata
+
+
+def __getattr__(name):
+    try:
+        func = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = func()
+    return value
+
 
 # Wine detection and support
 def is_wine_dll(filename: str | os.PathLike):
@@ -513,6 +542,7 @@ def __wrap_python(args, kwargs):
     # binaries are running for the same architecture as python executable. It is necessary to run binaries with 'arch'
     # command.
     if is_darwin:
+        architecture = _get_architecture()
         if architecture == '64bit':
             if platform.machine() == 'arm64':
                 py_prefix = ['arch', '-arm64']  # Apple M1
@@ -33,7 +33,9 @@
 
 This is the list of known variables. (Please update it if necessary.)
 
+analysis_jobs
 cachedir
+cache_max_size
 hiddenimports
 noconfirm
 pathex
@@ -46,6 +48,8 @@
 tests_modgraph  - cached PyiModuleGraph object to speed up tests
 
 code_cache - dictionary associating `Analysis.pure` list instances with code cache dictionaries. Used by PYZ writer.
+
+lstat_cache - dictionary caching `os.lstat` results for collected source files during the build. Used by TOC processing.
 """
 
 # NOTE: Do not import other PyInstaller modules here. Just define constants here.
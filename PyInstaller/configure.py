@@ -12,6 +12,7 @@
 Configure PyInstaller for the current Python installation.
 """
 
+import functools
 import os
 import subprocess
 
@@ -50,6 +51,32 @@ def _check_upx_availability(upx_dir):
     return True
 
 
+@functools.lru_cache(maxsize=None)
+def get_upx_availability(upx_dir=None):
+    """
+    Check whether UPX is available and can be used on this platform. The check runs the UPX executable, so it is
+    performed only when needed (i.e., when a build target has UPX enabled), and its result is cached for the lifetime
+    of the process.
+    """
+    # Disable UPX on non-Windows. Using UPX (3.96) on modern Linux shared libraries (for example, the python3.x.so
+    # shared library) seems to result in segmentation fault when they are dlopen'd. This happens in recent versions
+    # of Fedora and Ubuntu linux, as well as in Alpine containers. On macOS, UPX (3.96) fails with
+    # UnknownExecutableFormatException on most .dylibs (and interferes with code signature on other occasions). And
+    # even when it would succeed, compressed libraries cannot be (re)signed due to failed strict validation.
+    upx_available = _check_upx_availability(upx_dir)
+    if upx_available:
+        if compat.is_win or compat.is_cygwin:
+            logger.info("UPX is available and will be used if enabled on build targets.")
+        elif os.environ.get("PYINSTALLER_FORCE_UPX", "0") != "0":
+            logger.warning(
+                "UPX is available and force-enabled on platform with known compatibility problems - use at own risk!"
+            )
+        else:
+            upx_available = False
+            logger.info("UPX is available but is disabled on non-Windows due to known compatibility problems.")
+    return upx_available
+
+
 def _get_pyinstaller_cache_dir():
     old_cache_dir = None
     if compat.getenv('PYINSTALLER_CONFIG_DIR'):
@@ -80,28 +107,27 @@ def _get_pyinstaller_cache_dir():
     return cache_dir
 
 
+def _get_cache_max_size():
+    # Size limit for the cache directory, in bytes; None means unlimited.
+    max_size = compat.getenv('PYINSTALLER_CACHE_MAX_SIZE')
+    if not max_size:
+        return None
+    from PyInstaller.building.cache import parse_size
+    try:
+        return parse_size(max_size)
+    except ValueError:
+        logger.warning("Ignoring invalid PYINSTALLER_CACHE_MAX_SIZE value: %r", max_size)
+        return None
+
+
 def get_config(upx_dir=None):
     config = {}
 
     config['cachedir'] = _get_pyinstaller_cache_dir()
+    config['cache_max_size'] = _get_cache_max_size()
     config['upx_dir'] = upx_dir
 
-    # Disable UPX on non-Windows. Using UPX (3.96) on modern Linux shared libraries (for example, the python3.x.so
-    # shared library) seems to result in segmentation fault when they are dlopen'd. This happens in recent versions
-    # of Fedora and Ubuntu linux, as well as in Alpine containers. On macOS, UPX (3.96) fails with
-    # UnknownExecutableFormatException on most .dylibs (and interferes with code signature on other occasions). And
-    # even when it would succeed, compressed libraries cannot be (re)signed due to failed strict validation.
-    upx_available = _check_upx_availability(upx_dir)
-    if upx_available:
-        if compat.is_win or compat.is_cygwin:
-            logger.info("UPX is available and will be used if enabled on build targets.")
-        elif os.environ.get("PYINSTALLER_FORCE_UPX", "0") != "0":
-            logger.warning(
-                "UPX is available and force-enabled on platform with known compatibility problems - use at own risk!"
-            )
-        else:
-            upx_available = False
-            logger.info("UPX is available but is disabled on non-Windows due to known compatibility problems.")
-    config['upx_available'] = upx_available
+    # UPX availability is checked on first use (see `get_upx_availability`).
+    config['upx_available'] = None
 
     return config
@@ -34,23 +34,32 @@
 """
 
 import ast
+import copyreg
+import hashlib
+import importlib.machinery
+import io
+import json
+import marshal
 import os
+import pickle
 import re
 import sys
 import traceback
+import types
 from collections import defaultdict
 from copy import deepcopy
 
-from PyInstaller import HOMEPATH, PACKAGEPATH
+from PyInstaller import HOMEPATH, PACKAGEPATH, __version__
 from PyInstaller import log as logging
-from PyInstaller.building.utils import add_suffix_to_extension
+from PyInstaller.building.utils import add_suffix_to_extension, _get_file_digest
 from PyInstaller.compat import (
     BAD_MODULE_TYPES, BINARY_MODULE_TYPES, MODULE_TYPES_TO_TOC_DICT, PURE_PYTHON_MODULE_TYPES, PY3_BASE_MODULES,
-    VALID_MODULE_TYPES, importlib_load_source, is_win
+    VALID_MODULE_TYPES, is_win
 )
 from PyInstaller.depend import bytecode
-from PyInstaller.depend.imphook import AdditionalFilesCache, ModuleHookCache
+from PyInstaller.depend.imphook import AdditionalFilesCache, ModuleHookCache, _load_hook_script
 from PyInstaller.depend.imphookapi import (PreFindModulePathAPI, PreSafeImportModuleAPI)
+from PyInstaller.lib.modulegraph import modulegraph
 from PyInstaller.lib.modulegraph.find_modules import get_implies
 from PyInstaller.lib.modulegraph.modulegraph import ModuleGraph, DEFAULT_IMPORT_LEVEL, ABSOLUTE_IMPORT_LEVEL, Package
 from PyInstaller.log import DEBUG, INFO, TRACE
@@ -99,6 +108,16 @@ class PyiModuleGraph(ModuleGraph):
         not create symbolic links into top-level application directory.
     _base_modules: list
         Dependencies for `base_library.zip` (which remain the same for every executable).
+    _base_snapshot_fingerprint : str
+        Fingerprint of the inputs of the base modules analysis (see `initialize_modgraph()`), used as the key of the
+        on-disk snapshot of this graph and of `base_library.zip` created from it. None if snapshots are not available.
+    _base_snapshot_files : dict
+        A dictionary mapping the files of the modules in the snapshot of this graph, and the directories of its
+        packages, to their (size, modification time) at the time the snapshot was created. Used to validate the
+        snapshot when it is loaded.
+    _hook_hiddenimports : dict
+        A dictionary mapping the names of hooked modules to (hook filename, hidden imports) tuples, recording which
+        hook added which hidden imports during the post-graph stage. Used for bundle pruning reports.
     """
 
     # Note: these levels are completely arbitrary and may be adjusted if needed.
@@ -113,6 +132,8 @@ def __init__(self, pyi_homepath, user_hook_dirs=(), excludes=(), **kwargs):
 
         # Absolute paths of all user-defined hook directories.
         self._excludes = excludes
+        self._base_snapshot_fingerprint = None
+        self._base_snapshot_files = None
         self._reset(user_hook_dirs)
         self._analyze_base_modules()
 
@@ -124,6 +145,7 @@ def _reset(self, user_hook_dirs):
         self._additional_files_cache = AdditionalFilesCache()
         self._module_collection_mode = dict()
         self._bindepend_symlink_suppression = set()
+        self._hook_hiddenimports = dict()
         # Hook sources: user-supplied (command-line / spec file), entry-point (upstream hooks, contributed hooks), and
         # built-in hooks. The order does not really matter anymore, because each entry is now a (location, priority)
         # tuple, and order is determined from assigned priority (which may also be overridden by hooks themselves).
@@ -352,6 +374,10 @@ def process_post_graph_hooks(self, analysis):
                 # Update symbolic link suppression patterns for binary dependency analysis.
                 self._bindepend_symlink_suppression.update(module_hook.bindepend_symlink_suppression)
 
+                # Remember which hidden imports were added by this hook.
+                if module_hook.hiddenimports:
+                    self._hook_hiddenimports[module_name] = (module_hook.hook_filename, list(module_hook.hiddenimports))
+
                 # Prevent this module's hooks from being run again.
                 hooked_module_names.add(module_name)
 
@@ -494,7 +520,7 @@ def _safe_import_module(self, module_basename, module_name, parent_package):
             hook_path, hook_basename = os.path.split(hook.hook_filename)
             logger.info('Processing pre-safe-import-module hook %r from %r', hook_basename, hook_path)
             hook_module_name = 'PyInstaller_hooks_pre_safe_import_module_' + module_name.replace('.', '_')
-            hook_module = importlib_load_source(hook_module_name, hook.hook_filename)
+            hook_module = _load_hook_script(hook_module_name, hook.hook_filename)
 
             # Object communicating changes made by this hook back to us.
             hook_api = PreSafeImportModuleAPI(
@@ -535,7 +561,7 @@ def _find_module_path(self, fullname, module_name, search_dirs):
             hook_path, hook_basename = os.path.split(hook.hook_filename)
             logger.info('Processing pre-find-module-path hook %r from %r', hook_basename, hook_path)
             hook_fullname = 'PyInstaller_hooks_pre_find_module_path_' + fullname.replace('.', '_')
-            hook_module = importlib_load_source(hook_fullname, hook.hook_filename)
+            hook_module = _load_hook_script(hook_fullname, hook.hook_filename)
 
             # Object communicating changes made by this hook back to us.
             hook_api = PreFindModulePathAPI(
@@ -694,18 +720,114 @@ def get_importers(self, name):
             fully-qualified name.
 
         """
-        def get_importer_edge_data(importer):
-            edge = self.graph.edge_by_node(importer, name)
-            # edge might be None in case an AliasModule was added.
-            if edge is not None:
-                return self.graph.edge_data(edge)
-
         node = self.find_node(name)
         if node is None:
             return []
-        _, importers = self.get_edges(node)
-        importers = (importer.identifier for importer in importers if importer is not None)
-        return [(importer, get_importer_edge_data(importer)) for importer in importers]
+        # Walk the incoming edges directly, instead of looking up every edge by its pair of nodes.
+        return [(importer.identifier, edge_data) for importer, edge_data in self._iter_importer_edges(node)]
+
+    def _iter_importer_edges(self, node):
+        """
+        Yield (importer node, edge data) pairs for the incoming edges of the given node.
+        """
+        for edge in self.graph.inc_edges(node.graphident):
+            _, edge_data, head, _ = self.graph.describe_edge(edge)
+            importer = self.graph.node_data(head)
+            if importer is not None:
+                yield importer, edge_data
+
+    def _get_hook_edges(self):
+        """
+        Reverse the per-hook hidden imports records into a dictionary that maps (hooked module, hidden import) pairs
+        to hook filenames.
+        """
+        hook_edges = {}
+        for module_name, (hook_filename, hook_hiddenimports) in self._hook_hiddenimports.items():
+            for hiddenimport in hook_hiddenimports:
+                hook_edges[(module_name, hiddenimport)] = hook_filename
+        return hook_edges
+
+    @staticmethod
+    def _get_edge_origin(importer, importer_name, name, hook_edges, hiddenimports):
+        if type(importer).__name__ == 'Script':
+            return 'hiddenimports' if name in hiddenimports else 'script'
+        return hook_edges.get((importer_name, name))
+
+    def get_collection_origins(self, names, hiddenimports=()):
+        """
+        Determine how the modules with the passed names ended up in the graph.
+
+        Returns a dictionary that maps module names to lists of (importer, DependencyInfo, origin)-tuples. The origin
+        is the filename of the hook that added the module as a hidden import, 'hiddenimports' for hidden imports given
+        to the Analysis, 'script' for imports made by a program script, or None for regular imports. Modules that are
+        not in the graph are omitted.
+        """
+        hook_edges = self._get_hook_edges()
+        hiddenimports = set(hiddenimports)
+
+        origins = {}
+        for name in names:
+            node = self.find_node(name, create_nspkg=False)
+            if node is None:
+                continue
+            importers = []
+            for importer, edge_data in self._iter_importer_edges(node):
+                importer_name = str(importer.identifier)
+                origin = self._get_edge_origin(importer, importer_name, name, hook_edges, hiddenimports)
+                importers.append((importer_name, edge_data, origin))
+            origins[name] = importers
+        return origins
+
+    def write_graph_dump(self, fp, hiddenimports=()):
+        """
+        Write the module graph into the given text file object in JSON Lines format, in a single pass over its nodes.
+
+        The first line is a header record (`{"format": "pyinstaller-graph", "version": 1, "scripts": [...]}`). It is
+        followed by a record for each node, and records of the node's incoming edges:
+
+         * `{"node": name, "type": node type, "filename": path or null, "size": file size or null, "hooks": [...]}`,
+           where `hooks` lists the hooks that added the module as a hidden import;
+         * `{"edge": [importer, name], "flags": {"conditional": ..., "function": ..., "tryexcept": ...,
+           "fromlist": ...} or null, "origin": origin}`, where `origin` has the same meaning as in
+           `get_collection_origins`.
+        """
+        hook_edges = self._get_hook_edges()
+        hiddenimports = set(hiddenimports)
+
+        def _dump(record):
+            fp.write(json.dumps(record, separators=(',', ':')))
+            fp.write('\n')
+
+        nodes = list(self.iter_graph())
+        _dump({
+            "format": "pyinstaller-graph",
+            "version": 1,
+            "scripts": [str(node.graphident) for node in nodes if type(node).__name__ == 'Script'],
+        })
+
+        for node in nodes:
+            name = str(node.graphident)
+            edges = []
+            for importer, edge_data in self._iter_importer_edges(node):
+                importer_name = str(importer.graphident)
+                edges.append({
+                    "edge": [importer_name, name],
+                    "flags": edge_data._asdict() if isinstance(edge_data, tuple) else None,
+                    "origin": self._get_edge_origin(importer, importer_name, name, hook_edges, hiddenimports),
+                })
+
+            filename = getattr(node, 'filename', None)
+            if not isinstance(filename, str) or filename == '-':
+                filename = None
+            try:
+                size = os.path.getsize(filename) if filename else None
+            except OSError:
+                size = None
+            hooks = sorted({edge["origin"] for edge in edges} - {None, 'hiddenimports', 'script'})
+
+            _dump({"node": name, "type": type(node).__name__, "filename": filename, "size": size, "hooks": hooks})
+            for edge in edges:
+                _dump(edge)
 
     # TODO: create a class from this function.
     def analyze_runtime_hooks(self, custom_runhooks):
@@ -796,6 +918,24 @@ def get_code_using(self, module: str) -> dict:
                 co_dict[r.identifier] = r.code
         return co_dict
 
+    def find_function_calls(self, module: str, function_names) -> dict:
+        """
+        Find calls of the given functions (with constant arguments) in modules that import a given **module**.
+
+        The function names are matched against the names as they appear in the code (see
+        :func:`PyInstaller.depend.bytecode.any_alias`). Returns a dictionary that maps names of modules to lists of
+        (function_name, args) tuples. The bytecode scan results are cached, so querying the same modules for different
+        functions does not re-scan their code.
+        """
+        function_names = set(function_names)
+        calls_dict = {}
+        for name, code in self.get_code_using(module).items():
+            calls = [(function_name, args) for facts in bytecode.recursive_code_facts(code).values()
+                     for function_name, args in facts.function_calls if function_name in function_names]
+            if calls:
+                calls_dict[name] = calls
+        return calls_dict
+
     def metadata_required(self) -> set:
         """
         Collect metadata for all packages that appear to need it.
@@ -854,22 +994,22 @@ def _metadata_from(self, package, methods=(), recursive_methods=()) -> set:
 
         out = set()
 
-        for name, code in self.get_code_using(package).items():
-            for calls in bytecode.recursive_function_calls(code).values():
-                for function_name, args in calls:
-                    # Only consider function calls taking one argument.
-                    if len(args) != 1:
-                        continue
-                    package = args[0]
-                    try:
-                        if function_name in need_metadata:
-                            out.update(copy_metadata(package))
-                        elif function_name in need_recursive_metadata:
-                            out.update(copy_metadata(package, recursive=True))
-
-                    except importlib_metadata.PackageNotFoundError:
-                        # Currently, we opt to silently skip over missing metadata.
-                        continue
+        function_calls = self.find_function_calls(package, need_metadata | need_recursive_metadata)
+        for calls in function_calls.values():
+            for function_name, args in calls:
+                # Only consider function calls taking one argument.
+                if len(args) != 1:
+                    continue
+                package = args[0]
+                try:
+                    if function_name in need_metadata:
+                        out.update(copy_metadata(package))
+                    elif function_name in need_recursive_metadata:
+                        out.update(copy_metadata(package, recursive=True))
+
+                except importlib_metadata.PackageNotFoundError:
+                    # Currently, we opt to silently skip over missing metadata.
+                    continue
 
         return out
 
@@ -953,16 +1093,28 @@ def initialize_modgraph(excludes=(), user_hook_dirs=()):
         graph._reset(user_hook_dirs)
         return graph
 
-    logger.info('Initializing module dependency graph...')
-
-    # Construct the initial module graph by analyzing all import statements.
-    graph = PyiModuleGraph(
-        HOMEPATH,
-        excludes=excludes,
-        # get_implies() are hidden imports known by modulgraph.
-        implies=get_implies(),
-        user_hook_dirs=user_hook_dirs,
-    )
+    # Otherwise, try to load the graph from the on-disk snapshot, which is created after the base modules are analyzed
+    # for the first time with the given interpreter, hook directories, and search path.
+    fingerprint = _get_base_snapshot_fingerprint(excludes, user_hook_dirs)
+    if fingerprint is not None:
+        from PyInstaller.config import CONF
+        _base_snapshots_used.append((CONF['cachedir'], fingerprint))
+    graph = _load_base_snapshot(fingerprint)
+    if graph is not None:
+        graph._reset(user_hook_dirs)
+    else:
+        logger.info('Initializing module dependency graph...')
+
+        # Construct the initial module graph by analyzing all import statements.
+        graph = PyiModuleGraph(
+            HOMEPATH,
+            excludes=excludes,
+            # get_implies() are hidden imports known by modulgraph.
+            implies=get_implies(),
+            user_hook_dirs=user_hook_dirs,
+        )
+        graph._base_snapshot_fingerprint = fingerprint
+        _save_base_snapshot(graph)
 
     if not _cached_module_graph_:
         # Only cache the first graph, see above for explanation.
@@ -978,6 +1130,255 @@ def initialize_modgraph(excludes=(), user_hook_dirs=()):
     return graph
 
 
+# Snapshots of the module graph with analyzed base modules, stored in the `snapshots` cache of PyInstaller's cache
+# directory (see `PyInstaller.building.cache.SnapshotCache`).
+BASE_MODULEGRAPH_SNAPSHOT_NAME = 'base-modulegraph'
+
+# Snapshots that are kept in memory by the build server (see `PyInstaller.building.server`), keyed by fingerprint, and
+# the (cache directory, fingerprint) pairs of the snapshots used by the builds in this process.
+_base_snapshot_memo = {}
+_base_snapshots_used = []
+
+
+def _fingerprint_tree(fingerprint, path):
+    # Add the names, sizes, and modification times of all files in the given directory (or of the given file).
+    if os.path.isfile(path):
+        file_stat = os.stat(path)
+        fingerprint.update(f"{path}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n".encode('utf-8'))
+        return
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            try:
+                file_stat = os.stat(os.path.join(root, filename))
+            except OSError:
+                continue
+            relpath = os.path.relpath(os.path.join(root, filename), path)
+            fingerprint.update(f"{relpath}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n".encode('utf-8'))
+
+
+def _get_base_snapshot_fingerprint(excludes, user_hook_dirs):
+    """
+    Compute the fingerprint of the inputs to the base modules analysis: the python interpreter, the module search path,
+    the excludes, the hook directories, and the analysis code itself. The contents of the search path directories are
+    not fingerprinted; instead, the resolution of modules is re-validated when the snapshot is loaded (see
+    `_validate_base_snapshot()`). Returns None if snapshots are not available (no cache directory configured).
+    """
+    from PyInstaller.config import CONF
+
+    if not CONF.get('cachedir'):
+        return None
+
+    fingerprint = hashlib.sha1()
+    fingerprint.update(
+        repr((__version__, sys.version, sys.executable, sys.path, excludes, user_hook_dirs)).encode('utf-8')
+    )
+    try:
+        fingerprint.update(_get_file_digest(sys.executable).encode('utf-8'))
+    except OSError:
+        return None
+
+    # Hook directories, and PyInstaller's own analysis code (which might change without a change of version number,
+    # e.g., in a development checkout).
+    hook_dirs = [path for path, priority in user_hook_dirs]
+    hook_dirs.append(os.path.join(PACKAGEPATH, 'hooks'))
+    code_paths = [
+        os.path.join(PACKAGEPATH, 'depend'),
+        os.path.join(PACKAGEPATH, 'lib', 'modulegraph'),
+        os.path.join(PACKAGEPATH, 'compat.py'),
+    ]
+    for path in hook_dirs + code_paths:
+        fingerprint.update(f"{path}\n".encode('utf-8'))
+        _fingerprint_tree(fingerprint, path)
+
+    return fingerprint.hexdigest()
+
+
+class _SnapshotPickler(pickle.Pickler):
+    # Code objects cannot be pickled by default; serialize them with marshal, as they are in .pyc files.
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[types.CodeType] = lambda code: (marshal.loads, (marshal.dumps(code),))
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    # Only allow the globals that are referenced by a pickled module graph: the graph and node classes, and
+    # `marshal.loads` for code objects (see `_SnapshotPickler`), so that a damaged or foreign file in the snapshot
+    # cache cannot instantiate unrelated objects while it is being loaded. This is not a security boundary: the code
+    # objects in the snapshot (as well as the cached base_library.zip) are collected into the frozen application as
+    # they are, so the cache directory must be writable only by trusted users (see "Managing the Cache" in the docs).
+    ALLOWED_GLOBALS = {
+        ('PyInstaller.depend.analysis', 'PyiModuleGraph'),
+        ('PyInstaller.depend.imphook', 'AdditionalFilesCache'),
+        ('PyInstaller.lib.modulegraph.modulegraph', 'Alias'),
+        ('PyInstaller.lib.modulegraph.modulegraph', 'DependencyInfo'),
+        ('altgraph.Graph', 'Graph'),
+        ('marshal', 'loads'),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) in self.ALLOWED_GLOBALS:
+            return super().find_class(module, name)
+        if module == modulegraph.__name__:
+            obj = getattr(modulegraph, name, None)
+            if isinstance(obj, type) and issubclass(obj, modulegraph.Node):
+                return obj
+        raise pickle.UnpicklingError(f"Global {module}.{name} is not allowed in module graph snapshot!")
+
+
+def _load_base_snapshot(fingerprint):
+    """
+    Load the snapshot of the module graph with analyzed base modules, stored under the given fingerprint. Returns None
+    if there is no such snapshot, or if it cannot be loaded.
+    """
+    from PyInstaller.config import CONF
+
+    if fingerprint is None:
+        return None
+
+    # A snapshot kept in memory can be used (and modified) only once; in the build server, each build runs in a forked
+    # process with its own copy of the memo.
+    graph = _base_snapshot_memo.pop(fingerprint, None)
+    if graph is not None:
+        logger.info('Using in-memory module dependency graph snapshot...')
+    else:
+        graph = _read_base_snapshot(CONF['cachedir'], fingerprint)
+        if graph is None:
+            return None
+    if not _validate_base_snapshot(graph):
+        return None
+
+    return graph
+
+
+def _read_base_snapshot(cachedir, fingerprint):
+    """
+    Read the snapshot stored under the given fingerprint from the `snapshots` cache in the given cache directory.
+    """
+    from PyInstaller.building import cache
+
+    snapshot_cache = cache.SnapshotCache(cachedir)
+    snapshot_file = snapshot_cache.lookup(snapshot_cache.make_key(fingerprint, BASE_MODULEGRAPH_SNAPSHOT_NAME))
+    if snapshot_file is None:
+        return None
+
+    logger.info('Loading module dependency graph snapshot...')
+    try:
+        with open(snapshot_file, 'rb') as fp:
+            graph = _SnapshotUnpickler(fp).load()
+    except Exception:
+        logger.warning('Failed to load module dependency graph snapshot %r!', snapshot_file, exc_info=True)
+        return None
+    if not isinstance(graph, PyiModuleGraph) or graph._base_snapshot_fingerprint != fingerprint:
+        logger.warning('Ignoring invalid module dependency graph snapshot %r!', snapshot_file)
+        return None
+
+    return graph
+
+
+def preload_base_snapshot(cachedir, fingerprint, max_snapshots=4):
+    """
+    Keep the snapshot stored under the given fingerprint in memory, so that `initialize_modgraph()` in processes forked
+    from this one does not need to load it from disk. Only the `max_snapshots` most recently preloaded snapshots are
+    kept.
+    """
+    if fingerprint in _base_snapshot_memo:
+        _base_snapshot_memo[fingerprint] = _base_snapshot_memo.pop(fingerprint)  # Move to the end.
+        return
+    graph = _read_base_snapshot(cachedir, fingerprint)
+    if graph is None:
+        return
+    _base_snapshot_memo[fingerprint] = graph
+    while len(_base_snapshot_memo) > max_snapshots:
+        del _base_snapshot_memo[next(iter(_base_snapshot_memo))]
+
+
+def _get_snapshot_files(graph):
+    """
+    Collect the (size, modification time) of the files of all modules in the given graph, and of the directories of all
+    packages in it. Adding a module to a package modifies the package directory, so the latter also captures modules
+    that were missing when the graph was created.
+    """
+    snapshot_files = {}
+    for node in graph.iter_graph():
+        paths = list(getattr(node, 'packagepath', None) or [])
+        if isinstance(node.filename, str):
+            paths.append(node.filename)
+        for path in paths:
+            if path in snapshot_files:
+                continue
+            try:
+                path_stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot_files[path] = (path_stat.st_size, path_stat.st_mtime_ns)
+    return snapshot_files
+
+
+def _validate_base_snapshot(graph):
+    """
+    Check that the files and package directories of the modules in the snapshot graph were not modified after the
+    snapshot was created, and that the top-level modules still resolve to the same files (and that missing modules
+    are still missing); a module might have been shadowed by, or a missing module provided by, a file that was added
+    to one of the search path directories after the snapshot was created.
+    """
+    for path, (size, mtime_ns) in (graph._base_snapshot_files or {}).items():
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            path_stat = None
+        if path_stat is None or (path_stat.st_size, path_stat.st_mtime_ns) != (size, mtime_ns):
+            logger.info('File %r was modified after the module dependency graph snapshot was created.', path)
+            return False
+
+    for node in graph.iter_graph():
+        name = node.identifier
+        if not isinstance(name, str) or '.' in name or not name.isidentifier():
+            continue
+        if type(node).__name__ in ('BuiltinModule', 'AliasNode', 'ExcludedModule'):
+            continue
+        spec = importlib.machinery.PathFinder.find_spec(name, graph.path)
+        origin = spec.origin if spec is not None else None
+        if type(node).__name__ == 'MissingModule':
+            if origin is None:
+                continue
+        elif origin is not None and os.path.normcase(os.path.abspath(origin)) == \
+                os.path.normcase(os.path.abspath(node.filename)):
+            continue
+        logger.info('Module %r resolves differently than in the module dependency graph snapshot.', name)
+        return False
+    return True
+
+
+def _save_base_snapshot(graph):
+    """
+    Store the snapshot of the given module graph with analyzed base modules.
+    """
+    from PyInstaller.config import CONF
+    from PyInstaller.building import cache
+
+    if graph._base_snapshot_fingerprint is None:
+        return
+    graph._base_snapshot_files = _get_snapshot_files(graph)
+
+    # Hook caches are re-created by `PyiModuleGraph._reset()` when the snapshot is loaded, so do not store them. The
+    # graph object itself is (also) the root node of the graph, so it cannot be replaced by a copy for pickling.
+    hook_caches = (graph._hooks, graph._hooks_pre_safe_import_module, graph._hooks_pre_find_module_path)
+    graph._hooks = graph._hooks_pre_safe_import_module = graph._hooks_pre_find_module_path = None
+    try:
+        fp = io.BytesIO()
+        _SnapshotPickler(fp, protocol=pickle.HIGHEST_PROTOCOL).dump(graph)
+    except Exception:
+        logger.warning('Failed to create module dependency graph snapshot!', exc_info=True)
+        return
+    finally:
+        graph._hooks, graph._hooks_pre_safe_import_module, graph._hooks_pre_find_module_path = hook_caches
+
+    snapshot_cache = cache.SnapshotCache(CONF['cachedir'])
+    snapshot_cache.store(
+        snapshot_cache.make_key(graph._base_snapshot_fingerprint, BASE_MODULEGRAPH_SNAPSHOT_NAME), fp.getvalue()
+    )
+
+
 def get_bootstrap_modules():
     """
     Get TOC with the bootstrapping modules and their dependencies.
@@ -16,6 +16,7 @@
 import os
 import pathlib
 import re
+import struct
 import sys
 import sysconfig
 import subprocess
@@ -697,46 +698,53 @@ def _resolve_library_path_unix(name):
 
     # Look in the known safe paths.
     if lib is None:
-        # Architecture independent locations.
-        paths = ['/lib', '/usr/lib']
-        # Architecture dependent locations.
+        lib = lib_search_func(name, _get_default_library_search_paths())
+
+    return lib
+
+
+def _get_default_library_search_paths():
+    """
+    Return the list of known safe library paths (default search paths of the dynamic loader) on UNIX systems.
+    """
+    # Architecture independent locations.
+    paths = ['/lib', '/usr/lib']
+    # Architecture dependent locations.
+    if compat.architecture == '32bit':
+        paths.extend(['/lib32', '/usr/lib32'])
+    else:
+        paths.extend(['/lib64', '/usr/lib64'])
+    # Machine dependent locations.
+    if compat.machine == 'intel':
         if compat.architecture == '32bit':
-            paths.extend(['/lib32', '/usr/lib32'])
-        else:
-            paths.extend(['/lib64', '/usr/lib64'])
-        # Machine dependent locations.
-        if compat.machine == 'intel':
-            if compat.architecture == '32bit':
-                paths.extend(['/usr/lib/i386-linux-gnu'])
-            else:
-                paths.extend(['/usr/lib/x86_64-linux-gnu'])
-
-        # On Debian/Ubuntu /usr/bin/python is linked statically with libpython. Newer Debian/Ubuntu with multiarch
-        # support puts the libpythonX.Y.so in paths like /usr/lib/i386-linux-gnu/. Try to query the arch-specific
-        # sub-directory, if available.
-        arch_subdir = sysconfig.get_config_var('multiarchsubdir')
-        if arch_subdir:
-            arch_subdir = os.path.basename(arch_subdir)
-            paths.append(os.path.join('/usr/lib', arch_subdir))
+            paths.extend(['/usr/lib/i386-linux-gnu'])
         else:
-            logger.debug('Multiarch directory not detected.')
-
-        # Termux (a Ubuntu like subsystem for Android) has an additional libraries directory.
-        if os.path.isdir('/data/data/com.termux/files/usr/lib'):
-            paths.append('/data/data/com.termux/files/usr/lib')
+            paths.extend(['/usr/lib/x86_64-linux-gnu'])
+
+    # On Debian/Ubuntu /usr/bin/python is linked statically with libpython. Newer Debian/Ubuntu with multiarch
+    # support puts the libpythonX.Y.so in paths like /usr/lib/i386-linux-gnu/. Try to query the arch-specific
+    # sub-directory, if available.
+    arch_subdir = sysconfig.get_config_var('multiarchsubdir')
+    if arch_subdir:
+        arch_subdir = os.path.basename(arch_subdir)
+        paths.append(os.path.join('/usr/lib', arch_subdir))
+    else:
+        logger.debug('Multiarch directory not detected.')
 
-        if compat.is_aix:
-            paths.append('/opt/freeware/lib')
-        elif compat.is_hpux:
-            if compat.architecture == '32bit':
-                paths.append('/usr/local/lib/hpux32')
-            else:
-                paths.append('/usr/local/lib/hpux64')
-        elif compat.is_freebsd or compat.is_openbsd:
-            paths.append('/usr/local/lib')
-        lib = lib_search_func(name, paths)
+    # Termux (a Ubuntu like subsystem for Android) has an additional libraries directory.
+    if os.path.isdir('/data/data/com.termux/files/usr/lib'):
+        paths.append('/data/data/com.termux/files/usr/lib')
 
-    return lib
+    if compat.is_aix:
+        paths.append('/opt/freeware/lib')
+    elif compat.is_hpux:
+        if compat.architecture == '32bit':
+            paths.append('/usr/local/lib/hpux32')
+        else:
+            paths.append('/usr/local/lib/hpux64')
+    elif compat.is_freebsd or compat.is_openbsd:
+        paths.append('/usr/local/lib')
+    return paths
 
 
 def _which_library(name, dirs):
@@ -766,6 +774,73 @@ def _library_matcher(name):
     return re.compile(name + r"[0-9]*\.").match
 
 
+def _get_elf_soname(filename):
+    """
+    Read the SONAME (the DT_SONAME entry of the dynamic section) of the given ELF shared library, without spawning
+    `objdump`. Returns None if the file is not an ELF file or has no SONAME.
+    """
+    try:
+        with open(filename, 'rb') as fp:
+            ident = fp.read(16)
+            if len(ident) != 16 or ident[:4] != b'\x7fELF':
+                return None
+            is_64bit = ident[4] == 2
+            endian = '<' if ident[5] == 1 else '>'
+            addr = 'Q' if is_64bit else 'I'
+
+            # ELF header: locate the program header table.
+            header_format = f'{endian}HHI{addr}{addr}{addr}IHHHHHH'
+            header = struct.unpack(header_format, fp.read(struct.calcsize(header_format)))
+            phoff, phentsize, phnum = header[4], header[8], header[9]
+
+            # Program headers: collect the loadable segments (for mapping virtual addresses to file offsets) and the
+            # dynamic segment.
+            if is_64bit:
+                phdr_format = f'{endian}IIQQQQQQ'  # p_type, p_flags, p_offset, p_vaddr, p_paddr, p_filesz, ...
+            else:
+                phdr_format = f'{endian}IIIIIIII'  # p_type, p_offset, p_vaddr, p_paddr, p_filesz, ...
+            load_segments = []
+            dynamic = None
+            for i in range(phnum):
+                fp.seek(phoff + i * phentsize)
+                phdr = struct.unpack(phdr_format, fp.read(struct.calcsize(phdr_format)))
+                if is_64bit:
+                    p_type, _, p_offset, p_vaddr, _, p_filesz, *_ = phdr
+                else:
+                    p_type, p_offset, p_vaddr, _, p_filesz, *_ = phdr
+                if p_type == 1:  # PT_LOAD
+                    load_segments.append((p_vaddr, p_offset, p_filesz))
+                elif p_type == 2:  # PT_DYNAMIC
+                    dynamic = (p_offset, p_filesz)
+            if dynamic is None:
+                return None
+
+            # Dynamic section: find the string table address and the offset of SONAME in it.
+            entry_format = f'{endian}{addr.lower()}{addr}'
+            entry_size = struct.calcsize(entry_format)
+            fp.seek(dynamic[0])
+            data = fp.read(dynamic[1])
+            strtab = soname = None
+            for offset in range(0, len(data) - entry_size + 1, entry_size):
+                d_tag, d_val = struct.unpack_from(entry_format, data, offset)
+                if d_tag == 0:  # DT_NULL
+                    break
+                elif d_tag == 5:  # DT_STRTAB
+                    strtab = d_val
+                elif d_tag == 14:  # DT_SONAME
+                    soname = d_val
+            if strtab is None or soname is None:
+                return None
+
+            for p_vaddr, p_offset, p_filesz in load_segments:
+                if p_vaddr <= strtab < p_vaddr + p_filesz:
+                    fp.seek(p_offset + strtab - p_vaddr + soname)
+                    return fp.read(256).split(b'\0', 1)[0].decode('utf-8', errors='replace') or None
+    except (OSError, struct.error):
+        pass
+    return None
+
+
 #- Python shared library search
 
 
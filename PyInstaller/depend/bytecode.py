@@ -18,6 +18,7 @@
 
 import dis
 import re
+import weakref
 from types import CodeType
 from typing import Pattern
 
@@ -66,7 +67,11 @@ def finditer(pattern: Pattern, string: bytes):
     This should be used to avoid false positive matches where a bytecode pair's argument is mistaken for an opcode.
     """
     assert isinstance(string, bytes)
-    string = _cleanup_bytecode_string(string)
+    return _finditer(pattern, _cleanup_bytecode_string(string))
+
+
+def _finditer(pattern: Pattern, string: bytes):
+    # Implementation of `finditer`, operating on already cleaned-up bytecode string.
     matches = pattern.finditer(string)
     while True:
         for match in matches:
@@ -197,6 +202,27 @@ def _cleanup_bytecode_string(bytecode):
 )"""
 )
 
+# language=PythonVerboseRegExp
+_attribute_load_bytecode = bytecode_regex(
+    rb"""
+    # Matches 'foo.bar' or 'foo.bar.whizz'.
+
+    # Load the 'foo'.
+    (
+      (?:(?:""" + _OPCODES_EXTENDED_ARG + rb""").)*
+      (?:""" + _OPCODES_FUNCTION_GLOBAL + rb""").
+    )
+
+    # Load the 'bar.whizz' (one opcode per name component, each possibly preceded by name reference extension).
+    (
+      (?:
+        (?:(?:""" + _OPCODES_EXTENDED_ARG + rb""").)*
+        (?:""" + _OPCODES_FUNCTION_LOAD + rb""").
+      )+
+    )
+"""
+)
+
 
 def extended_arguments(extended_args: bytes):
     """
@@ -249,14 +275,91 @@ def loads(raw: bytes, code: CodeType) -> list:
     return [load(i, code) for i in _extended_arg_bytecode.findall(raw)]
 
 
+class CodeFacts:
+    """
+    Facts about a single code object (excluding its child code objects), as found by scanning its bytecode.
+
+    The bytecode is cleaned up only once, and each kind of facts is extracted on first access and cached, so that
+    various consumers (ctypes, metadata, and hook scanners) do not need to re-scan the same code object. Use
+    `get_code_facts` to obtain (cached) instances.
+    """
+    __slots__ = ('_code', '_bytecode', '_function_calls', '_attribute_loads')
+
+    def __init__(self, code: CodeType):
+        self._code = code
+        self._bytecode = None
+        self._function_calls = None
+        self._attribute_loads = None
+
+    @property
+    def bytecode(self) -> bytes:
+        """
+        The cleaned-up bytecode string.
+        """
+        if self._bytecode is None:
+            self._bytecode = _cleanup_bytecode_string(self._code.co_code)
+        return self._bytecode
+
+    @property
+    def function_calls(self) -> list:
+        """
+        Function calls on constant arguments, as list of (function_name, args) tuples.
+        """
+        if self._function_calls is None:
+            self._function_calls = _scan_function_calls(self._code, self.bytecode)
+        return self._function_calls
+
+    @property
+    def attribute_loads(self) -> list:
+        """
+        References to (nested) attributes of global or local names (e.g., ``foo.bar.whizz``), as list of
+        (name, attributes) tuples.
+        """
+        if self._attribute_loads is None:
+            self._attribute_loads = [(load(name, self._code), loads(attrs, self._code))
+                                     for name, attrs in _findall(_attribute_load_bytecode, self.bytecode)]
+        return self._attribute_loads
+
+
+def _findall(pattern: Pattern, string: bytes):
+    return [match.groups() for match in _finditer(pattern, string)]
+
+
+# Cache of `CodeFacts`, which lives as long as the corresponding code objects do.
+_code_facts_cache = weakref.WeakKeyDictionary()
+
+
+def get_code_facts(code: CodeType) -> CodeFacts:
+    """
+    Return the (cached) `CodeFacts` for the given code object.
+    """
+    try:
+        return _code_facts_cache[code]
+    except KeyError:
+        facts = _code_facts_cache[code] = CodeFacts(code)
+        return facts
+
+
+def recursive_code_facts(code: CodeType) -> dict:
+    """
+    Return the (cached) `CodeFacts` for the given code object and all its child code objects (function definitions
+    and bodies of comprehension loops), as a dictionary that maps code objects to their facts.
+    """
+    return search_recursively(get_code_facts, code)
+
+
 def function_calls(code: CodeType) -> list:
     """
     Scan a code object for all function calls on constant arguments.
     """
+    return get_code_facts(code).function_calls
+
+
+def _scan_function_calls(code: CodeType, bytecode: bytes) -> list:
     match: re.Match
     out = []
 
-    for match in finditer(_call_function_bytecode, code.co_code):
+    for match in _finditer(_call_function_bytecode, bytecode):
         function_root, methods, args, function_call = match.groups()
 
         # For foo():
@@ -13,19 +13,167 @@
 """
 
 import glob
+import json
 import os.path
+import stat
 import sys
+import time
+import types
 import weakref
 import re
 
 from PyInstaller import log as logging
+from PyInstaller.building import cache
 from PyInstaller.building.utils import format_binaries_and_datas
-from PyInstaller.compat import importlib_load_source
 from PyInstaller.depend.imphookapi import PostGraphAPI
 from PyInstaller.exceptions import ImportErrorWhenRunningHook
 
 logger = logging.getLogger(__name__)
 
+# Index of the hook scripts in the hook directories, mapping the directory paths to `[mtime_ns, module_names,
+# last_used]` lists. The index is persisted in the `hook-index.json` file in the cache directory, and an entry is valid
+# as long as the modification time of its directory is unchanged (adding, removing, or renaming a hook script modifies
+# it). `last_used` is the time (in seconds since the epoch) at which the entry was last used by a build.
+_hook_index = {}
+_hook_index_file = None
+_hook_index_modified = False
+# Directories whose entries were used in this process.
+_hook_index_used = set()
+
+# Directories modified less than this many nanoseconds ago are not indexed, as another modification within the
+# resolution of the file system timestamps would go unnoticed.
+_HOOK_INDEX_MIN_AGE = 2 * 10**9
+
+# The `last_used` time of an entry is refreshed (and the index written) at most once per this many seconds.
+_HOOK_INDEX_TOUCH_INTERVAL = 24 * 60 * 60
+
+# Entries that were not used for this many seconds are removed from the index when it is written; for example, those of
+# the hook directories of packages from deleted virtual environments.
+_HOOK_INDEX_MAX_UNUSED_AGE = 30 * 24 * 60 * 60
+
+# Code objects of the hook scripts loaded in this process, keyed by the path, size, and modification time of the
+# scripts. They are deliberately not persisted in the cache directory, because anyone able to write there could then
+# inject code into subsequent builds.
+_hook_code_objects = {}
+
+
+def _get_cache_dir():
+    from PyInstaller.config import CONF
+    return CONF.get('cachedir')
+
+
+def _load_hook_index():
+    """
+    Merge the persisted hook index from the cache directory into the in-memory index, unless it has been loaded already.
+    """
+    global _hook_index_file
+
+    cache_dir = _get_cache_dir()
+    index_file = os.path.join(cache_dir, cache.HOOK_INDEX_FILENAME) if cache_dir else None
+    if index_file == _hook_index_file:
+        return
+    _hook_index_file = index_file
+    if index_file is None:
+        return
+    try:
+        with open(index_file, 'r', encoding='utf-8') as fp:
+            data = json.load(fp)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError):
+        logger.debug("Failed to read hook index %r!", index_file, exc_info=True)
+        return
+    if isinstance(data, dict):
+        for hook_dir, entry in data.items():
+            # Skip malformed entries (e.g., from an older version of the index).
+            if isinstance(entry, list) and len(entry) == 3:
+                _hook_index.setdefault(hook_dir, entry)
+
+
+def _save_hook_index():
+    """
+    Persist the in-memory hook index in the cache directory, if it was modified. Entries of the directories that were
+    not used in this process are dropped if their directory no longer exists, or if they were not used for
+    `_HOOK_INDEX_MAX_UNUSED_AGE` seconds.
+    """
+    global _hook_index_modified
+
+    if not _hook_index_modified or _hook_index_file is None:
+        return
+    _hook_index_modified = False
+
+    now = time.time()
+    for hook_dir, (_, _, last_used) in list(_hook_index.items()):
+        if hook_dir in _hook_index_used:
+            continue
+        if now - last_used > _HOOK_INDEX_MAX_UNUSED_AGE or not os.path.isdir(hook_dir):
+            del _hook_index[hook_dir]
+
+    try:
+        cache._write_json_atomic(_hook_index_file, _hook_index)
+    except OSError:
+        logger.debug("Failed to write hook index %r!", _hook_index_file, exc_info=True)
+
+
+def _list_hook_scripts(hook_dir):
+    """
+    Return the sorted names of the modules hooked by the hook scripts (`hook-{module_name}.py`) in the given directory.
+    The directory is scanned only if it is not in the hook index, or has been modified since it was indexed.
+    """
+    global _hook_index_modified
+
+    try:
+        dir_stat = os.stat(hook_dir)
+    except OSError:
+        dir_stat = None
+    if dir_stat is None or not stat.S_ISDIR(dir_stat.st_mode):
+        raise FileNotFoundError('Hook directory "{}" not found.'.format(hook_dir))
+
+    now = time.time()
+    entry = _hook_index.get(hook_dir)
+    if entry is not None and entry[0] == dir_stat.st_mtime_ns:
+        _hook_index_used.add(hook_dir)
+        if now - entry[2] > _HOOK_INDEX_TOUCH_INTERVAL:
+            entry[2] = int(now)
+            _hook_index_modified = True
+        return entry[1]
+
+    module_names = sorted(
+        os.path.basename(hook_filename)[5:-3] for hook_filename in glob.glob(os.path.join(hook_dir, 'hook-*.py'))
+    )
+    if time.time_ns() - dir_stat.st_mtime_ns > _HOOK_INDEX_MIN_AGE:
+        _hook_index[hook_dir] = [dir_stat.st_mtime_ns, module_names, int(now)]
+        _hook_index_used.add(hook_dir)
+        _hook_index_modified = True
+    return module_names
+
+
+def _get_hook_code(hook_filename):
+    """
+    Return the code object of the given hook script. The code objects are memoized within the process, keyed by the
+    path, size, and modification time of the hook script, so each hook script is compiled at most once per build (or
+    per build server process), and again only after it has been modified.
+    """
+    file_stat = os.stat(hook_filename)
+    key = (hook_filename, file_stat.st_size, file_stat.st_mtime_ns)
+    code = _hook_code_objects.get(key)
+    if code is None:
+        with open(hook_filename, 'rb') as fp:
+            source = fp.read()
+        code = _hook_code_objects[key] = compile(source, hook_filename, 'exec', dont_inherit=True)
+    return code
+
+
+def _load_hook_script(hook_module_name, hook_filename):
+    """
+    Load the given hook script into a new in-memory module with the given name. Equivalent to
+    `compat.importlib_load_source`, except that the compiled code of the hook script is memoized (see `_get_hook_code`).
+    """
+    hook_module = types.ModuleType(hook_module_name)
+    hook_module.__file__ = hook_filename  # Some hooks require __file__ attribute in their namespace
+    exec(_get_hook_code(hook_filename), hook_module.__dict__)
+    return hook_module
+
 
 class ModuleHookCache(dict):
     """
@@ -99,24 +247,18 @@ def _cache_hook_dirs(self, hook_dirs):
             List of the absolute or relative paths of all directories containing hook scripts to be cached.
         """
 
+        _load_hook_index()
         for hook_dir, default_priority in hook_dirs:
-            # Canonicalize this directory's path and validate its existence.
+            # Canonicalize this directory's path. Its existence is validated by `_list_hook_scripts()`.
             hook_dir = os.path.abspath(hook_dir)
-            if not os.path.isdir(hook_dir):
-                raise FileNotFoundError('Hook directory "{}" not found.'.format(hook_dir))
 
             # For each hook script in this directory...
-            hook_filenames = glob.glob(os.path.join(hook_dir, 'hook-*.py'))
-            for hook_filename in hook_filenames:
-                # Fully-qualified name of this hook's corresponding module, constructed by removing the "hook-" prefix
-                # and ".py" suffix.
-                module_name = os.path.basename(hook_filename)[5:-3]
-
+            for module_name in _list_hook_scripts(hook_dir):
                 # Lazily loadable hook object.
                 module_hook = ModuleHook(
                     module_graph=self.module_graph,
                     module_name=module_name,
-                    hook_filename=hook_filename,
+                    hook_filename=os.path.join(hook_dir, 'hook-' + module_name + '.py'),
                     hook_module_name_prefix=self._hook_module_name_prefix,
                     default_priority=default_priority,
                 )
@@ -124,6 +266,7 @@ def _cache_hook_dirs(self, hook_dirs):
                 # Add this hook to this module's list of hooks.
                 module_hooks = self.setdefault(module_name, [])
                 module_hooks.append(module_hook)
+        _save_hook_index()
 
         # Post-processing: we allow only one instance of hook per module. Currently, the priority order is defined
         # implicitly, via order of hook directories, so the first hook in the list has the highest priority.
@@ -419,7 +562,7 @@ def _load_hook_module(self, keep_module_ref=False):
         hook_path, hook_basename = os.path.split(self.hook_filename)
         logger.info('Processing standard module hook %r from %r', hook_basename, hook_path)
         try:
-            self._hook_module = importlib_load_source(self.hook_module_name, self.hook_filename)
+            self._hook_module = _load_hook_script(self.hook_module_name, self.hook_filename)
         except ImportError:
             logger.debug("Hook failed with:", exc_info=True)
             raise ImportErrorWhenRunningHook(self.hook_module_name, self.hook_filename)
@@ -19,6 +19,7 @@
 import re
 import shutil
 import struct
+import sys
 import zipfile
 from types import CodeType
 
@@ -33,6 +34,9 @@
 
 logger = logging.getLogger(__name__)
 
+# Name of the base_library.zip snapshot in the `snapshots` cache (see `PyInstaller.building.cache.SnapshotCache`).
+BASE_LIBRARY_SNAPSHOT_NAME = 'base-library'
+
 
 # TODO find out if modules from base_library.zip could be somehow bundled into the .exe file.
 def create_py3_base_library(libzip_filename, graph):
@@ -43,6 +47,27 @@ def create_py3_base_library(libzip_filename, graph):
     # Import strip_paths_in_code locally to avoid cyclic import between building.utils and depend.utils (this module);
     # building.utils imports depend.bindepend, which in turn imports depend.utils.
     from PyInstaller.building.utils import strip_paths_in_code
+    from PyInstaller.building import cache
+    from PyInstaller.config import CONF
+
+    # The contents of base_library.zip are determined by the module graph with analyzed base modules; if the graph has
+    # a snapshot fingerprint, try to reuse the .zip file created from the same graph by a previous build. As paths are
+    # stripped from the code objects, the search paths must also match; and so must the module files, which might have
+    # been modified since the graph snapshot was created (in which case the graph was analyzed anew).
+    snapshot_cache = snapshot_key = None
+    if graph._base_snapshot_fingerprint is not None:
+        snapshot_cache = cache.SnapshotCache(CONF['cachedir'])
+        snapshot_key = snapshot_cache.make_key(
+            graph._base_snapshot_fingerprint + repr(sys.path + CONF['pathex']) +
+            repr(sorted((graph._base_snapshot_files or {}).items())), BASE_LIBRARY_SNAPSHOT_NAME
+        )
+        snapshot_file = snapshot_cache.lookup(snapshot_key)
+        if snapshot_file is not None:
+            logger.debug('Reusing base_library.zip from snapshot %r', snapshot_file)
+            if os.path.exists(libzip_filename):
+                os.remove(libzip_filename)
+            shutil.copyfile(snapshot_file, libzip_filename)
+            return
 
     # Construct regular expression for matching modules that should be bundled into base_library.zip. Excluded are plain
     # 'modules' or 'submodules.ANY_NAME'. The match has to be exact - start and end of string not substring.
@@ -88,6 +113,10 @@ def create_py3_base_library(libzip_filename, graph):
         logger.error('base_library.zip could not be created!')
         raise
 
+    if snapshot_key is not None:
+        with open(libzip_filename, 'rb') as fp:
+            snapshot_cache.store(snapshot_key, fp.read())
+
 
 def scan_code_for_ctypes(co):
     binaries = __recursively_scan_code_objects_for_ctypes(co)
@@ -122,7 +151,7 @@ def __recursively_scan_code_objects_for_ctypes(code: CodeType):
     Detects ctypes dependencies, using reasonable heuristics that should cover most common ctypes usages; returns a
     list containing names of binaries detected as dependencies.
     """
-    from PyInstaller.depend.bytecode import any_alias, search_recursively
+    from PyInstaller.depend.bytecode import any_alias
 
     binaries = []
     ctypes_dll_names = {
@@ -139,8 +168,10 @@ def __recursively_scan_code_objects_for_ctypes(code: CodeType):
         *any_alias("ctypes.util.find_library"),
     }
 
-    for calls in bytecode.recursive_function_calls(code).values():
-        for (name, args) in calls:
+    code_facts = bytecode.recursive_code_facts(code).values()
+
+    for facts in code_facts:
+        for (name, args) in facts.function_calls:
             if not len(args) == 1 or not isinstance(args[0], str):
                 continue
             if name in ctypes_dll_names:
@@ -152,60 +183,27 @@ def __recursively_scan_code_objects_for_ctypes(code: CodeType):
                 # 'libgs.so.9').
                 libname = args[0]
                 if libname:
-                    try:  # this try was inserted due to the ctypes bug https://github.com/python/cpython/issues/93094
-                        libname = ctypes.util.find_library(libname)
-                    except FileNotFoundError:
-                        libname = None
-                        logger.warning(
-                            'ctypes.util.find_library raised a FileNotFoundError. '
-                            'Supressing and assuming no lib with the name "%s" was found.', args[0]
-                        )
+                    from PyInstaller.config import CONF
+                    libname = find_ctypes_library(libname, CONF['pathex'])
                     if libname:
-                        # On Windows, `find_library` may return a full pathname. See issue #1934.
-                        libname = os.path.basename(libname)
-                        binaries.append(libname)
+                        binaries.append(os.path.basename(libname))
 
     # The above handles any flavour of function/class call. We still need to capture the (albeit rarely used) case of
     # loading libraries with ctypes.cdll's getattr.
-    for i in search_recursively(_scan_code_for_ctypes_getattr, code).values():
-        binaries.extend(i)
+    for facts in code_facts:
+        binaries.extend(_scan_code_for_ctypes_getattr(facts))
 
     return binaries
 
 
-_ctypes_getattr_regex = bytecode.bytecode_regex(
-    rb"""
-    # Matches 'foo.bar' or 'foo.bar.whizz'.
-
-    # Load the 'foo'.
-    (
-      (?:(?:""" + bytecode._OPCODES_EXTENDED_ARG + rb""").)*
-      (?:""" + bytecode._OPCODES_FUNCTION_GLOBAL + rb""").
-    )
-
-    # Load the 'bar.whizz' (one opcode per name component, each possibly preceded by name reference extension).
-    (
-      (?:
-        (?:(?:""" + bytecode._OPCODES_EXTENDED_ARG + rb""").)*
-        (?:""" + bytecode._OPCODES_FUNCTION_LOAD + rb""").
-      )+
-    )
-"""
-)
-
-
-def _scan_code_for_ctypes_getattr(code: CodeType):
+def _scan_code_for_ctypes_getattr(facts):
     """
     Detect uses of ``ctypes.cdll.library_name``, which implies that ``library_name.dll`` should be collected.
     """
 
     key_names = ("cdll", "oledll", "pydll", "windll")
 
-    for match in bytecode.finditer(_ctypes_getattr_regex, code.co_code):
-        name, attrs = match.groups()
-        name = bytecode.load(name, code)
-        attrs = bytecode.loads(attrs, code)
-
+    for name, attrs in facts.attribute_loads:
         if attrs and attrs[-1] == "LoadLibrary":
             continue
 
@@ -219,6 +217,112 @@ def _scan_code_for_ctypes_getattr(code: CodeType):
                 yield attrs[1] + ".dll"
 
 
+# Memoized results of `find_ctypes_library`; maps (name, search paths, library path environment variable) to full path.
+_ctypes_library_cache = {}
+
+
+def _get_library_path_envvar():
+    if compat.is_aix:
+        return 'LIBPATH'
+    elif compat.is_darwin:
+        return 'DYLD_LIBRARY_PATH'
+    elif compat.is_win:
+        return 'PATH'
+    return 'LD_LIBRARY_PATH'
+
+
+def find_ctypes_library(name, search_paths=()):
+    """
+    Resolve the library name, as passed to `ctypes.util.find_library` (i.e., without prefix and suffix, e.g. ``gs``),
+    into the full path of the library, or None if the library cannot be found.
+
+    In contrast to `ctypes.util.find_library`, the lookup is performed within the process (without spawning `ldconfig`,
+    `gcc` or `objdump`), and the given `search_paths` are searched first, without having to modify the library search
+    path environment variable. On UNIX, the returned path uses the library's SONAME as basename if the SONAME-named
+    file exists next to the matched file (e.g., ``libgs.so.9`` instead of the ``libgs.so`` development symbolic link).
+
+    The results are memoized.
+    """
+    search_paths = tuple(search_paths)
+    envvar = _get_library_path_envvar()
+    cache_key = (name, search_paths, compat.getenv(envvar, ''))
+    try:
+        return _ctypes_library_cache[cache_key]
+    except KeyError:
+        pass
+
+    env_paths = [path for path in compat.getenv(envvar, '').split(os.pathsep) if path]
+    if compat.is_unix:
+        path = _find_ctypes_library_unix(name, [*search_paths, *env_paths])
+    else:
+        from PyInstaller.depend import bindepend
+
+        if compat.is_win:
+            candidates = [name] if os.path.splitext(name)[1] else [name + '.dll', name]
+        else:
+            candidates = [f'lib{name}.dylib', f'{name}.dylib', f'{name}.framework/{name}', name]
+        path = None
+        for candidate in candidates:
+            path = bindepend._resolve_library_path_in_search_paths(candidate, [*search_paths, *env_paths])
+            if path:
+                break
+        if path is None and compat.is_darwin:
+            # Fall back to the dyld emulation of `ctypes.util.find_library`, which runs within the process on macOS.
+            path = ctypes.util.find_library(name)
+
+    _ctypes_library_cache[cache_key] = path
+    return path
+
+
+def _reset_ctypes_library_cache():
+    """
+    Discard the memoized results of `find_ctypes_library`, so that a new build observes changes to the file system.
+    """
+    _ctypes_library_cache.clear()
+
+
+def _find_ctypes_library_unix(name, search_paths):
+    """
+    UNIX-specific helper for `find_ctypes_library`. Searches the given paths, the ldconfig cache and the default
+    library search paths, in that order, for ``lib<name>.so`` or a versioned variant of it.
+    """
+    from PyInstaller.depend import bindepend
+
+    matcher = re.compile(r'lib' + re.escape(name) + r'\.so(\.[0-9.]+)?$').match
+
+    def _search_dirs(dirs):
+        for directory in dirs:
+            try:
+                filenames = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            # Prefer the unversioned name (i.e., the development symbolic link that the linker would pick up).
+            for filename in filenames:
+                if matcher(filename) and os.path.isfile(os.path.join(directory, filename)):
+                    return os.path.join(directory, filename)
+        return None
+
+    path = _search_dirs(search_paths)
+    if path is None:
+        load_ldconfig_cache()
+        for soname, cached_path in LDCONFIG_CACHE.items():
+            if matcher(soname) and os.path.isfile(cached_path):
+                path = cached_path
+                break
+    if path is None:
+        path = _search_dirs(bindepend._get_default_library_search_paths())
+    if path is None:
+        return None
+
+    # Use the name under which the library will be loaded at run-time.
+    soname = bindepend._get_elf_soname(path)
+    if soname and soname != os.path.basename(path):
+        soname_path = os.path.join(os.path.dirname(path), soname)
+        if os.path.isfile(soname_path):
+            path = soname_path
+    return path
+
+
 # TODO: reuse this code with modulegraph implementation.
 def _resolveCtypesImports(cbinaries):
     """
@@ -227,70 +331,34 @@ def _resolveCtypesImports(cbinaries):
     Input is a list of c-binary-names (as found by `scan_code_instruction_for_ctypes`). Output is a list of tuples
     ready to be appended to the ``binaries`` of a modules.
 
-    This function temporarily extents PATH, LD_LIBRARY_PATH or DYLD_LIBRARY_PATH (depending on the platform) by
-    CONF['pathex'] so shared libs will be search there, too.
+    The libraries are searched for in CONF['pathex'] first, followed by the directories from PATH, LD_LIBRARY_PATH or
+    DYLD_LIBRARY_PATH (depending on the platform) and, on UNIX, the ldconfig cache and the default library paths. The
+    lookup is performed within the process and does not modify the environment.
 
     Example:
     >>> _resolveCtypesImports(['libgs.so'])
     [(libgs.so', ''/usr/lib/libgs.so', 'BINARY')]
     """
-    from ctypes.util import find_library
-
     from PyInstaller.config import CONF
-
-    if compat.is_unix:
-        envvar = "LD_LIBRARY_PATH"
-    elif compat.is_darwin:
-        envvar = "DYLD_LIBRARY_PATH"
-    else:
-        envvar = "PATH"
-
-    def _setPaths():
-        path = os.pathsep.join(CONF['pathex'])
-        old = compat.getenv(envvar)
-        if old is not None:
-            path = os.pathsep.join((path, old))
-        compat.setenv(envvar, path)
-        return old
-
-    def _restorePaths(old):
-        if old is None:
-            compat.unsetenv(envvar)
-        else:
-            compat.setenv(envvar, old)
+    from PyInstaller.depend import bindepend
 
     ret = []
-
-    # Try to locate the shared library on the disk. This is done by calling ctypes.util.find_library with
-    # ImportTracker's local paths temporarily prepended to the library search paths (and restored after the call).
-    old = _setPaths()
     for cbin in cbinaries:
-        try:
-            # There is an issue with find_library() where it can run into errors trying to locate the library. See
-            # #5734.
-            cpath = find_library(os.path.splitext(cbin)[0])
-        except FileNotFoundError:
-            # In these cases, find_library() should return None.
-            cpath = None
         if compat.is_unix:
-            # CAVEAT: find_library() is not the correct function. ctype's documentation says that it is meant to resolve
-            # only the filename (as a *compiler* does) not the full path. Anyway, it works well enough on Windows and
-            # Mac OS. On Linux, we need to implement more code to find out the full path.
+            # First check whether the name is a library name in the sense of `ctypes.util.find_library` (e.g., ``gs``
+            # from ``ctypes.CDLL('gs')``). Otherwise, resolve the given file name as-is; "man ld.so" says that we
+            # should first search LD_LIBRARY_PATH and then the ldcache.
+            cpath = find_ctypes_library(os.path.splitext(cbin)[0], CONF['pathex'])
             if cpath is None:
-                cpath = cbin
-            # "man ld.so" says that we should first search LD_LIBRARY_PATH and then the ldcache.
-            for d in compat.getenv(envvar, '').split(os.pathsep):
-                if os.path.isfile(os.path.join(d, cpath)):
-                    cpath = os.path.join(d, cpath)
-                    break
-            else:
-                if LDCONFIG_CACHE is None:
-                    load_ldconfig_cache()
-                if cpath in LDCONFIG_CACHE:
-                    cpath = LDCONFIG_CACHE[cpath]
+                env_paths = [path for path in compat.getenv('LD_LIBRARY_PATH', '').split(os.pathsep) if path]
+                cpath = bindepend._resolve_library_path_in_search_paths(cbin, [*CONF['pathex'], *env_paths])
+            if cpath is None:
+                load_ldconfig_cache()
+                cpath = LDCONFIG_CACHE.get(cbin)
+                if cpath is not None:
                     assert os.path.isfile(cpath)
-                else:
-                    cpath = None
+        else:
+            cpath = find_ctypes_library(os.path.splitext(cbin)[0], CONF['pathex'])
         if cpath is None:
             # Skip warning message if cbin (basename of library) is ignored. This prevents messages like:
             # 'W: library kernel32.dll required via ctypes not found'
@@ -306,7 +374,6 @@ def _restorePaths(old):
             if not include_library(cpath):
                 continue
             ret.append((cbin, cpath, "BINARY"))
-    _restorePaths(old)
     return ret
 
 
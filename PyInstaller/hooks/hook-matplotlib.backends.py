@@ -50,29 +50,29 @@ def _check_mpl_backend_importable(module_name):
 
 
 # Bytecode scanning
-def _recursive_scan_code_objects_for_mpl_use(co):
+def _scan_for_mpl_use(modulegraph):
     """
-    Recursively scan the bytecode for occurrences of matplotlib.use() or mpl.use() calls with const arguments, and
-    collect those arguments into list of used matplotlib backend names.
+    Scan the bytecode of modules that import matplotlib for occurrences of matplotlib.use() or mpl.use() calls with
+    const arguments, and collect those arguments into dictionary that maps module names to used matplotlib backend
+    names.
     """
 
-    from PyInstaller.depend.bytecode import any_alias, recursive_function_calls
+    from PyInstaller.depend.bytecode import any_alias
 
     mpl_use_names = {
         *any_alias("matplotlib.use"),
         *any_alias("mpl.use"),  # matplotlib is commonly aliased as mpl
     }
 
-    backends = []
-    for calls in recursive_function_calls(co).values():
-        for name, args in calls:
+    backends = {}
+    for name, calls in modulegraph.find_function_calls("matplotlib", mpl_use_names).items():
+        for function_name, args in calls:
             # matplotlib.use(backend) or matplotlib.use(backend, force)
             # We support only literal arguments. Similarly, kwargs are
             # not supported.
             if len(args) not in {1, 2} or not isinstance(args[0], str):
                 continue
-            if name in mpl_use_names:
-                backends.append(args[0])
+            backends.setdefault(name, []).append(args[0])
 
     return backends
 
@@ -95,15 +95,10 @@ def _autodetect_used_backends(hook_api):
     """
     # Scan the code for matplotlib.use()
     modulegraph = hook_api.analysis.graph
-    mpl_code_objs = modulegraph.get_code_using("matplotlib")
     used_backends = []
-    for name, co in mpl_code_objs.items():
-        co_backends = _recursive_scan_code_objects_for_mpl_use(co)
-        if co_backends:
-            logger.info(
-                "Discovered Matplotlib backend(s) via `matplotlib.use()` call in module %r: %r", name, co_backends
-            )
-            used_backends += co_backends
+    for name, co_backends in _scan_for_mpl_use(modulegraph).items():
+        logger.info("Discovered Matplotlib backend(s) via `matplotlib.use()` call in module %r: %r", name, co_backends)
+        used_backends += co_backends
 
     # Deduplicate and sort the list of used backends before displaying it.
     used_backends = sorted(set(used_backends))
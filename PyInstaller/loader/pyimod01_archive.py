@@ -28,8 +28,9 @@
 # Type codes for PYZ PYZ entries
 PYZ_ITEM_MODULE = 0
 PYZ_ITEM_PKG = 1
-PYZ_ITEM_DATA = 2  # deprecated; PYZ does not contain any data entries anymore
+PYZ_ITEM_DATA = 2  # data file of a package listed in `Analysis(packed_data=...)`; stored under its '/'-separated path
 PYZ_ITEM_NSPKG = 3  # PEP-420 namespace package
+PYZ_ITEM_SHARED = 4  # references to modules in the shared PYZ archive of a `MERGE`'d suite (see `link_shared_archives`)
 
 
 class ArchiveReadError(RuntimeError):
@@ -48,6 +49,11 @@ def __init__(self, filename, start_offset=None, check_pymagic=False):
         self._start_offset = start_offset
 
         self.toc = {}
+        self.pymagic = None
+
+        # Entries that were merged into the TOC from linked shared archives (see `link_shared_archives`), mapped to the
+        # reader of the archive that contains them.
+        self._shared_entries = {}
 
         # If no offset is given, try inferring it from filename
         if start_offset is None:
@@ -68,6 +74,7 @@ def __init__(self, filename, start_offset=None, check_pymagic=False):
             pymagic = fp.read(len(PYTHON_MAGIC_NUMBER))
             if check_pymagic and pymagic != PYTHON_MAGIC_NUMBER:
                 raise ArchiveReadError("Python magic pattern mismatch!")
+            self.pymagic = pymagic
 
             # Read TOC offset
             toc_offset, *_ = struct.unpack('!i', fp.read(4))
@@ -96,6 +103,25 @@ def _parse_offset_from_filename(filename):
 
         return filename, offset
 
+    def link_shared_archives(self, base_dir):
+        """
+        Open the shared PYZ archives referenced by this archive, and merge the entries of the referenced modules into
+        the TOC; the entries of this archive take precedence. The references are `PYZ_ITEM_SHARED` entries, named by the
+        path of the shared archive relative to `base_dir`, whose data is the marshaled list of the names of the modules
+        that this archive uses from the shared archive (the shared archive might also contain modules that are used
+        only by other executables). The references are removed from the TOC.
+        """
+        shared_names = [name for name, (typecode, *_) in self.toc.items() if typecode == PYZ_ITEM_SHARED]
+        for shared_name in shared_names:
+            module_names = marshal.loads(self.extract(shared_name))
+            del self.toc[shared_name]
+            shared_archive = type(self)(os.path.join(base_dir, shared_name), 0, check_pymagic=True)
+            for name in module_names:
+                entry = shared_archive.toc.get(name)
+                if entry is not None and name not in self.toc:
+                    self.toc[name] = entry
+                    self._shared_entries[name] = shared_archive
+
     def extract(self, name, raw=False):
         """
         Extract data from entry with the given name.
@@ -103,6 +129,10 @@ def extract(self, name, raw=False):
         If the entry belongs to a module or a package, the data is loaded (unmarshaled) into code object. To retrieve
         raw data, set `raw` flag to True.
         """
+        # Entry from a linked shared archive.
+        if name in self._shared_entries:
+            return self._shared_entries[name].extract(name, raw)
+
         # Look up entry
         entry = self.toc.get(name)
         if entry is None:
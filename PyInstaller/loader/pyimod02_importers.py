@@ -70,6 +70,59 @@ def get_pyz_toc_tree():
         return _pyz_tree
 
 
+# Prefix tree of the data files packed into the PYZ archive (see `Analysis(packed_data=...)`), indexed by the
+# '/'-separated path components. Directories are represented by dictionaries, and files by their PYZ entry names.
+# Computed on first access.
+_pyz_data_tree = None
+
+
+def get_pyz_data_tree():
+    global _pyz_data_tree
+
+    with _pyz_tree_lock:
+        if _pyz_data_tree is None:
+            _pyz_data_tree = _build_pyz_data_tree(pyz_archive)
+        return _pyz_data_tree
+
+
+# Deferred (lazy) module execution. The name patterns are set by `set_lazy_modules()`, which is called from the run-time
+# hook generated when `lazy_modules` are specified in the Analysis. Until then, all modules are executed eagerly.
+_lazy_modules_include = None
+_lazy_modules_exclude = None
+_lazy_loader_class = None
+
+
+def set_lazy_modules(include, exclude=None):
+    """
+    Defer the execution of modules whose names match any of the fnmatch-style patterns in `include` and none of the
+    patterns in `exclude`. Matching modules are loaded via `importlib.util.LazyLoader`, which postpones the execution of
+    module body until the first attribute access on the module object.
+    """
+    global _lazy_modules_include, _lazy_modules_exclude, _lazy_loader_class
+
+    # These imports are safe here, because this function is called only after the bootstrap has completed.
+    import fnmatch
+    import importlib.util
+    import re
+
+    def _compile_patterns(patterns):
+        if not patterns:
+            return None
+        return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+    _lazy_loader_class = importlib.util.LazyLoader
+    _lazy_modules_exclude = _compile_patterns(exclude)
+    _lazy_modules_include = _compile_patterns(include)
+
+
+def _is_lazy_module(fullname):
+    if _lazy_modules_include is None or not _lazy_modules_include.match(fullname):
+        return False
+    if _lazy_modules_exclude is not None and _lazy_modules_exclude.match(fullname):
+        return False
+    return True
+
+
 # Fully resolve sys._MEIPASS, so we can compare fully-resolved paths to it.
 _RESOLVED_TOP_LEVEL_DIRECTORY = os.path.realpath(sys._MEIPASS)
 
@@ -90,7 +143,10 @@ def _build_pyz_prefix_tree(pyz_archive):
         name_components = entry_name.split('.')
         typecode = entry_data[0]
         current = tree
-        if typecode in {pyimod01_archive.PYZ_ITEM_PKG, pyimod01_archive.PYZ_ITEM_NSPKG}:
+        if typecode == pyimod01_archive.PYZ_ITEM_DATA:
+            # Packed data file; not a module.
+            continue
+        elif typecode in {pyimod01_archive.PYZ_ITEM_PKG, pyimod01_archive.PYZ_ITEM_NSPKG}:
             # Package; create new dictionary node for its modules
             for name_component in name_components:
                 current = current.setdefault(name_component, {})
@@ -102,6 +158,51 @@ def _build_pyz_prefix_tree(pyz_archive):
     return tree
 
 
+# Helper for computing the prefix tree of packed data files
+def _build_pyz_data_tree(pyz_archive):
+    tree = dict()
+    for entry_name, entry_data in pyz_archive.toc.items():
+        if entry_data[0] != pyimod01_archive.PYZ_ITEM_DATA:
+            continue
+        *dir_components, filename = entry_name.split('/')
+        current = tree
+        for dir_component in dir_components:
+            current = current.setdefault(dir_component, {})
+        current[filename] = entry_name
+    return tree
+
+
+def _lookup_pyz_data_tree(components):
+    """
+    Look up the node with given path components (relative to top-level application directory) in the prefix tree of
+    packed data files. Returns a dictionary for a directory, the PYZ entry name for a file, or None.
+    """
+    node = get_pyz_data_tree()
+    for component in components:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(component)
+        if node is None:
+            return None
+    return node
+
+
+def _get_data_path_components(path):
+    """
+    Convert the given filesystem path into the list of path components relative to top-level application directory.
+    Returns None if the path is outside of the top-level application directory.
+    """
+    try:
+        relative_path = os.path.relpath(path, sys._MEIPASS)
+    except ValueError:
+        return None
+    if relative_path == os.curdir:
+        return []
+    if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+        return None
+    return relative_path.split(os.sep)
+
+
 class PyiFrozenFinder:
     """
     PyInstaller's frozen path entry finder for specific search path.
@@ -304,6 +405,13 @@ def find_spec(self, fullname, target=None):
         # Resolve full filename, as if the module/package was located on filesystem. This is done by the loader.
         origin = loader.path
 
+        # If the module is subject to deferred execution, wrap the loader. The `LazyLoader` restores our loader on the
+        # module's spec once the module body is executed, so the module ends up with the same attributes as an eagerly
+        # executed one.
+        if _is_lazy_module(fullname):
+            trace(f"{self}: find_spec: deferring execution of {fullname!r}")
+            loader = _lazy_loader_class(loader)
+
         # Construct spec for module, using all collected information.
         spec = _frozen_importlib.ModuleSpec(
             fullname,
@@ -529,8 +637,16 @@ def get_data(self, path):
         """
         # Try to fetch the data from the filesystem. Since __file__ attribute works properly, just try to open the file
         # and read it.
-        with open(path, 'rb') as fp:
-            return fp.read()
+        try:
+            with open(path, 'rb') as fp:
+                return fp.read()
+        except FileNotFoundError:
+            # Fall back to the data files packed into the PYZ archive.
+            components = _get_data_path_components(path)
+            entry_name = _lookup_pyz_data_tree(components) if components is not None else None
+            if not isinstance(entry_name, str):
+                raise
+            return self._pyz_archive.extract(entry_name)
 
     #-- Support for `importlib.resources`.
     @_check_name
@@ -571,6 +687,9 @@ class PyiFrozenResourceReader:
     and its underlying classes, importlib.abc.TraversableResources and importlib.abc.ResourceReader:
       https://github.com/python/cpython/blob/839d7893943782ee803536a47f1d4de160314f85/Lib/importlib/abc.py#L422
       https://github.com/python/cpython/blob/839d7893943782ee803536a47f1d4de160314f85/Lib/importlib/abc.py#L312
+
+    The exception are packages whose data files were packed into the PYZ archive (see `Analysis(packed_data=...)`);
+    for those, files() returns a `PyiFrozenTraversable`, which combines the packed and the on-disk resources.
     """
     def __init__(self, loader):
         # Local import to avoid including `pathlib` and its dependencies in `base_library.zip`
@@ -583,7 +702,11 @@ def open_resource(self, resource):
         return self.files().joinpath(resource).open('rb')
 
     def resource_path(self, resource):
-        return str(self.path.joinpath(resource))
+        path = self.files().joinpath(resource)
+        if isinstance(path, PyiFrozenTraversable):
+            # Packed resource has no filesystem path; `importlib.resources.path()` falls back to a temporary file.
+            raise FileNotFoundError(resource)
+        return str(path)
 
     def is_resource(self, path):
         return self.files().joinpath(path).is_file()
@@ -592,9 +715,100 @@ def contents(self):
         return (item.name for item in self.files().iterdir())
 
     def files(self):
+        components = _get_data_path_components(str(self.path))
+        if components is not None and isinstance(_lookup_pyz_data_tree(components), dict):
+            return PyiFrozenTraversable(components)
         return self.path
 
 
+class PyiFrozenTraversable:
+    """
+    An `importlib.abc.Traversable` for a directory or file that is (at least partially) stored among the data files
+    packed into the PYZ archive. The packed entries are combined with the on-disk contents of the corresponding
+    directory under the top-level application directory; paths that do not exist among the packed entries are returned
+    as `pathlib.Path` objects.
+
+    The packed files have no filesystem path; code that requires one should use `importlib.resources.as_file()`, which
+    materializes the file into a temporary location.
+    """
+    def __init__(self, components):
+        self._components = tuple(components)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._fs_path!r})"
+
+    def __str__(self):
+        return self._fs_path
+
+    def __eq__(self, other):
+        if not isinstance(other, PyiFrozenTraversable):
+            return NotImplemented
+        return self._components == other._components
+
+    def __hash__(self):
+        return hash(self._components)
+
+    @property
+    def _fs_path(self):
+        return os.path.join(sys._MEIPASS, *self._components)
+
+    @property
+    def _node(self):
+        return _lookup_pyz_data_tree(self._components)
+
+    @property
+    def name(self):
+        return self._components[-1] if self._components else os.path.basename(sys._MEIPASS)
+
+    def iterdir(self):
+        names = set()
+        node = self._node
+        if isinstance(node, dict):
+            names.update(node)
+        if os.path.isdir(self._fs_path):
+            names.update(os.listdir(self._fs_path))
+        return (self.joinpath(name) for name in sorted(names))
+
+    def is_dir(self):
+        return isinstance(self._node, dict) or os.path.isdir(self._fs_path)
+
+    def is_file(self):
+        return isinstance(self._node, str) or os.path.isfile(self._fs_path)
+
+    def joinpath(self, *descendants):
+        components = list(self._components)
+        for descendant in descendants:
+            components += [component for component in str(descendant).replace(os.sep, '/').split('/') if component]
+        if _lookup_pyz_data_tree(components) is not None:
+            return PyiFrozenTraversable(components)
+        # Not a packed entry; return the filesystem path.
+        import pathlib
+        return pathlib.Path(sys._MEIPASS, *components)
+
+    def __truediv__(self, child):
+        return self.joinpath(child)
+
+    def open(self, mode='r', *args, **kwargs):
+        entry_name = self._node
+        if not isinstance(entry_name, str):
+            # Directory, possibly with an on-disk file of the same name; let the filesystem sort it out.
+            return open(self._fs_path, mode, *args, **kwargs)
+        if mode not in {'r', 'rb'}:
+            raise ValueError(f"Invalid mode for packed resource: {mode!r}!")
+        stream = io.BytesIO(pyz_archive.extract(entry_name))
+        if mode == 'rb':
+            return stream
+        return io.TextIOWrapper(stream, *args, **kwargs)
+
+    def read_bytes(self):
+        with self.open('rb') as fp:
+            return fp.read()
+
+    def read_text(self, encoding=None):
+        with self.open('r', encoding=encoding) as fp:
+            return fp.read()
+
+
 class PyiFrozenEntryPointLoader:
     """
     A special loader that enables retrieval of the code-object for the __main__ module.
@@ -627,6 +841,9 @@ def install():
 
     try:
         pyz_archive = pyimod01_archive.ZlibArchiveReader(sys._pyinstaller_pyz, check_pymagic=True)
+        # Executables of a `MERGE`'d suite keep the modules that they share with other executables in a shared PYZ
+        # archive, which is collected (or extracted) next to the other collected files.
+        pyz_archive.link_shared_archives(sys._MEIPASS)
     except Exception as e:
         raise RuntimeError("Failed to setup PYZ archive reader!") from e
 
@@ -13,11 +13,15 @@
 """
 
 import argparse
+import concurrent.futures
+import mmap
 import os
+import struct
 import sys
 
 import PyInstaller.log
-from PyInstaller.archive.readers import CArchiveReader, ZlibArchiveReader
+from PyInstaller.archive.readers import CArchiveReader, ZlibArchiveReader, PKG_ITEM_PYZ
+from PyInstaller.loader.pyimod01_archive import PYZ_ITEM_DATA, PYZ_ITEM_NSPKG, PYZ_ITEM_PKG, PYZ_ITEM_SHARED
 
 try:
     from argcomplete import autocomplete
@@ -215,6 +219,92 @@ def _show_archive_contents(self, archive_name, archive):
             print(f"FIXME: implement content listing for archive type {type(archive)}!")
 
 
+def _get_output_path(output_dir, name):
+    # Entry names come from the archive; do not allow them to escape the output directory.
+    path = os.path.normpath(os.path.join(output_dir, name))
+    if os.path.isabs(name) or os.path.commonpath([output_dir, path]) != output_dir:
+        raise ValueError(f"Entry name {name!r} points outside of the output directory!")
+    return path
+
+
+def _get_pyz_output_name(name, typecode):
+    # Modules are written as .pyc files, with packages becoming directories; data files retain their path.
+    if typecode == PYZ_ITEM_DATA:
+        return name
+    if typecode in (PYZ_ITEM_NSPKG, PYZ_ITEM_SHARED):
+        return None
+    if typecode == PYZ_ITEM_PKG:
+        return os.path.join(*name.split('.'), '__init__.pyc')
+    return os.path.join(*name.split('.')) + '.pyc'
+
+
+def _extract_entry(archive, name, path, mapping, header=b''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as fp:
+        fp.write(header)
+        return archive.extract_to(name, fp, mapping=mapping)
+
+
+def extract_archive(filename, output_dir, jobs=None):
+    """
+    Extract all entries of the given archive (PKG/CArchive or PYZ) into the output directory, using a pool of `jobs`
+    threads. The archive file is memory-mapped and shared by all threads. The contents of PYZ archives embedded in a
+    CArchive are additionally extracted into a `<name>_extracted` directory; the modules are written as .pyc files.
+
+    Returns the list of (name, error) tuples for the entries that could not be extracted.
+    """
+    output_dir = os.path.abspath(output_dir)
+
+    if filename[-4:].lower() == '.pyz':
+        toplevel_archive = None
+        pyz_archives = [(ZlibArchiveReader(filename), output_dir)]
+    else:
+        toplevel_archive = CArchiveReader(filename)
+        pyz_archives = []
+        for name, (*_, typecode) in toplevel_archive.toc.items():
+            if typecode == PKG_ITEM_PYZ:
+                pyz_archives.append((toplevel_archive.open_embedded_archive(name), f"{name}_extracted"))
+
+    errors = []
+    with open(filename, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            futures = {}
+
+            def _submit(archive, name, output_name, header=b''):
+                try:
+                    path = _get_output_path(output_dir, output_name)
+                except ValueError as e:
+                    errors.append((name, e))
+                    return
+                futures[executor.submit(_extract_entry, archive, name, path, mapping, header)] = name
+
+            if toplevel_archive is not None:
+                for name in toplevel_archive.toc:
+                    _submit(toplevel_archive, name, name)
+
+            for pyz_archive, pyz_output_dir in pyz_archives:
+                # PEP-552 header of hash-based .pyc, with check_source=False and zeroed source hash.
+                pyc_header = pyz_archive.pymagic + struct.pack('<I', 0b01) + b'\00' * 8
+                for name, (typecode, *_) in pyz_archive.toc.items():
+                    output_name = _get_pyz_output_name(name, typecode)
+                    if output_name is None:
+                        continue
+                    _submit(
+                        pyz_archive,
+                        name,
+                        os.path.join(pyz_output_dir, output_name),
+                        b'' if typecode == PYZ_ITEM_DATA else pyc_header,
+                    )
+
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append((futures[future], e))
+
+    return errors
+
+
 def run():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -241,6 +331,21 @@ def run():
         dest='brief',
         help='When displaying archive contents, show only file names. (default: %(default)s).',
     )
+    parser.add_argument(
+        '--extract-all',
+        default=None,
+        metavar='DIR',
+        dest='extract_dir',
+        help='Extract all entries of the archive, including the modules in the embedded PYZ archives, into the given '
+        'directory and exit.',
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=None,
+        help='Number of entries to extract in parallel with --extract-all (default: number of CPUs).',
+    )
     PyInstaller.log.__add_options(parser)
     parser.add_argument(
         'filename',
@@ -252,6 +357,22 @@ def run():
     args = parser.parse_args()
     PyInstaller.log.__process_options(parser, args)
 
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("the number of jobs must be at least 1")
+
+    if args.extract_dir:
+        if not os.path.isfile(args.filename):
+            raise SystemExit(f"Archive {args.filename} does not exist!")
+        try:
+            errors = extract_archive(args.filename, args.extract_dir, args.jobs)
+        except KeyboardInterrupt:
+            raise SystemExit("Aborted by user.")
+        for name, error in errors:
+            print(f"Failed to extract entry {name!r}: {error}", file=sys.stderr)
+        if errors:
+            raise SystemExit(1)
+        return
+
     try:
         viewer = ArchiveViewer(
             filename=args.filename,
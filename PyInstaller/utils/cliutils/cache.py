@@ -0,0 +1,123 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Inspect and maintain PyInstaller's cache directory: show per-cache statistics, evict least-recently-used entries to
+bring the cache under a size limit, and verify the integrity of cache entries.
+"""
+
+import argparse
+import json
+import sys
+
+import PyInstaller.log
+from PyInstaller.building import cache
+
+try:
+    from argcomplete import autocomplete
+except ImportError:
+
+    def autocomplete(parser):
+        return None
+
+
+def _print_stats(stats):
+    print(f"{'Cache':<40} {'Entries':>8} {'Size':>11} {'Hits':>8} {'Misses':>8} {'Saved':>11}")
+    for cache_name, cache_stats in stats.items():
+        print(
+            f"{cache_name:<40} {cache_stats['entries']:>8} {cache.format_size(cache_stats['size']):>11} "
+            f"{cache_stats['hits']:>8} {cache_stats['misses']:>8} {cache.format_size(cache_stats['bytes_saved']):>11}"
+        )
+
+
+def run():
+    from PyInstaller import configure
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--cachedir',
+        default=None,
+        help="The cache directory to operate on (default: PyInstaller's cache directory).",
+    )
+    PyInstaller.log.__add_options(parser)
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    parser_stats = subparsers.add_parser('stats', help="Show the size and the hit/miss statistics of each cache.")
+    parser_stats.add_argument(
+        '--json',
+        default=False,
+        action='store_true',
+        help="Output the statistics in JSON format (default: %(default)s).",
+    )
+
+    parser_prune = subparsers.add_parser(
+        'prune', help="Evict least-recently-used entries until the cache directory is under the size limit."
+    )
+    parser_prune.add_argument(
+        '--max-size',
+        default=None,
+        help="The size limit, e.g., 500M or 2G (default: the PYINSTALLER_CACHE_MAX_SIZE environment variable).",
+    )
+    parser_prune.add_argument(
+        '--dry-run',
+        default=False,
+        action='store_true',
+        help="Only list the entries that would be evicted (default: %(default)s).",
+    )
+
+    parser_verify = subparsers.add_parser('verify', help="Check the cache entries for damage.")
+    parser_verify.add_argument(
+        '--fix',
+        default=False,
+        action='store_true',
+        help="Remove the damaged entries (default: %(default)s).",
+    )
+
+    autocomplete(parser)
+    args = parser.parse_args()
+    PyInstaller.log.__process_options(parser, args)
+
+    cache_dir = args.cachedir
+    if cache_dir is None:
+        cache_dir = configure._get_pyinstaller_cache_dir()
+
+    try:
+        if args.command == 'stats':
+            stats = cache.get_stats(cache_dir)
+            if args.json:
+                json.dump(stats, sys.stdout, indent=1)
+                print()
+            else:
+                _print_stats(stats)
+        elif args.command == 'prune':
+            if args.max_size is not None:
+                try:
+                    max_size = cache.parse_size(args.max_size)
+                except ValueError as e:
+                    raise SystemExit(str(e))
+            else:
+                max_size = configure._get_cache_max_size()
+                if max_size is None:
+                    raise SystemExit("No size limit given; use --max-size or set PYINSTALLER_CACHE_MAX_SIZE.")
+            evicted = cache.prune(cache_dir, max_size, dry_run=args.dry_run)
+            for entry in evicted:
+                print(f"{'Would evict' if args.dry_run else 'Evicted'} {entry.path} ({cache.format_size(entry.size)})")
+        elif args.command == 'verify':
+            problems = cache.verify(cache_dir, fix=args.fix)
+            for path, problem in problems:
+                print(f"{path}: {problem}{' (removed)' if args.fix else ''}")
+            if problems and not args.fix:
+                raise SystemExit(1)
+    except KeyboardInterrupt:
+        raise SystemExit("Aborted by user request.")
+
+
+if __name__ == '__main__':
+    run()
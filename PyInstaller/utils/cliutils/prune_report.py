@@ -0,0 +1,357 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Cross-reference run-time import traces of a frozen application with the collection origins recorded by Analysis, and
+report the modules and shared libraries that were collected but never loaded.
+
+The collection origins are written by Analysis into `origins-<specname>.json` in the work directory, when building
+with `--collection-origins` (or `--log-level DEBUG`). The run-time traces are plain-text logs; the following line
+formats are recognized:
+
+ * `import 'name' # ...` lines emitted by the import system in verbose mode (e.g., frozen application built with
+   `--debug imports`, or run with `PYTHONVERBOSE=1`);
+ * `# extension module 'name' loaded from '...'` lines emitted in verbose mode;
+ * lines containing paths to shared libraries (e.g., output of `LD_DEBUG=libs`, or `/proc/<pid>/maps` dumps);
+ * lines containing just a fully-qualified module name.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+import PyInstaller.log
+
+try:
+    from argcomplete import autocomplete
+except ImportError:
+
+    def autocomplete(parser):
+        return None
+
+
+_IMPORT_LINE_RE = re.compile(r"^import '?(?P<name>[\w.]+)'?(?:\s|$)")
+_EXTENSION_LINE_RE = re.compile(r"^(?:#\s*)?extension module '(?P<name>[\w.]+)' (?:loaded|executed) from ")
+_MODULE_NAME_RE = re.compile(r"^[A-Za-z_][\w]*(?:\.[A-Za-z_][\w]*)*$")
+_SHARED_LIBRARY_RE = re.compile(r"(?P<path>[^\s'\"()\[\]]+\.(?:so(?:\.\d+)*|dylib|dll|pyd))(?=[\s'\")\]]|$)", re.I)
+
+
+def parse_trace(lines):
+    """
+    Parse the lines of a run-time trace. Returns a (modules, libraries) tuple of sets, containing the names of loaded
+    modules and the paths of loaded shared libraries, respectively.
+
+    Extension modules are recorded as loaded modules only; their shared libraries are accounted for via the module
+    names. The set of libraries thus remains empty unless the trace contains records of shared library loads (which
+    also cover libraries loaded by the bootloader and the dynamic linker).
+    """
+    modules = set()
+    libraries = set()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        m = _IMPORT_LINE_RE.match(line)
+        if m:
+            modules.add(m.group('name'))
+            continue
+        m = _EXTENSION_LINE_RE.match(line)
+        if m:
+            modules.add(m.group('name'))
+            continue
+        if _MODULE_NAME_RE.match(line):
+            modules.add(line)
+            continue
+        libraries.update(m.group('path') for m in _SHARED_LIBRARY_RE.finditer(line))
+
+    # Importing a submodule implies that all its parent packages were imported as well.
+    for name in list(modules):
+        while '.' in name:
+            name = name.rpartition('.')[0]
+            modules.add(name)
+
+    return modules, libraries
+
+
+def _match_libraries(binaries, libraries):
+    """
+    Return the set of destination names of collected binaries that match any of the given loaded library paths. The
+    paths are matched by suffix, so that traces from onefile builds (where the application is unpacked into a temporary
+    directory) and from onedir builds can be used alike.
+    """
+    by_basename = {}
+    for dest_name in binaries:
+        normalized = dest_name.replace('\\', '/')
+        by_basename.setdefault(normalized.rpartition('/')[2], []).append((normalized, dest_name))
+
+    matched = set()
+    for path in libraries:
+        path = path.replace('\\', '/')
+        for normalized, dest_name in by_basename.get(path.rpartition('/')[2], []):
+            if path == normalized or path.endswith('/' + normalized):
+                matched.add(dest_name)
+    return matched
+
+
+def compute_report(origins, loaded_modules, loaded_libraries):
+    """
+    Compute the pruning report from the collection origins (as written by Analysis) and the sets of loaded modules and
+    shared libraries (as obtained from `parse_trace`).
+
+    The unused modules are grouped by the import edge that pulled them in: each edge from a loaded module (or program
+    script) to an unused module starts a group, and the group contains all unused modules that are reachable from it
+    through other unused modules. The `exclusive` part of a group lists modules that are not reachable from any other
+    group, and would therefore be dropped from the bundle if the edge was removed.
+    """
+    modules = origins['modules']
+    binaries = origins['binaries']
+
+    unused = {name for name in modules if name not in loaded_modules}
+
+    # Edges between unused modules, and the edges from loaded modules into unused modules.
+    children = {}
+    groups = {}
+    for name in sorted(unused):
+        for importer, import_type, origin in modules[name]['importers']:
+            if importer in unused:
+                children.setdefault(importer, []).append(name)
+            elif origin in ('script', 'hiddenimports') or importer in loaded_modules:
+                if origin in ('script', 'hiddenimports'):
+                    key = (origin, None)
+                elif origin is not None:
+                    key = ('hook', importer)
+                else:
+                    key = ('import', importer)
+                group = groups.setdefault(key, {'hook_file': None, 'targets': {}})
+                if key[0] == 'hook':
+                    group['hook_file'] = origin
+                group['targets'][name] = import_type
+
+    # Determine the modules reachable from each group.
+    owners = {}
+    for key, group in groups.items():
+        reached = set()
+        stack = list(group['targets'])
+        while stack:
+            name = stack.pop()
+            if name in reached:
+                continue
+            reached.add(name)
+            stack.extend(children.get(name, []))
+        group['modules'] = reached
+        for name in reached:
+            owners.setdefault(name, []).append(key)
+
+    # Extension modules' shared libraries count towards the size of their modules.
+    extension_binaries = {entry['module']: dest_name for dest_name, entry in binaries.items() if 'module' in entry}
+
+    def _size(names):
+        return sum(modules[name]['size'] for name in names if not modules[name].get('extension'))
+
+    def _binaries_size(names):
+        return sum(binaries[extension_binaries[name]]['size'] for name in names if name in extension_binaries)
+
+    report_groups = []
+    for (kind, importer), group in groups.items():
+        exclusive = {name for name in group['modules'] if len(owners[name]) == 1}
+        report_groups.append({
+            'kind': kind,
+            'importer': importer,
+            'hook_file': group['hook_file'],
+            'targets': sorted(group['targets'].items()),
+            'modules': sorted(group['modules']),
+            'exclusive_modules': sorted(exclusive),
+            'size': _size(exclusive),
+            'extraction_size': _binaries_size(exclusive),
+        })
+    report_groups.sort(
+        key=lambda group: (group['size'] + group['extraction_size'], group['importer'] or ''), reverse=True
+    )
+
+    unattributed = sorted(name for name in unused if name not in owners)
+
+    # `excludes` suggestions: top-level packages none of whose collected modules were loaded.
+    toplevel = {}
+    for name in modules:
+        toplevel.setdefault(name.partition('.')[0], []).append(name)
+    excludes = []
+    for package, names in sorted(toplevel.items()):
+        if package in loaded_modules or not all(name in unused for name in names):
+            continue
+        excludes.append({
+            'name': package,
+            'modules': len(names),
+            'size': _size(names),
+            'extraction_size': _binaries_size(names),
+        })
+
+    # `excludedimports` suggestions: regular imports from loaded modules. These can be suppressed via a hook for the
+    # importing module. Hidden imports added by hooks or by Analysis bypass `excludedimports`, so those are covered by
+    # the `excludes` suggestions only.
+    excludedimports = [{
+        'module': group['importer'],
+        'excludedimports': [name for name, _ in group['targets']],
+        'size': group['size'],
+        'extraction_size': group['extraction_size'],
+    } for group in report_groups if group['kind'] == 'import' and group['exclusive_modules']]
+
+    # Shared libraries; only if the traces contained any records of loaded libraries.
+    unused_binaries = None
+    if loaded_libraries:
+        used_binaries = _match_libraries(binaries, loaded_libraries)
+        unused_binaries = {}
+        for dest_name, entry in sorted(binaries.items()):
+            if dest_name in used_binaries or entry.get('module') in loaded_modules:
+                continue
+            if 'module' in entry:
+                origin = f"extension module {entry['module']}"
+            elif 'hook' in entry:
+                origin = f"hook for {entry['hook']}"
+            else:
+                origin = "binary dependency analysis"
+            unused_binaries.setdefault(origin, []).append((dest_name, entry['size']))
+
+    return {
+        'loaded_modules': len(modules) - len(unused),
+        'unused_modules': len(unused),
+        'unused_size': _size(unused),
+        'groups': report_groups,
+        'unattributed_modules': unattributed,
+        'excludes': excludes,
+        'excludedimports': excludedimports,
+        'unused_binaries': unused_binaries,
+    }
+
+
+def _format_size(size):
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_report(report, file=sys.stdout):
+    print(
+        f"Collected modules: {report['loaded_modules'] + report['unused_modules']}, loaded at run-time: "
+        f"{report['loaded_modules']}, never loaded: {report['unused_modules']} "
+        f"({_format_size(report['unused_size'])} of source)",
+        file=file,
+    )
+
+    print("\nUnused modules, grouped by the import that pulled them in:", file=file)
+    shared_groups = 0
+    for group in report['groups']:
+        if not group['exclusive_modules']:
+            shared_groups += 1
+            continue
+        if group['kind'] == 'hook':
+            description = f"hidden imports from hook for {group['importer']} ({group['hook_file']})"
+        elif group['kind'] == 'import':
+            description = f"imports from {group['importer']}"
+        elif group['kind'] == 'hiddenimports':
+            description = "hidden imports from Analysis"
+        else:
+            description = "imports from program script(s)"
+        print(
+            f" * {description}: {len(group['modules'])} module(s), {len(group['exclusive_modules'])} exclusively; "
+            f"est. savings: {_format_size(group['size'])} of source, {_format_size(group['extraction_size'])} of "
+            "extension modules",
+            file=file,
+        )
+        for name, import_type in group['targets']:
+            print(f"    -> {name} ({import_type})", file=file)
+    if shared_groups:
+        print(f" * {shared_groups} other import(s) of modules that are also pulled in by the above", file=file)
+    if report['unattributed_modules']:
+        print(f" * not reachable from loaded modules: {len(report['unattributed_modules'])} module(s)", file=file)
+
+    if report['unused_binaries'] is not None:
+        print("\nUnused shared libraries:", file=file)
+        for origin, entries in sorted(report['unused_binaries'].items()):
+            print(f" * {origin}:", file=file)
+            for dest_name, size in entries:
+                print(f"    {dest_name} ({_format_size(size)})", file=file)
+    else:
+        print("\nTraces contain no shared library records; skipping the shared library report.", file=file)
+
+    print("\nSuggested additions to Analysis(excludes=[...]):", file=file)
+    for entry in report['excludes']:
+        print(
+            f"    {entry['name']!r},  # {entry['modules']} module(s), est. savings: {_format_size(entry['size'])} of "
+            f"source, {_format_size(entry['extraction_size'])} less to extract at startup",
+            file=file,
+        )
+
+    print("\nSuggested excludedimports for hooks (e.g., in a directory passed via --additional-hooks-dir):", file=file)
+    for entry in report['excludedimports']:
+        print(
+            f"  # hook-{entry['module']}.py; est. savings: {_format_size(entry['size'])} of source, "
+            f"{_format_size(entry['extraction_size'])} less to extract at startup",
+            file=file,
+        )
+        print(f"  excludedimports = {entry['excludedimports']!r}", file=file)
+
+
+def run():
+    parser = argparse.ArgumentParser(
+        description="Report collected modules and shared libraries that were not loaded during the run-time traces."
+    )
+    parser.add_argument(
+        'origins',
+        metavar='origins-file',
+        help="The origins-<specname>.json file from the build's work directory.",
+    )
+    parser.add_argument(
+        'traces',
+        nargs='+',
+        metavar='trace-file',
+        help="Run-time trace log(s) of the frozen application.",
+    )
+    parser.add_argument(
+        '--json',
+        default=False,
+        action='store_true',
+        help="Output the report in JSON format (default: %(default)s).",
+    )
+    PyInstaller.log.__add_options(parser)
+
+    autocomplete(parser)
+    args = parser.parse_args()
+    PyInstaller.log.__process_options(parser, args)
+
+    try:
+        with open(args.origins, 'r', encoding='utf-8') as fp:
+            origins = json.load(fp)
+
+        loaded_modules = set()
+        loaded_libraries = set()
+        for trace in args.traces:
+            if not os.path.isfile(trace):
+                raise SystemExit(f"Trace file {trace!r} does not exist!")
+            with open(trace, 'r', encoding='utf-8', errors='replace') as fp:
+                modules, libraries = parse_trace(fp)
+            loaded_modules |= modules
+            loaded_libraries |= libraries
+
+        report = compute_report(origins, loaded_modules, loaded_libraries)
+        if args.json:
+            json.dump(report, sys.stdout, indent=1)
+            print()
+        else:
+            print_report(report)
+    except KeyboardInterrupt:
+        raise SystemExit("Aborted by user request.")
+
+
+if __name__ == '__main__':
+    run()
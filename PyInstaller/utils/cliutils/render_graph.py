@@ -0,0 +1,181 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Render the module graph, written by Analysis into `graph-<specname>.jsonl` in the work directory, as an HTML
+cross-reference or as a GraphViz (dot) drawing.
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.request
+
+import PyInstaller.log
+
+try:
+    from argcomplete import autocomplete
+except ImportError:
+
+    def autocomplete(parser):
+        return None
+
+
+GRAPH_FORMAT = 'pyinstaller-graph'
+GRAPH_FORMAT_VERSION = 1
+
+
+def load_graph(lines):
+    """
+    Parse the lines of a module graph dump. Returns a (scripts, nodes, edges) tuple, where `scripts` is the list of
+    program scripts, `nodes` is a dictionary that maps node names to node records, and `edges` is the list of edge
+    records, in the order of the dump.
+    """
+    lines = iter(lines)
+    try:
+        header = json.loads(next(lines))
+    except (StopIteration, ValueError):
+        raise ValueError("Not a module graph dump!")
+    if not isinstance(header, dict) or header.get('format') != GRAPH_FORMAT:
+        raise ValueError("Not a module graph dump!")
+    if header.get('version') != GRAPH_FORMAT_VERSION:
+        raise ValueError(f"Unsupported module graph dump version: {header.get('version')!r}!")
+
+    nodes = {}
+    edges = []
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if 'node' in record:
+            nodes[record['node']] = record
+        elif 'edge' in record:
+            edges.append(record)
+    return header['scripts'], nodes, edges
+
+
+def _short_name(name):
+    # Script nodes are named by their full path.
+    return os.path.basename(name)
+
+
+def render_xref(scripts, nodes, edges, out):
+    """
+    Write an HTML cross-reference of the module graph, equivalent to the one created by `ModuleGraph.create_xref`.
+    """
+    from html import escape
+    from PyInstaller.lib.modulegraph.modulegraph import contpl, contpl_linked, entry, footer, header, imports
+
+    outgoing = {name: [] for name in nodes}
+    incoming = {name: [] for name in nodes}
+    for edge in edges:
+        importer, imported = edge['edge']
+        if importer in outgoing and imported in incoming:
+            outgoing[importer].append(_short_name(imported))
+            incoming[imported].append(_short_name(importer))
+
+    # Scripts first, followed by other nodes; both sorted by name.
+    script_names = set(scripts)
+    ordered = sorted((_short_name(name), name) for name in nodes if name in script_names)
+    ordered += sorted((_short_name(name), name) for name in nodes if name not in script_names)
+
+    title = "modulegraph cross reference for " + ', '.join(_short_name(name) for name in sorted(scripts))
+    print(header % {"TITLE": escape(title)}, file=out)
+    for short_name, name in ordered:
+        node = nodes[name]
+        if node['type'] == 'BuiltinModule':
+            content = contpl % {"NAME": short_name, "TYPE": "<i>(builtin module)</i>"}
+        elif node['type'] in {'Extension', 'ExtensionPackage'}:
+            content = contpl % {"NAME": short_name, "TYPE": "<tt>%s</tt>" % escape(node['filename'] or '')}
+        else:
+            url = urllib.request.pathname2url(node['filename'] or "")
+            content = contpl_linked % {"NAME": short_name, "URL": url, "TYPE": node['type']}
+        for head, names in (("imports", outgoing[name]), ("imported by", incoming[name])):
+            if names:
+                # #8226 = bullet-point
+                links = " &#8226; ".join("""  <a href="#%s">%s</a>\n""" % (n, n) for n in sorted(names))
+                content += imports % {"HEAD": head, "LINKS": links}
+        print(entry % {"NAME": short_name, "CONTENT": content}, file=out)
+    print(footer, file=out)
+
+
+def render_dot(scripts, nodes, edges, out):
+    """
+    Write a GraphViz (dot) drawing of the module graph. Conditional, delayed (function-level), and try/except imports
+    are drawn with dashed lines.
+    """
+    def _quote(value):
+        return '"%s"' % str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+    out.write('digraph G {\ncharset="UTF-8";\n')
+    out.write('\trankdir="LR";\n\tconcentrate="true";\n')
+    for name, node in nodes.items():
+        label = '<f0> %s| <f1> %s' % (node['type'], name)
+        out.write('\t%s [label=%s,shape="record"];\n' % (_quote(name), _quote(label)))
+    for edge in edges:
+        importer, imported = edge['edge']
+        flags = edge['flags'] or {}
+        style = ' [style="dashed"]' if flags.get('conditional') or flags.get('function') or flags.get('tryexcept') \
+            else ''
+        out.write('\t%s -> %s%s;\n' % (_quote(importer), _quote(imported), style))
+    out.write('}\n')
+
+
+RENDERERS = {
+    'html': render_xref,
+    'dot': render_dot,
+}
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        'graph_file',
+        metavar='graph-file',
+        help="Module graph dump (graph-<specname>.jsonl) from the work directory of the build.",
+    )
+    parser.add_argument(
+        '--format',
+        choices=sorted(RENDERERS),
+        default='html',
+        help="Output format: HTML cross-reference, or GraphViz drawing (default: %(default)s).",
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        default=None,
+        help="Output file (default: standard output).",
+    )
+    PyInstaller.log.__add_options(parser)
+    autocomplete(parser)
+    args = parser.parse_args()
+    PyInstaller.log.__process_options(parser, args)
+
+    try:
+        with open(args.graph_file, encoding='utf-8') as fp:
+            scripts, nodes, edges = load_graph(fp)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Failed to read {args.graph_file}: {e}")
+
+    renderer = RENDERERS[args.format]
+    try:
+        if args.output:
+            # The DOT language's default character encoding is UTF-8.
+            with open(args.output, 'w', encoding='utf-8') as out:
+                renderer(scripts, nodes, edges, out)
+        else:
+            renderer(scripts, nodes, edges, sys.stdout)
+    except KeyboardInterrupt:
+        raise SystemExit("Aborted by user request.")
+
+
+if __name__ == '__main__':
+    run()
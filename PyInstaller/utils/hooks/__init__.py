@@ -14,6 +14,7 @@
 import copy
 import os
 import subprocess
+import sys
 import textwrap
 import fnmatch
 from pathlib import Path
@@ -21,6 +22,7 @@
 from typing import Callable
 
 import packaging.requirements
+import packaging.utils
 
 from PyInstaller import HOMEPATH, compat
 from PyInstaller import log as logging
@@ -376,6 +378,107 @@ def get_pywin32_module_file_attribute(module_name):
     return get_module_attribute(module_name, '__file__')
 
 
+class _DistributionIndex:
+    """
+    Index of the distributions visible on the given search path, built from a single scan of their metadata.
+
+    Hook utilities such as :func:`copy_metadata` and :func:`check_requirement` are called by hundreds of hooks; with
+    ``importlib.metadata``, each call would rescan every ``sys.path`` entry for metadata directories. The index performs
+    one scan, and reads the per-distribution metadata (version, requirements, top-level packages, recorded files) only
+    when it is first requested.
+    """
+    def __init__(self, path):
+        self.path = tuple(path)
+        self._distributions = None
+        self._versions = {}
+        self._requires = {}
+        self._packages_distributions = None
+        self._file_distributions = None
+
+    @staticmethod
+    def normalize_name(name):
+        return packaging.utils.canonicalize_name(name)
+
+    @property
+    def distributions(self):
+        """
+        Dictionary mapping normalized distribution names to distribution objects. If a distribution is found in more
+        than one search path entry, the first one takes precedence, same as with ``importlib.metadata.distribution()``.
+        """
+        if self._distributions is None:
+            distributions = {}
+            for dist in importlib_metadata.distributions(path=list(self.path)):
+                name = dist.metadata['Name']
+                if not name:
+                    continue
+                distributions.setdefault(self.normalize_name(name), dist)
+            self._distributions = distributions
+        return self._distributions
+
+    def distribution(self, name):
+        try:
+            return self.distributions[self.normalize_name(name)]
+        except KeyError:
+            raise importlib_metadata.PackageNotFoundError(name) from None
+
+    def version(self, name):
+        key = self.normalize_name(name)
+        if key not in self._versions:
+            self._versions[key] = self.distribution(name).version
+        return self._versions[key]
+
+    def requires(self, name):
+        key = self.normalize_name(name)
+        if key not in self._requires:
+            self._requires[key] = self.distribution(name).requires
+        return self._requires[key]
+
+    def packages_distributions(self):
+        """
+        Equivalent of ``importlib.metadata.packages_distributions()``; maps top-level import names to the names of
+        distributions that provide them.
+        """
+        if self._packages_distributions is None:
+            self._packages_distributions = importlib_metadata.packages_distributions()
+        return self._packages_distributions
+
+    def file_distribution(self, filename):
+        """
+        Return the name of the distribution whose list of installed files (i.e., the ``RECORD`` file) contains the given
+        file, or None.
+        """
+        if self._file_distributions is None:
+            file_distributions = {}
+            for dist in self.distributions.values():
+                for file in dist.files or []:
+                    file_path = os.path.normcase(os.path.abspath(str(dist.locate_file(file))))
+                    file_distributions.setdefault(file_path, dist.metadata['Name'])
+            self._file_distributions = file_distributions
+        return self._file_distributions.get(os.path.normcase(os.path.abspath(filename)))
+
+
+_distribution_index = None
+
+
+def _get_distribution_index():
+    """
+    Return the distribution index for the current ``sys.path``; the index is (re)built whenever ``sys.path`` changes.
+    """
+    global _distribution_index
+    if _distribution_index is None or _distribution_index.path != tuple(sys.path):
+        _distribution_index = _DistributionIndex(sys.path)
+    return _distribution_index
+
+
+def _reset_distribution_index():
+    """
+    Discard the distribution index, so that it is rebuilt on the next use. Called at the start of each build, in case
+    distributions were installed or removed in the meantime.
+    """
+    global _distribution_index
+    _distribution_index = None
+
+
 def check_requirement(requirement: str):
     """
     Check if a :pep:`0508` requirement is satisfied. Usually used to check if a package distribution is installed,
@@ -409,7 +512,7 @@ def check_requirement(requirement: str):
 
     # Fetch the actual version of the specified dist
     try:
-        version = importlib_metadata.version(parsed_requirement.name)
+        version = _get_distribution_index().version(parsed_requirement.name)
     except importlib_metadata.PackageNotFoundError:
         return False  # Not available at all
 
@@ -961,13 +1064,14 @@ def copy_metadata(package_name: str, recursive: bool = False):
     todo = deque([package_name])
     done = set()
     out = []
+    distribution_index = _get_distribution_index()
 
     while todo:
         package_name = todo.pop()
         if package_name in done:
             continue
 
-        dist = importlib_metadata.distribution(package_name)
+        dist = distribution_index.distribution(package_name)
 
         # We support only `importlib_metadata.PathDistribution`, since we need to rely on its private `_path` attribute
         # to obtain the path to metadata file/directory. But we need to account for possible sub-classes and vendored
@@ -1044,7 +1148,9 @@ def copy_metadata(package_name: str, recursive: bool = False):
         # Process requirements; `importlib.metadata` has no API for parsing requirements, so we need to use
         # `packaging.requirements`. This is necessary to discard requirements with markers that do not match the
         # environment (e.g., `python_version`, `sys_platform`).
-        requirements = [packaging.requirements.Requirement(req) for req in dist.requires or []]
+        requirements = [
+            packaging.requirements.Requirement(req) for req in distribution_index.requires(package_name) or []
+        ]
         requirements = [req.name for req in requirements if req.marker is None or req.marker.evaluate()]
 
         todo += requirements
@@ -1059,27 +1165,39 @@ def get_installer(module: str):
     :param module: Module to check
     :return: Package manager or None
     """
-    # Resolve distribution for given module/package name (e.g., enchant -> pyenchant).
-    pkg_to_dist = importlib_metadata.packages_distributions()
-    dist_names = pkg_to_dist.get(module)
-    if dist_names is not None:
-        # A namespace package might result in multiple dists; take the first one...
+    distribution_index = _get_distribution_index()
+
+    def _read_installer(dist_name):
         try:
-            dist = importlib_metadata.distribution(dist_names[0])
-            installer_text = dist.read_text('INSTALLER')
-            if installer_text is not None:
-                return installer_text.strip()
+            installer_text = distribution_index.distribution(dist_name).read_text('INSTALLER')
         except importlib_metadata.PackageNotFoundError:
             # This might happen with eggs if the egg directory name does not match the dist name declared in the
             # metadata.
-            pass
-
-    if compat.is_darwin:
-        try:
-            file_name = get_module_file_attribute(module)
-        except ImportError:
             return None
+        return installer_text.strip() if installer_text is not None else None
+
+    # Resolve distribution for given module/package name (e.g., enchant -> pyenchant).
+    dist_names = distribution_index.packages_distributions().get(module)
+    if dist_names is not None:
+        # A namespace package might result in multiple dists; take the first one...
+        installer = _read_installer(dist_names[0])
+        if installer is not None:
+            return installer
 
+    try:
+        file_name = get_module_file_attribute(module)
+    except ImportError:
+        return None
+
+    # Resolve distribution from the list of installed files; this also covers submodules (e.g., numpy.core), which are
+    # not listed in the top-level package mapping.
+    dist_name = distribution_index.file_distribution(file_name)
+    if dist_name is not None:
+        installer = _read_installer(dist_name)
+        if installer is not None:
+            return installer
+
+    if compat.is_darwin:
         # Attempt to resolve the module file via macports' port command
         try:
             output = subprocess.run(['port', 'provides', file_name],
@@ -1142,7 +1260,7 @@ def collect_all(
 
     # `copy_metadata` requires a dist name instead of importable/package name.
     # A namespace package might belong to multiple distributions, so process all of them.
-    pkg_to_dist = importlib_metadata.packages_distributions()
+    pkg_to_dist = _get_distribution_index().packages_distributions()
     dist_names = set(pkg_to_dist.get(package_name, []))
     for dist_name in dist_names:
         # Copy metadata
@@ -9,11 +9,15 @@
 # SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
 #-----------------------------------------------------------------------------
 
+import concurrent.futures
 import glob
+import hashlib
+import json
 import os
 import pathlib
 import re
 
+from PyInstaller import __version__
 from PyInstaller import compat
 from PyInstaller import isolated
 from PyInstaller import log as logging
@@ -23,6 +27,10 @@
 
 logger = logging.getLogger(__name__)
 
+# Name of the Qt plugin dependency graph snapshot in the `snapshots` cache of PyInstaller's cache directory (see
+# `PyInstaller.building.cache.SnapshotCache`).
+QT_PLUGIN_DEPENDENCIES_SNAPSHOT_NAME = 'qt-plugin-dependencies'
+
 # Qt deployment approach
 # ----------------------
 # This is the core of PyInstaller's approach to Qt deployment. It is based on:
@@ -144,6 +152,9 @@ def __init__(self, namespace):
             else:
                 self.qt_rel_dir = os.path.join('PySide6', 'Qt')
 
+        # Dependency graph of the Qt installation's plugin binaries; computed on first plugin validation.
+        self._plugin_dependencies = None
+
         # Process module information list to construct python-module-name -> info and shared-lib-name -> info mappings.
         self._load_module_info()
 
@@ -554,7 +565,9 @@ def _validate_plugin_dependencies(self, plugin_file):
         pulling in libraries from unrelated Qt installations that happen to be in search path).
         """
 
-        imported_libraries = bindepend.get_imports(plugin_file, search_paths=[self.qt_lib_dir])
+        imported_libraries = self._get_plugin_dependencies().get(str(pathlib.Path(plugin_file).resolve()))
+        if imported_libraries is None:
+            imported_libraries = bindepend.get_imports(plugin_file, search_paths=[self.qt_lib_dir])
         for imported_lib_name, imported_lib_path in imported_libraries:
             # Parse/normalize the (unresolved) library name, to determine if dependency is a Qt shared library. If not,
             # skip the validation.
@@ -575,6 +588,124 @@ def _validate_plugin_dependencies(self, plugin_file):
 
         return True, None
 
+    def _get_plugin_dependencies(self):
+        """
+        Return the dependency graph of the plugin binaries of the Qt installation (Qt plugins and QML plugins), as a
+        dictionary that maps the fully-resolved plugin file names to the lists of (name, fullpath) tuples obtained from
+        `bindepend.get_imports`. The graph is computed once, using a pool of worker threads, and is stored in the
+        `snapshots` cache of PyInstaller's cache directory, keyed by the fingerprint of the Qt installation; subsequent
+        builds thus only need to look up the plugins' dependencies.
+        """
+        if self._plugin_dependencies is not None:
+            return self._plugin_dependencies
+
+        plugin_files = []
+        for plugin_dir in (self.location.get('PluginsPath'), self._get_qml_dir()):
+            if plugin_dir and os.path.isdir(plugin_dir):
+                plugin_files += [str(pathlib.Path(filename).resolve()) for filename in misc.dlls_in_subdirs(plugin_dir)]
+        plugin_files = sorted(set(plugin_files))
+
+        fingerprint = self._get_plugin_dependencies_fingerprint(plugin_files)
+        dependencies = self._load_plugin_dependencies(fingerprint)
+        if dependencies is None:
+            logger.info("%s: analyzing dependencies of %d plugin binaries...", self, len(plugin_files))
+
+            def _get_imports(plugin_file):
+                try:
+                    return sorted(bindepend.get_imports(plugin_file, search_paths=[self.qt_lib_dir]), key=str)
+                except Exception:
+                    # Leave the plugin out of the graph; `_validate_plugin_dependencies` falls back to analyzing it
+                    # directly, and reports the error.
+                    logger.debug("%s: failed to analyze plugin binary %r!", self, plugin_file, exc_info=True)
+                    return None
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                dependencies = {
+                    plugin_file: imported_libraries
+                    for plugin_file, imported_libraries in zip(plugin_files, executor.map(_get_imports, plugin_files))
+                    if imported_libraries is not None
+                }
+            self._store_plugin_dependencies(fingerprint, dependencies)
+
+        self._plugin_dependencies = dependencies
+        return dependencies
+
+    def _get_plugin_dependencies_fingerprint(self, plugin_files):
+        """
+        Compute the fingerprint of the Qt installation for the plugin dependency graph: the Qt version and library
+        directory, the library search path, and the names, sizes, and modification times of the plugin binaries and of
+        the Qt shared libraries. Returns None if the graph cannot be cached (no cache directory configured).
+        """
+        from PyInstaller.config import CONF
+
+        if not CONF.get('cachedir'):
+            return None
+
+        fingerprint = hashlib.sha1()
+        fingerprint.update(
+            repr((
+                __version__,
+                self.namespace,
+                self.version,
+                str(self.qt_lib_dir),
+                os.environ.get('PATH'),
+                os.environ.get('LD_LIBRARY_PATH'),
+                os.environ.get('DYLD_LIBRARY_PATH'),
+            )).encode('utf-8')
+        )
+        qt_lib_files = sorted(glob.glob(os.path.join(self.qt_lib_dir, '*Qt*')))
+        for filename in plugin_files + qt_lib_files:
+            try:
+                file_stat = os.stat(filename)
+            except OSError:
+                continue
+            fingerprint.update(f"{filename}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n".encode('utf-8'))
+        return fingerprint.hexdigest()
+
+    def _load_plugin_dependencies(self, fingerprint):
+        """
+        Load the plugin dependency graph stored under the given fingerprint. Returns None if there is no such graph.
+        """
+        from PyInstaller.config import CONF
+        from PyInstaller.building import cache
+
+        if fingerprint is None:
+            return None
+
+        snapshot_cache = cache.SnapshotCache(CONF['cachedir'])
+        snapshot_file = snapshot_cache.lookup(
+            snapshot_cache.make_key(fingerprint, QT_PLUGIN_DEPENDENCIES_SNAPSHOT_NAME)
+        )
+        if snapshot_file is None:
+            return None
+
+        try:
+            with open(snapshot_file, encoding='utf-8') as fp:
+                dependencies = json.load(fp)
+        except Exception:
+            logger.warning("%s: failed to load plugin dependency graph %r!", self, snapshot_file, exc_info=True)
+            return None
+        return {
+            plugin_file: [tuple(imported_library) for imported_library in imported_libraries]
+            for plugin_file, imported_libraries in dependencies.items()
+        }
+
+    def _store_plugin_dependencies(self, fingerprint, dependencies):
+        """
+        Store the plugin dependency graph under the given fingerprint.
+        """
+        from PyInstaller.config import CONF
+        from PyInstaller.building import cache
+
+        if fingerprint is None:
+            return
+
+        snapshot_cache = cache.SnapshotCache(CONF['cachedir'])
+        snapshot_cache.store(
+            snapshot_cache.make_key(fingerprint, QT_PLUGIN_DEPENDENCIES_SNAPSHOT_NAME),
+            json.dumps(dependencies).encode('utf-8'),
+        )
+
     def _collect_all_or_none(self, mandatory_dll_patterns, optional_dll_patterns=None):
         """
         Try to find Qt DLLs from the specified mandatory pattern list. If all mandatory patterns resolve to DLLs,
@@ -913,15 +1044,11 @@ def _collect_qtnetwork_openssl_linux(self, openssl_version):
 
         return binaries
 
-    def collect_qtqml_files(self):
+    def _get_qml_dir(self):
         """
-        Collect additional binaries and data for QtQml module.
+        Return the QML imports directory from the Qt library information. The returned path might be empty, or the
+        directory might not exist.
         """
-
-        # No-op if requested Qt-based package is not available.
-        if self.version is None:
-            return [], []
-
         # Not all PyQt5/PySide2 installs have QML files. In this case, location['Qml2ImportsPath'] is empty.
         # Furthermore, even if location path is provided, the directory itself may not exist.
         #
@@ -931,9 +1058,19 @@ def collect_qtqml_files(self):
         # In Qt 6, Qml2ImportsPath was deprecated in favor of QmlImportsPath. The former is not available in PySide6
         # 6.4.0 anymore (but is in PyQt6 6.4.0). Use the new QmlImportsPath if available.
         if 'QmlImportsPath' in self.location:
-            qml_src_dir = self.location['QmlImportsPath']
-        else:
-            qml_src_dir = self.location['Qml2ImportsPath']
+            return self.location['QmlImportsPath']
+        return self.location.get('Qml2ImportsPath')
+
+    def collect_qtqml_files(self):
+        """
+        Collect additional binaries and data for QtQml module.
+        """
+
+        # No-op if requested Qt-based package is not available.
+        if self.version is None:
+            return [], []
+
+        qml_src_dir = self._get_qml_dir()
         if not qml_src_dir or not os.path.isdir(qml_src_dir):
             logger.warning('%s: QML directory %r does not exist. QML files not packaged.', self, qml_src_dir)
             return [], []
@@ -952,9 +1089,8 @@ def _compute_dest_dir(src_filename):
                 rel_path = src_filename.relative_to(qml_src_path).parent
             return qml_dest_path / rel_path
 
-        # Discover all QML plugin sub-directories by searching for `qmldir` files.
-        qmldir_files = qml_src_path.rglob('**/qmldir')
-        for qmldir_file in sorted(qmldir_files):
+        # Helper that processes the QML plugin directory of the given `qmldir` file.
+        def _process_plugin_dir(qmldir_file):
             plugin_dir = qmldir_file.parent
             logger.debug("%s: processing QML plugin directory %s", self, plugin_dir)
 
@@ -962,10 +1098,23 @@ def _compute_dest_dir(src_filename):
                 # Obtain lists of source files (separated into binaries and data files).
                 plugin_binaries, plugin_datas = self._process_qml_plugin(qmldir_file)
                 # Convert into (src, dest) tuples.
-                binaries += [(str(src_file), str(_compute_dest_dir(src_file))) for src_file in plugin_binaries]
-                datas += [(str(src_file), str(_compute_dest_dir(src_file))) for src_file in plugin_datas]
+                return (
+                    [(str(src_file), str(_compute_dest_dir(src_file))) for src_file in plugin_binaries],
+                    [(str(src_file), str(_compute_dest_dir(src_file))) for src_file in plugin_datas],
+                )
             except Exception:
                 logger.warning("%s: failed to process QML plugin directory %s", self, plugin_dir, exc_info=True)
+                return [], []
+
+        # Discover all QML plugin sub-directories by searching for `qmldir` files, and process them in a pool of worker
+        # threads. The plugin dependency graph is obtained up-front, so that the workers only need to look up the
+        # dependencies of the plugin binaries.
+        qmldir_files = sorted(qml_src_path.rglob('**/qmldir'))
+        self._get_plugin_dependencies()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            for plugin_binaries, plugin_datas in executor.map(_process_plugin_dir, qmldir_files):
+                binaries += plugin_binaries
+                datas += plugin_datas
 
         return binaries, datas
 
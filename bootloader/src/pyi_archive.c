@@ -20,6 +20,10 @@
 #include <stdlib.h>  /* malloc */
 #include <string.h>  /* strncmp, strcpy, strcat */
 #include <sys/stat.h>  /* fchmod */
+#if defined(__linux__)
+    #include <unistd.h>  /* dup, getpid, syscall */
+    #include <sys/syscall.h>  /* SYS_memfd_create */
+#endif
 
 /* PyInstaller headers. */
 #include "zlib.h"
@@ -341,6 +345,116 @@ pyi_archive_extract2fs(const struct ARCHIVE *archive, const struct TOC_ENTRY *to
 }
 
 
+#if defined(__linux__)
+
+#ifndef MFD_CLOEXEC
+    #define MFD_CLOEXEC 0x0001U
+#endif
+
+/*
+ * Create anonymous memory-backed file using memfd_create() system call.
+ * Invoked via syscall(), as the glibc wrapper is available only as of
+ * glibc 2.27.
+ */
+static int
+_pyi_archive_memfd_create(const char *name, unsigned int flags)
+{
+#if defined(SYS_memfd_create)
+    return (int)syscall(SYS_memfd_create, name, flags);
+#else
+    (void)name;
+    (void)flags;
+    return -1;
+#endif
+}
+
+/*
+ * Extract an archive entry into anonymous memory-backed file (memfd),
+ * and create a symbolic link to it under specified output filename.
+ *
+ * The symbolic link points to the file descriptor in /proc/<pid>/fd
+ * of the calling process (the onefile parent process), which keeps
+ * the file descriptor open until it exits. This allows the dynamic
+ * loader in the onefile child process (and its sub-processes that
+ * re-use the application's temporary directory) to resolve the
+ * libraries via the symbolic links, without the file descriptors
+ * having to be inherited.
+ *
+ * Returns 0 on success, and -1 on failure; in the latter case, no
+ * file is created, so the caller can fall back to regular extraction.
+ */
+int
+pyi_archive_extract2memfd(const struct ARCHIVE *archive, const struct TOC_ENTRY *toc_entry, const char *output_filename)
+{
+    FILE *archive_fp = NULL;
+    FILE *out_fp = NULL;
+    char link_target[PYI_PATH_MAX];
+    const char *memfd_name;
+    int memfd_fd;
+    int rc = -1;
+
+    /* Create the memory-backed file, named after the entry's basename;
+     * the descriptor must not leak into the child process. */
+    memfd_name = strrchr(toc_entry->name, PYI_SEP);
+    memfd_name = memfd_name ? memfd_name + 1 : toc_entry->name;
+    memfd_fd = _pyi_archive_memfd_create(memfd_name, MFD_CLOEXEC);
+    if (memfd_fd < 0) {
+        return -1;
+    }
+
+    /* Open the file stream on a duplicate of the descriptor, so that the
+     * original descriptor remains open after the stream is closed. */
+    out_fp = fdopen(dup(memfd_fd), "wb");
+    if (out_fp == NULL) {
+        goto cleanup;
+    }
+
+    /* Open archive (source) file and seek to the beginning of entry's data */
+    archive_fp = pyi_path_fopen(archive->filename, "rb");
+    if (archive_fp == NULL) {
+        goto cleanup;
+    }
+    if (pyi_fseek(archive_fp, archive->pkg_offset + toc_entry->offset, SEEK_SET) < 0) {
+        goto cleanup;
+    }
+
+    /* Extract */
+    if (toc_entry->compression_flag == 1) {
+        rc = _pyi_archive_extract_compressed(archive_fp, toc_entry, out_fp, NULL);
+    } else {
+        rc = _pyi_archive_extract2fs_uncompressed(archive_fp, toc_entry, out_fp);
+    }
+    if (rc != 0) {
+        goto cleanup;
+    }
+    fchmod(memfd_fd, S_IRUSR | S_IWUSR | S_IXUSR);
+
+    /* Create the symbolic link */
+    if (snprintf(link_target, PYI_PATH_MAX, "/proc/%d/fd/%d", (int)getpid(), memfd_fd) >= PYI_PATH_MAX) {
+        rc = -1;
+        goto cleanup;
+    }
+    rc = pyi_path_mksymlink(link_target, output_filename);
+
+cleanup:
+    if (archive_fp) {
+        fclose(archive_fp);
+    }
+    if (out_fp) {
+        fclose(out_fp);
+    }
+    /* On success, the descriptor is intentionally kept open until the
+     * process exits. */
+    if (rc != 0) {
+        close(memfd_fd);
+    }
+
+    return rc;
+}
+
+#endif /* defined(__linux__) */
+
+
 /*
  * Perform full back-to-front scan of the file to search for the
  * MAGIC pattern of the embedded archive's COOKIE header.
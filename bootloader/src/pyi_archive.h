@@ -92,6 +92,9 @@ const struct TOC_ENTRY *pyi_archive_next_toc_entry(const struct ARCHIVE *archive
 
 unsigned char *pyi_archive_extract(const struct ARCHIVE *archive, const struct TOC_ENTRY *toc_entry);
 int pyi_archive_extract2fs(const struct ARCHIVE *archive, const struct TOC_ENTRY *toc_entry, const char *output_filename);
+#if defined(__linux__)
+int pyi_archive_extract2memfd(const struct ARCHIVE *archive, const struct TOC_ENTRY *toc_entry, const char *output_filename);
+#endif
 
 const struct TOC_ENTRY *pyi_archive_find_entry_by_name(const struct ARCHIVE *archive, const char *name);
 
@@ -144,6 +144,18 @@ pyi_launch_extract_files_from_archive(struct PYI_CONTEXT *pyi_ctx)
                 output_filename
             );
         } else {
+#if defined(__linux__)
+            /* Try extracting binaries into memory-backed files first; if
+             * that fails (e.g., memfd_create() is not supported by the
+             * kernel, or the limit on open file descriptors is reached),
+             * fall back to extraction on the disk. */
+            if (pyi_ctx->memfd_binaries && toc_entry->typecode == ARCHIVE_ITEM_BINARY) {
+                if (pyi_archive_extract2memfd(archive, toc_entry, output_filename) == 0) {
+                    continue;
+                }
+                PYI_DEBUG("LOADER: failed to extract %s into memory-backed file; extracting it to disk.\n", toc_entry->name);
+            }
+#endif
             retcode = pyi_archive_extract2fs(archive, toc_entry, output_filename);
         }
 
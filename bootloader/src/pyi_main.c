@@ -558,6 +558,17 @@ _pyi_main_read_runtime_options(struct PYI_CONTEXT *pyi_ctx)
             continue;
         }
 #endif
+
+        /* pyi-memfd-binaries
+         *
+         * Extract binaries of onefile application into anonymous
+         * memory-backed files (Linux only) */
+#if defined(__linux__)
+        if (strncmp(toc_entry->name, "pyi-memfd-binaries", 18) == 0) {
+            pyi_ctx->memfd_binaries = 1;
+            continue;
+        }
+#endif
     }
 }
 
@@ -288,6 +288,14 @@ struct PYI_CONTEXT
     unsigned char ignore_signals;
 #endif
 
+    /* Extract binaries of a onefile application into anonymous
+     * memory-backed files (Linux only), and create symbolic links to
+     * them in the temporary directory, instead of writing them to the
+     * disk. Data files are still extracted to the disk. */
+#if defined(__linux__)
+    unsigned char memfd_binaries;
+#endif
+
     /**
      * Flag indicating that colleted python shared library was built
      * with --disable-gil / Py_GIL_DISABLED. Used to select correct
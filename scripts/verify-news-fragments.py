@@ -32,7 +32,8 @@
     'deprecation'
 }
 
-NEWS_PATTERN = re.compile(r"(\d+)\.(\w+)\.(?:(\d+)\.)?rst")
+# Fragments of changes without a pull request use towncrier's orphan prefix (`+`) and a descriptive name instead.
+NEWS_PATTERN = re.compile(r"(\d+|\+[\w-]+)\.(\w+)\.(?:(\d+)\.)?rst")
 
 NEWS_DIR = Path(__file__).absolute().parent.parent / "news"
 
@@ -49,8 +50,8 @@ def validate_name(name):
     match = NEWS_PATTERN.fullmatch(Path(name).name)
     if match is None:
         raise SystemExit(
-            f"'{name}' does not match the '(pr-number).(type).rst' or '(pr-number).(type).(enumeration).rst' changelog "
-            f"entries formats. See:\n{CHANGELOG_GUIDE}"
+            f"'{name}' does not match the '(pr-number).(type).rst', '(pr-number).(type).(enumeration).rst', or "
+            f"'+(name).(type).rst' changelog entries formats. See:\n{CHANGELOG_GUIDE}"
         )
 
     if match.group(2) not in CHANGE_TYPES:
@@ -0,0 +1,401 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Benchmark definitions.
+
+Each benchmark is a subclass of `Benchmark`. Its `setup()` is called once, and its `run()` once per repetition; each
+call is made in a fresh worker process (see `run_benchmarks.py`), so that the measurements are not affected by state
+left behind in the process (for example, the module graph cached by `initialize_modgraph()`). PyInstaller's cache
+directory is private to each benchmark.
+"""
+
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+import time
+
+BENCHMARKS = {}
+
+
+def register(cls):
+    BENCHMARKS[cls.name] = cls
+    return cls
+
+
+class Benchmark:
+    # Name of the benchmark.
+    name = None
+    # Default number of repetitions.
+    repeat = 5
+    # Names of the fixtures (see `run_benchmarks.FIXTURES`) used by the benchmark.
+    fixtures = ()
+
+    def __init__(self, workdir, fixtures_dir):
+        self.workdir = workdir
+        self.fixtures_dir = fixtures_dir
+
+    def fixture(self, name):
+        return os.path.join(self.fixtures_dir, name)
+
+    def setup(self):
+        """
+        Prepare the benchmark (not measured).
+        """
+
+    def run(self):
+        """
+        Perform the measured operation, and return a dictionary with its duration in seconds (`time`), and optionally
+        further (informational) figures.
+        """
+        raise NotImplementedError
+
+
+def _run_pyinstaller(*args):
+    import PyInstaller.__main__
+    PyInstaller.__main__.run(['--noconfirm', '--log-level', 'WARN', *args])
+
+
+def _write_app_script(filename, packages=()):
+    with open(filename, 'w', encoding='utf-8') as fp:
+        fp.write(''.join(f'import {package}\n' for package in packages))
+        fp.write("print('Hello from benchmark application!')\n")
+
+
+class _AnalysisBenchmark(Benchmark):
+    fixtures = ('packages',)
+
+    def setup(self):
+        packages_dir = self.fixture('packages')
+        packages = sorted(name for name in os.listdir(packages_dir) if not name.startswith('.'))
+        _write_app_script(os.path.join(self.workdir, 'app.py'), packages)
+        spec_file = os.path.join(self.workdir, 'app.spec')
+        with open(spec_file, 'w', encoding='utf-8') as fp:
+            fp.write(f"a = Analysis([{os.path.join(self.workdir, 'app.py')!r}], pathex=[{packages_dir!r}])\n")
+        # Populate the cache (in particular, the base module graph snapshot).
+        _run_pyinstaller('--workpath', os.path.join(self.workdir, 'build-warmup'), spec_file)
+
+    def _run_analysis(self):
+        workpath = os.path.join(self.workdir, 'build')
+        shutil.rmtree(workpath, ignore_errors=True)
+        start = time.perf_counter()
+        _run_pyinstaller('--workpath', workpath, os.path.join(self.workdir, 'app.spec'))
+        return time.perf_counter() - start
+
+
+@register
+class AnalysisBenchmark(_AnalysisBenchmark):
+    """
+    Analysis of a synthetic tree of packages, with the cache directory holding only the state that does not depend on
+    the analyzed application (the base module graph snapshot).
+    """
+    name = 'analysis'
+    repeat = 3
+
+    def setup(self):
+        super().setup()
+        # Keep a copy of the cache directory with only the snapshots, to restore before each repetition.
+        cachedir = self._cachedir()
+        shutil.rmtree(cachedir + '-pristine', ignore_errors=True)
+        os.makedirs(cachedir + '-pristine')
+        if os.path.isdir(os.path.join(cachedir, 'snapshots')):
+            shutil.copytree(os.path.join(cachedir, 'snapshots'), os.path.join(cachedir + '-pristine', 'snapshots'))
+
+    def _cachedir(self):
+        from PyInstaller import configure
+        return configure._get_pyinstaller_cache_dir()
+
+    def run(self):
+        cachedir = self._cachedir()
+        shutil.rmtree(cachedir)
+        shutil.copytree(cachedir + '-pristine', cachedir)
+        return {'time': self._run_analysis()}
+
+
+@register
+class CachedAnalysisBenchmark(_AnalysisBenchmark):
+    """
+    Re-analysis of a synthetic tree of packages (e.g., after a change of the spec file), with a warm cache directory.
+    """
+    name = 'analysis_cached'
+    repeat = 3
+
+    def run(self):
+        return {'time': self._run_analysis()}
+
+
+@register
+class ModuleGraphScanBenchmark(Benchmark):
+    """
+    Import scanning throughput of the bare `ModuleGraph` (without PyInstaller's hooks), on the synthetic package tree
+    only (the standard library modules are not on the search path).
+    """
+    name = 'modulegraph_scan'
+    fixtures = ('packages',)
+
+    def setup(self):
+        packages = sorted(name for name in os.listdir(self.fixture('packages')) if not name.startswith('.'))
+        _write_app_script(os.path.join(self.workdir, 'app.py'), packages)
+
+    def run(self):
+        from PyInstaller.lib.modulegraph.modulegraph import ModuleGraph
+
+        start = time.perf_counter()
+        graph = ModuleGraph(path=[self.fixture('packages')])
+        graph.add_script(os.path.join(self.workdir, 'app.py'))
+        duration = time.perf_counter() - start
+        num_modules = sum(1 for node in graph.iter_graph() if getattr(node, 'filename', None))
+        return {'time': duration, 'modules': num_modules, 'modules_per_second': num_modules / duration}
+
+
+@register
+class BinaryDependencyAnalysisBenchmark(Benchmark):
+    """
+    Binary dependency analysis of a farm of shared libraries.
+    """
+    name = 'bindepend'
+    fixtures = ('libraries',)
+
+    def run(self):
+        from PyInstaller.depend import bindepend
+
+        libraries_dir = self.fixture('libraries')
+        binaries = [(name, os.path.join(libraries_dir, name), 'BINARY') for name in sorted(os.listdir(libraries_dir))]
+        start = time.perf_counter()
+        bindepend.binary_dependency_analysis(binaries)
+        return {'time': time.perf_counter() - start, 'binaries': len(binaries)}
+
+
+@register
+class PYZWriteBenchmark(Benchmark):
+    """
+    Writing of a PYZ archive with the synthetic package tree.
+    """
+    name = 'pyz_write'
+    fixtures = ('packages',)
+
+    def run(self):
+        from PyInstaller.archive.writers import ZlibArchiveWriter
+
+        packages_dir = self.fixture('packages')
+        entries = []
+        code_dict = {}
+        for filename in sorted(glob.glob(os.path.join(packages_dir, '**', '*.py'), recursive=True)):
+            name = os.path.splitext(os.path.relpath(filename, packages_dir))[0].replace(os.sep, '.')
+            if name.endswith('.__init__'):
+                name = name[:-len('.__init__')]
+            with open(filename, 'rb') as fp:
+                code_dict[name] = compile(fp.read(), filename, 'exec')
+            entries.append((name, filename, 'PYMODULE'))
+
+        start = time.perf_counter()
+        ZlibArchiveWriter(os.path.join(self.workdir, 'archive.pyz'), entries, code_dict=code_dict)
+        return {'time': time.perf_counter() - start, 'entries': len(entries)}
+
+
+@register
+class PKGWriteBenchmark(Benchmark):
+    """
+    Writing of a compressed PKG (CArchive) with the synthetic data files.
+    """
+    name = 'pkg_write'
+    fixtures = ('data',)
+
+    def run(self):
+        from PyInstaller.archive.writers import CArchiveWriter
+
+        data_dir = self.fixture('data')
+        entries = []
+        for filename in sorted(glob.glob(os.path.join(data_dir, '**', '*.dat'), recursive=True)):
+            entries.append((os.path.relpath(filename, data_dir), filename, True, 'x'))
+        total_size = sum(os.path.getsize(src_name) for _, src_name, _, _ in entries)
+
+        start = time.perf_counter()
+        CArchiveWriter(os.path.join(self.workdir, 'archive.pkg'), entries, 'libpython3.so')
+        duration = time.perf_counter() - start
+        return {'time': duration, 'bytes_per_second': total_size / duration}
+
+
+@register
+class CollectBenchmark(Benchmark):
+    """
+    Assembly of an onedir application with the synthetic data files (the COLLECT step; the preceding steps are
+    up-to-date).
+    """
+    name = 'collect'
+    fixtures = ('data',)
+
+    def setup(self):
+        _write_app_script(os.path.join(self.workdir, 'app.py'))
+        spec_file = os.path.join(self.workdir, 'app.spec')
+        with open(spec_file, 'w', encoding='utf-8') as fp:
+            fp.write(
+                textwrap.dedent(
+                    f"""
+                    a = Analysis([{os.path.join(self.workdir, 'app.py')!r}], datas=[({self.fixture('data')!r}, 'data')])
+                    pyz = PYZ(a.pure)
+                    exe = EXE(pyz, a.scripts, [], exclude_binaries=True, name='app')
+                    coll = COLLECT(exe, a.binaries, a.datas, name='app')
+                    """
+                )
+            )
+        self._build()
+
+    def _build(self):
+        distpath = os.path.join(self.workdir, 'dist')
+        shutil.rmtree(distpath, ignore_errors=True)
+        start = time.perf_counter()
+        _run_pyinstaller(
+            '--workpath',
+            os.path.join(self.workdir, 'build'),
+            '--distpath',
+            distpath,
+            os.path.join(self.workdir, 'app.spec'),
+        )
+        return time.perf_counter() - start
+
+    def run(self):
+        return {'time': self._build()}
+
+
+class _StartupBenchmark(Benchmark):
+    # Number of program launches per repetition.
+    launches = 5
+    mode = None
+
+    def setup(self):
+        script = os.path.join(self.workdir, 'app.py')
+        with open(script, 'w', encoding='utf-8') as fp:
+            fp.write("import json, email.message, decimal, xml.etree.ElementTree\n")
+        _run_pyinstaller(
+            f'--{self.mode}',
+            '--workpath',
+            os.path.join(self.workdir, 'build'),
+            '--distpath',
+            os.path.join(self.workdir, 'dist'),
+            '--specpath',
+            self.workdir,
+            script,
+        )
+
+    def run(self):
+        if self.mode == 'onedir':
+            executable = os.path.join(self.workdir, 'dist', 'app', 'app')
+        else:
+            executable = os.path.join(self.workdir, 'dist', 'app')
+        if sys.platform == 'win32':
+            executable += '.exe'
+        start = time.perf_counter()
+        for _ in range(self.launches):
+            subprocess.run([executable], check=True)
+        return {'time': (time.perf_counter() - start) / self.launches}
+
+
+@register
+class OnedirStartupBenchmark(_StartupBenchmark):
+    """
+    Start-up time of an onedir application.
+    """
+    name = 'startup_onedir'
+    mode = 'onedir'
+
+
+@register
+class OnefileStartupBenchmark(_StartupBenchmark):
+    """
+    Start-up time of an onefile application (including the extraction of its contents).
+    """
+    name = 'startup_onefile'
+    mode = 'onefile'
+
+
+class _PoolStartupBenchmark(Benchmark):
+    # Number of worker processes in the pool.
+    workers = 16
+    start_method = None
+
+    def setup(self):
+        # The tasks are defined in a module with heavy-weight imports; the main script calls `freeze_support()` before
+        # importing it, so that the fork server (if used) imports it only via the preload list.
+        with open(os.path.join(self.workdir, 'tasks.py'), 'w', encoding='utf-8') as fp:
+            fp.write("import json, email.message, decimal, xml.etree.ElementTree\n\n\ndef task(x):\n    return x\n")
+        script = os.path.join(self.workdir, 'app.py')
+        with open(script, 'w', encoding='utf-8') as fp:
+            fp.write(
+                textwrap.dedent(
+                    """
+                    import multiprocessing
+                    import sys
+                    import time
+
+                    if __name__ == '__main__':
+                        multiprocessing.freeze_support()
+
+                    import tasks
+
+                    if __name__ == '__main__':
+                        start_method, workers = sys.argv[1], int(sys.argv[2])
+                        multiprocessing.set_start_method(start_method)
+                        if start_method == 'forkserver':
+                            multiprocessing.set_forkserver_preload(['tasks'])
+                        start = time.perf_counter()
+                        with multiprocessing.Pool(workers) as pool:
+                            pool.map(tasks.task, range(workers), chunksize=1)
+                        print(time.perf_counter() - start)
+                    """
+                )
+            )
+        _run_pyinstaller(
+            '--onedir',
+            '--workpath',
+            os.path.join(self.workdir, 'build'),
+            '--distpath',
+            os.path.join(self.workdir, 'dist'),
+            '--specpath',
+            self.workdir,
+            '--paths',
+            self.workdir,
+            script,
+        )
+
+    def run(self):
+        executable = os.path.join(self.workdir, 'dist', 'app', 'app')
+        if sys.platform == 'win32':
+            executable += '.exe'
+        process = subprocess.run([executable, self.start_method, str(self.workers)],
+                                 check=True,
+                                 stdout=subprocess.PIPE,
+                                 text=True)
+        return {'time': float(process.stdout.split()[-1]), 'workers': self.workers}
+
+
+@register
+class SpawnPoolStartupBenchmark(_PoolStartupBenchmark):
+    """
+    Start-up of a `multiprocessing` pool in an onedir application, with the `spawn` start method (each worker runs the
+    frozen application and imports the task module).
+    """
+    name = 'pool_spawn'
+    start_method = 'spawn'
+
+
+if sys.platform != 'win32':
+
+    @register
+    class ForkserverPoolStartupBenchmark(_PoolStartupBenchmark):
+        """
+        Start-up of a `multiprocessing` pool in an onedir application, with the `forkserver` start method and the task
+        module preloaded in the fork server.
+        """
+        name = 'pool_forkserver'
+        start_method = 'forkserver'
@@ -0,0 +1,140 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Generators for the benchmark fixtures. All fixtures are generated deterministically (from a fixed random seed) and
+locally, without network access; their sizes are proportional to the `scale` factor.
+"""
+
+import glob
+import os
+import random
+import shutil
+import sys
+import sysconfig
+
+_SEED = 20240101
+
+
+def _scaled(value, scale):
+    return max(1, int(round(value * scale)))
+
+
+def generate_package_tree(path, scale=1.0):
+    """
+    Generate a tree of synthetic packages in the given directory. Each package consists of sub-packages with modules
+    that import their siblings, the parent package, and a handful of standard library modules. Returns the list of the
+    top-level package names.
+    """
+    rng = random.Random(_SEED)
+    num_packages = _scaled(10, scale)
+    num_subpackages = _scaled(5, scale)
+    num_modules = 20
+
+    stdlib_modules = ['os', 'sys', 're', 'json', 'collections', 'functools', 'itertools', 'dataclasses']
+    packages = []
+    for i in range(num_packages):
+        package = f'benchpkg{i:03d}'
+        packages.append(package)
+        subpackages = [f'sub{j:02d}' for j in range(num_subpackages)]
+        _write(os.path.join(path, package, '__init__.py'), ''.join(f'from . import {sub}\n' for sub in subpackages))
+        for sub in subpackages:
+            modules = [f'mod{k:02d}' for k in range(num_modules)]
+            _write(
+                os.path.join(path, package, sub, '__init__.py'),
+                ''.join(f'from . import {module}\n' for module in modules),
+            )
+            for k, module in enumerate(modules):
+                lines = [f'"""Synthetic module {package}.{sub}.{module}."""']
+                lines += [f'import {name}' for name in rng.sample(stdlib_modules, 2)]
+                lines += [f'from . import {sibling}' for sibling in rng.sample(modules[:k], min(k, 3))]
+                lines += [f'from .. import {rng.choice(subpackages)} as _parent_{n}' for n in range(2)]
+                lines.append('')
+                for n in range(10):
+                    lines += [
+                        f'class Class{n}:',
+                        f'    attribute = {rng.randint(0, 1000)!r}',
+                        '',
+                        '    def method(self, value):',
+                        f'        return [value * {n} for _ in range({rng.randint(1, 10)})]',
+                        '',
+                        f'def function{n}(argument, *args, **kwargs):',
+                        f'    if argument > {rng.randint(0, 100)}:',
+                        f'        return {{"key{n}": argument, "args": args, **kwargs}}',
+                        f'    return Class{n}().method(argument)',
+                        '',
+                    ]
+                _write(os.path.join(path, package, sub, f'{module}.py'), '\n'.join(lines))
+    return packages
+
+
+def generate_data_tree(path, scale=1.0):
+    """
+    Generate a tree of data files in the given directory: a mix of small and large files, with compressible and
+    incompressible contents. Returns the total size of the files.
+    """
+    rng = random.Random(_SEED)
+    words = [bytes(rng.choice(b'abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 10))) for _ in range(500)]
+    total_size = 0
+    for i in range(_scaled(400, scale)):
+        if i % 10 == 0:
+            size = rng.randint(256 * 1024, 1024 * 1024)  # Large file.
+        else:
+            size = rng.randint(1024, 32 * 1024)  # Small file.
+        if i % 3 == 0:
+            data = rng.getrandbits(size * 8).to_bytes(size, 'little')  # Incompressible.
+        else:
+            data = b' '.join(rng.choice(words) for _ in range(size // 6 + 1))[:size]  # Compressible.
+        _write(os.path.join(path, f'dir{i % 20:02d}', f'file{i:04d}.dat'), data)
+        total_size += size
+    return total_size
+
+
+def generate_library_farm(path, scale=1.0):
+    """
+    Populate the given directory with copies of the shared libraries and extension modules of the running python
+    interpreter. Returns the list of the library file names.
+    """
+    candidates = []
+    libdir = sysconfig.get_config_var('LIBDIR')
+    ldlibrary = sysconfig.get_config_var('LDLIBRARY')
+    if libdir and ldlibrary and os.path.isfile(os.path.join(libdir, ldlibrary)):
+        candidates.append(os.path.join(libdir, ldlibrary))
+    dynload_dir = sysconfig.get_path('platstdlib')
+    for pattern in ('lib-dynload/*.so', 'lib-dynload/*.dylib', '../DLLs/*.pyd', '../DLLs/*.dll'):
+        candidates += sorted(glob.glob(os.path.join(dynload_dir, pattern)))
+    if not candidates:
+        # Fall back to the extension modules among the loaded modules.
+        candidates = sorted({
+            module.__file__
+            for module in list(sys.modules.values())
+            if getattr(module, '__file__', None) and module.__file__.endswith(('.so', '.pyd'))
+        })
+
+    os.makedirs(path, exist_ok=True)
+    filenames = []
+    num_copies = _scaled(2, scale)
+    for copy in range(num_copies):
+        for src in candidates:
+            name, ext = os.path.splitext(os.path.basename(src))
+            filename = f'{name}-{copy}{ext}' if copy else os.path.basename(src)
+            shutil.copy2(src, os.path.join(path, filename))
+            filenames.append(filename)
+    return filenames
+
+
+def _write(filename, content):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    if isinstance(content, bytes):
+        with open(filename, 'wb') as fp:
+            fp.write(content)
+    else:
+        with open(filename, 'w', encoding='utf-8') as fp:
+            fp.write(content)
@@ -0,0 +1,263 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+"""
+Run PyInstaller's performance benchmarks, optionally store the results in JSON format and compare them against stored
+baseline results. Exits with status 1 if a benchmark regressed by more than the given threshold.
+
+The fixtures are generated in the work directory (a temporary directory by default); each setup and each repetition of a
+benchmark runs in a separate worker process.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _HERE)
+
+import fixtures  # noqa: E402
+from benchmarks import BENCHMARKS  # noqa: E402
+
+FIXTURES = {
+    'packages': fixtures.generate_package_tree,
+    'data': fixtures.generate_data_tree,
+    'libraries': fixtures.generate_library_farm,
+}
+
+RESULTS_FORMAT_VERSION = 1
+
+
+def _worker(args):
+    # Each benchmark uses a private PyInstaller cache directory; this must be set before PyInstaller is imported.
+    os.environ['PYINSTALLER_CONFIG_DIR'] = os.path.join(args.workdir, 'config')
+    benchmark = BENCHMARKS[args.worker](args.workdir, args.fixtures_dir)
+    os.chdir(args.workdir)
+    if args.setup:
+        benchmark.setup()
+        result = {}
+    else:
+        result = benchmark.run()
+    with open(args.result_file, 'w', encoding='utf-8') as fp:
+        json.dump(result, fp)
+
+
+def _run_worker(name, workdir, fixtures_dir, source_dir, setup=False):
+    result_file = os.path.join(workdir, 'result.json')
+    cmd = [
+        sys.executable,
+        os.path.abspath(__file__),
+        '--worker',
+        name,
+        '--workdir',
+        workdir,
+        '--fixtures-dir',
+        fixtures_dir,
+        '--result-file',
+        result_file,
+    ]
+    if setup:
+        cmd.append('--setup')
+    env = dict(os.environ)
+    env.pop('PYINSTALLER_CONFIG_DIR', None)
+    if source_dir:
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [source_dir, env.get('PYTHONPATH')]))
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL if not setup else None)
+    with open(result_file, encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def _pyinstaller_version(source_dir):
+    env = dict(os.environ)
+    if source_dir:
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [source_dir, env.get('PYTHONPATH')]))
+    return subprocess.run(
+        [sys.executable, '-c', 'import PyInstaller; print(PyInstaller.__version__)'],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+    ).stdout.strip()
+
+
+def _run_benchmarks(args, names):
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'metadata': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'pyinstaller': _pyinstaller_version(args.source),
+            'python': sys.version,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'scale': args.scale,
+        },
+        'benchmarks': {},
+    }
+
+    fixtures_dir = os.path.join(args.workdir, 'fixtures')
+    for fixture_name in sorted({fixture for name in names for fixture in BENCHMARKS[name].fixtures}):
+        path = os.path.join(fixtures_dir, fixture_name)
+        if not os.path.isdir(path):
+            print(f"Generating fixture {fixture_name}...", file=sys.stderr)
+            FIXTURES[fixture_name](path, scale=args.scale)
+
+    for name in names:
+        benchmark = BENCHMARKS[name]
+        workdir = os.path.join(args.workdir, name)
+        shutil.rmtree(workdir, ignore_errors=True)
+        os.makedirs(workdir)
+
+        print(f"Running benchmark {name}...", file=sys.stderr)
+        _run_worker(name, workdir, fixtures_dir, args.source, setup=True)
+        runs = []
+        for _ in range(args.repeat or benchmark.repeat):
+            runs.append(_run_worker(name, workdir, fixtures_dir, args.source))
+        times = [run['time'] for run in runs]
+        fastest_run = min(runs, key=lambda run: run['time'])
+        results['benchmarks'][name] = {
+            'min': min(times),
+            'median': statistics.median(times),
+            'mean': statistics.mean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'times': times,
+            # Informational figures from the fastest run.
+            'info': {key: value
+                     for key, value in fastest_run.items() if key != 'time'},
+        }
+    return results
+
+
+def _print_results(results, baseline=None):
+    print(f"{'Benchmark':<20} {'Median':>10} {'Min':>10} {'Stdev':>10} {'Baseline':>10} {'Ratio':>7}")
+    for name, result in results['benchmarks'].items():
+        line = f"{name:<20} {result['median']:>9.3f}s {result['min']:>9.3f}s {result['stdev']:>9.3f}s"
+        if baseline and name in baseline['benchmarks']:
+            baseline_median = baseline['benchmarks'][name]['median']
+            line += f" {baseline_median:>9.3f}s {result['median'] / baseline_median:>7.2f}"
+        print(line)
+
+
+def compare_results(results, baseline, threshold):
+    """
+    Compare the median times of the benchmarks present in both results, and return the list of (name, ratio) of the
+    benchmarks that are slower than the baseline by more than the given factor.
+    """
+    regressions = []
+    for name, result in results['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        ratio = result['median'] / baseline['benchmarks'][name]['median']
+        if ratio > threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        'names',
+        nargs='*',
+        metavar='benchmark',
+        help="Names of the benchmarks to run (default: all).",
+    )
+    parser.add_argument('--list', action='store_true', help="List the available benchmarks and exit.")
+    parser.add_argument('--repeat', type=int, default=None, help="Number of repetitions of each benchmark.")
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=1.0,
+        help="Scale factor for the sizes of the generated fixtures (default: %(default)s).",
+    )
+    parser.add_argument('--workdir', default=None, help="Work directory (default: a temporary directory).")
+    parser.add_argument(
+        '--source',
+        default=None,
+        help="Benchmark the PyInstaller source tree in the given directory, instead of the importable PyInstaller.",
+    )
+    parser.add_argument('--json', default=None, metavar='FILE', help="Store the results in the given JSON file.")
+    parser.add_argument(
+        '--compare',
+        default=None,
+        metavar='FILE',
+        help="Compare the results against the baseline results stored in the given JSON file.",
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=1.25,
+        help="Maximal allowed ratio of the median time to the baseline median time (default: %(default)s).",
+    )
+    # Internal options, used for running the worker processes.
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--setup', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--fixtures-dir', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args)
+        return
+
+    if args.list:
+        for name, benchmark in BENCHMARKS.items():
+            print(f"{name:<20} {' '.join(benchmark.__doc__.split())}")
+        return
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fp:
+            baseline = json.load(fp)
+        if baseline.get('format_version') != RESULTS_FORMAT_VERSION:
+            parser.error(f"{args.compare} has an incompatible format.")
+        if baseline['metadata']['scale'] != args.scale:
+            parser.error(f"{args.compare} was created with --scale={baseline['metadata']['scale']}.")
+    if args.source:
+        args.source = os.path.abspath(args.source)
+
+    if args.workdir:
+        args.workdir = os.path.abspath(args.workdir)
+        os.makedirs(args.workdir, exist_ok=True)
+        results = _run_benchmarks(args, names)
+    else:
+        with tempfile.TemporaryDirectory(prefix='pyi-benchmarks-') as workdir:
+            args.workdir = workdir
+            start = time.perf_counter()
+            results = _run_benchmarks(args, names)
+            print(f"Benchmarks finished in {time.perf_counter() - start:.1f}s.", file=sys.stderr)
+
+    _print_results(results, baseline)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fp:
+            json.dump(results, fp, indent=1)
+
+    if baseline:
+        regressions = compare_results(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION: {name} is {ratio:.2f}x slower than the baseline (threshold {args.threshold:.2f}x).")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    run()
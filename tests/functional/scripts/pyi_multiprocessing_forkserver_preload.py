@@ -0,0 +1,43 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+import os
+import sys
+import multiprocessing
+
+PRELOADED_MODULE = 'xml.dom.minidom'
+
+
+def _collect_preloaded_module():
+    # Never called; ensures that the preloaded module is collected into the frozen application.
+    import xml.dom.minidom  # noqa: F401
+
+
+def get_worker_state(x):
+    return os.getppid(), PRELOADED_MODULE in sys.modules
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+
+    multiprocessing.set_start_method('forkserver')
+    multiprocessing.set_forkserver_preload([PRELOADED_MODULE])
+    assert PRELOADED_MODULE not in sys.modules
+
+    with multiprocessing.Pool(processes=4) as pool:
+        results = pool.map(get_worker_state, range(8))
+
+    # The workers are forked from the fork server (which is a child of this process, and not its parent), after it
+    # imported the preloaded module.
+    for parent_pid, module_imported in results:
+        assert parent_pid != os.getpid(), "Worker process was not started by the fork server!"
+        assert module_imported, "Preloaded module was not imported in the worker process!"
+    assert PRELOADED_MODULE not in sys.modules
@@ -0,0 +1,63 @@
+# -*- mode: python -*-
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+
+# MULTIPROCESS FEATURE: file A (onefile pack) depends on file B (onefile pack); the python modules used by both are
+# stored in a shared PYZ archive.
+import os
+
+SCRIPT_DIR = 'multipackage-scripts'
+__testname__ = 'test_multipackage6'
+__testdep__ = 'multipackage6_B'
+
+a = Analysis([os.path.join(SCRIPT_DIR, __testname__ + '.py')],
+             hookspath=[os.path.join(SPECPATH, SCRIPT_DIR, 'extra-hooks')],
+             pathex=['.'])
+b = Analysis([os.path.join(SCRIPT_DIR, __testdep__ + '.py')],
+             hookspath=[os.path.join(SPECPATH, SCRIPT_DIR, 'extra-hooks')],
+             pathex=['.'])
+
+merge = MERGE((b, __testdep__, __testdep__), (a, __testname__, __testname__), shared_pyz=True)
+
+# The shared modules are replaced by references to the shared PYZ; the first executable collects the shared PYZ, and
+# the second one references it.
+shared_pyz_name = os.path.basename(merge.shared_pyz.name)
+for analysis in (a, b):
+    assert ('multipackage_test_pkg', merge.shared_pyz.name, 'PYZ-SHARED') in analysis.pure
+assert (shared_pyz_name, merge.shared_pyz.name, 'DATA') in b.datas
+assert (shared_pyz_name, __testdep__, 'DEPENDENCY') in a.dependencies
+
+pyz = PYZ(a.pure)
+exe = EXE(pyz,
+          a.scripts,
+          a.binaries,
+          a.zipfiles,
+          a.datas,
+          a.dependencies,
+          name=os.path.join('dist', __testname__),
+          debug=True,
+          strip=False,
+          upx=False,
+          console=1 )
+
+pyzB = PYZ(b.pure)
+exeB = EXE(pyzB,
+          b.scripts,
+          b.binaries,
+          b.zipfiles,
+          b.datas,
+          b.dependencies,
+          name=os.path.join('dist', __testdep__),
+          debug=True,
+          strip=False,
+          upx=False,
+          console=1 )
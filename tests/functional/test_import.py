@@ -740,6 +740,43 @@ def test_package_with_mixed_collection_mode(pyi_builder):
     )
 
 
+# Test deferred execution of modules matching `lazy_modules` patterns, and eager execution of modules that match
+# `lazy_modules_exclude` patterns.
+def test_lazy_modules(pyi_builder, monkeypatch):
+    # Override Analysis so that we can set lazy modules without having to use .spec file.
+    def AnalysisOverride(*args, **kwargs):
+        kwargs['lazy_modules'] = ['pyi_testmod_lazy', 'pyi_testmod_lazy.*']
+        kwargs['lazy_modules_exclude'] = ['pyi_testmod_lazy.sideeffect']
+        return Analysis(*args, **kwargs)
+
+    import PyInstaller.building.build_main
+    Analysis = PyInstaller.building.build_main.Analysis
+    monkeypatch.setattr('PyInstaller.building.build_main.Analysis', AnalysisOverride)
+
+    pyi_builder.test_source(
+        """
+        import pyi_testmod_lazy_tracker as tracker
+
+        import pyi_testmod_lazy
+        assert tracker.executed == [], f"Unexpected executed modules: {tracker.executed}"
+        assert pyi_testmod_lazy.VALUE == 'pkg'
+        assert tracker.executed == ['pyi_testmod_lazy'], f"Unexpected executed modules: {tracker.executed}"
+
+        import pyi_testmod_lazy.submod
+        assert 'pyi_testmod_lazy.submod' not in tracker.executed
+
+        from pyi_testmod_lazy.submod import VALUE
+        assert VALUE == 'submod'
+        assert 'pyi_testmod_lazy.submod' in tracker.executed
+        assert pyi_testmod_lazy.submod.__loader__.__class__.__name__ == 'PyiFrozenLoader'
+
+        # Excluded module is executed eagerly.
+        import pyi_testmod_lazy.sideeffect
+        assert 'pyi_testmod_lazy.sideeffect' in tracker.executed
+        """
+    )
+
+
 # Tests for run-time sys.path modifications, typically with aim of exposing some part of a package to the outside world
 # as a top-level package; for example, to expose a vendored package to the outside world. These tests aim to verify that
 # we can handle dynamic sys.path modifications within PYZ-collected packages and honor the order of entries in sys.path.
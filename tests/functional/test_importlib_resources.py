@@ -121,3 +121,48 @@ def test_importlib_resources_namespace_package_data_files(pyi_builder, as_packag
         """,
         pyi_args=pyi_args,
     )
+
+
+# Run the test script as a frozen program, with data files of the test package packed into the PYZ archive.
+def test_importlib_resources_frozen_packed_data(pyi_builder, monkeypatch):
+    # Override Analysis so that we can set packed data packages without having to use .spec file.
+    def AnalysisOverride(*args, **kwargs):
+        kwargs['packed_data'] = ['pyi_pkgres_testpkg']
+        return Analysis(*args, **kwargs)
+
+    import PyInstaller.building.build_main
+    Analysis = PyInstaller.building.build_main.Analysis
+    monkeypatch.setattr('PyInstaller.building.build_main.Analysis', AnalysisOverride)
+
+    pathex = os.path.join(_MODULES_DIR, 'pyi_pkg_resources_provider', 'package')
+    hooks_dir = os.path.join(_MODULES_DIR, 'pyi_pkg_resources_provider', 'hooks')
+    pyi_args = ['--paths', pathex, '--hidden-import', 'pyi_pkgres_testpkg', '--additional-hooks-dir', hooks_dir]
+    pyi_builder.test_script(
+        'pyi_importlib_resources.py',
+        pyi_args=pyi_args,
+    )
+    pyi_builder.test_source(
+        """
+        import os
+        import sys
+        import pkgutil
+        import importlib.resources
+
+        import pyi_pkgres_testpkg.subpkg3
+
+        # The data files are not collected onto filesystem...
+        assert not os.path.exists(os.path.join(sys._MEIPASS, 'pyi_pkgres_testpkg', 'subpkg3', '_datafile.json'))
+
+        # ... but can be read via loader's get_data() and importlib.resources.
+        expected_data = b'{\\n  "_comment": "Data file in supbkg3."\\n}\\n'
+        data = pkgutil.get_data('pyi_pkgres_testpkg.subpkg3', '_datafile.json')
+        assert data.splitlines() == expected_data.splitlines()
+
+        data_dir = importlib.resources.files('pyi_pkgres_testpkg') / 'subpkg1' / 'data'
+        assert data_dir.is_dir()
+        assert sorted(path.name for path in data_dir.iterdir()) == ['entry1.txt', 'entry2.md', 'entry3.rst', 'extra']
+        assert (data_dir / 'extra').is_dir()
+        assert (data_dir / 'extra' / 'extra_entry1.json').is_file()
+        """,
+        pyi_args=pyi_args + ['--hidden-import', 'pkgutil'],
+    )
@@ -11,6 +11,7 @@
         "test_multipackage3.spec",
         "test_multipackage4.spec",
         "test_multipackage5.spec",
+        "test_multipackage6.spec",
     ),
     ids=(
         "onefile_depends_on_onefile",
@@ -18,7 +19,14 @@
         "onefile_depends_on_onedir",
         "onedir_depends_on_onedir",
         "onedir_and_onefile_depends_on_onedir",
+        "onefile_depends_on_onefile_shared_pyz",
     )
 )
 def test_spec_with_multipackage(pyi_builder_spec, spec_file):
     pyi_builder_spec.test_spec(spec_file)
+
+
+# Run the analyses of the .spec file in worker processes.
+@importorskip('psutil')
+def test_spec_with_multipackage_concurrent_analysis(pyi_builder_spec):
+    pyi_builder_spec.test_spec("test_multipackage5.spec", pyi_args=['--analysis-jobs', '2'])
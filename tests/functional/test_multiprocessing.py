@@ -84,6 +84,14 @@ def test_multiprocessing_main_module_code_in_process(pyi_builder, start_method):
     pyi_builder.test_script("pyi_multiprocessing_main_module_code_in_process.py", app_args=[start_method])
 
 
+# Test that the fork server is started via the frozen executable, imports the modules set by
+# `multiprocessing.set_forkserver_preload`, and forks the worker processes from that state.
+@pytest.mark.timeout(timeout=60)
+@pytest.mark.skipif(is_win, reason="The forkserver start method is not available on Windows.")
+def test_multiprocessing_forkserver_preload(pyi_builder):
+    pyi_builder.test_script("pyi_multiprocessing_forkserver_preload.py")
+
+
 # Test the basic usage of high-level `concurrent.futures` framework with its `ProcessPoolExecutor` (i.e., with default
 # `multiprocessing` start method). This test will be more interesting if/when we can remove the explicit
 # `multiprocessing.freeze_support` call in the entry-point script.
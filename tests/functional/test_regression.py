@@ -30,8 +30,8 @@ def test_issue_2492(monkeypatch, tmpdir):
             'workpath': str(tmpdir),
             'spec': str(tmpdir),
             'warnfile': str(tmpdir.join('warn.txt')),
-            'dot-file': str(tmpdir.join('imports.dot')),
-            'xref-file': str(tmpdir.join('imports.xref')),
+            'graph-file': str(tmpdir.join('imports.jsonl')),
+            'origins-file': str(tmpdir.join('origins.json')),
             'hiddenimports': [],
             'specnm': 'issue_2492_script',
             'code_cache': dict(),
@@ -84,10 +84,11 @@ def get_macos_sdk_version(*args, **kwargs):
             'workpath': str(tmpdir),
             'spec': str(tmpdir),
             'warnfile': str(tmpdir.join('warn.txt')),
-            'dot-file': str(tmpdir.join('imports.dot')),
-            'xref-file': str(tmpdir.join('imports.xref')),
+            'graph-file': str(tmpdir.join('imports.jsonl')),
+            'origins-file': str(tmpdir.join('origins.json')),
             'hiddenimports': [],
             'specnm': 'issue_5131_script',
+            'cachedir': str(tmpdir.join('cache')),
             'code_cache': dict(),
         }
     )
@@ -0,0 +1,93 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from PyInstaller import __version__
+from PyInstaller.compat import is_win
+
+
+@pytest.mark.skipif(is_win, reason="The build server is not supported on Windows.")
+def test_build_server(tmp_path, monkeypatch):
+    from PyInstaller.building import server as build_server
+
+    monkeypatch.setenv('PYINSTALLER_CONFIG_DIR', str(tmp_path / 'config'))
+    monkeypatch.setenv('PYINSTALLER_USE_SERVER', '1')
+    env = dict(os.environ)
+    (tmp_path / 'app.py').write_text("print('Hello from the build server!')\n")
+
+    # The socket is kept out of the cache directory (which is emptied by --clean).
+    address = build_server.get_server_address()
+    assert not address.startswith(str(tmp_path / 'config'))
+
+    server = subprocess.Popen([sys.executable, '-m', 'PyInstaller', '--server'], env=env)
+    try:
+        # Wait for the server to start listening.
+        for _ in range(600):
+            if os.path.exists(address):
+                break
+            assert server.poll() is None, "Server exited prematurely."
+            time.sleep(0.1)
+        else:
+            pytest.fail("Server did not start.")
+
+        def pyinstaller(*args):
+            return subprocess.run([sys.executable, '-m', 'PyInstaller', *args],
+                                  cwd=tmp_path,
+                                  env=env,
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.PIPE,
+                                  text=True)
+
+        # The build is forwarded to the server, and the build output relayed back.
+        result = pyinstaller('--noconfirm', '--clean', 'app.py')
+        assert result.returncode == 0, result.stderr
+        assert 'Forwarding build to PyInstaller server' in result.stderr
+        assert 'Building COLLECT COLLECT-00.toc completed successfully.' in result.stderr
+        executable = tmp_path / 'dist' / 'app' / 'app'
+        output = subprocess.check_output([str(executable)], text=True)
+        assert output.strip() == 'Hello from the build server!'
+
+        # The build cannot ask for confirmation; an existing output directory is not removed without --noconfirm.
+        result = pyinstaller('app.py')
+        assert result.returncode == 1
+        assert 'Forwarding build to PyInstaller server' in result.stderr
+        assert 'use the -y option' in result.stderr
+        assert executable.exists()
+
+        # Builds are forwarded only if requested via environment variable.
+        env['PYINSTALLER_USE_SERVER'] = '0'
+        result = pyinstaller('--version')
+        assert result.returncode == 0, result.stderr
+        assert 'Forwarding build to PyInstaller server' not in result.stderr
+        env['PYINSTALLER_USE_SERVER'] = '1'
+
+        # The server is still reachable after a --clean build, and stdout and stderr output are kept apart.
+        result = pyinstaller('--version')
+        assert result.returncode == 0, result.stderr
+        assert 'Forwarding build to PyInstaller server' in result.stderr
+        assert result.stdout.strip() == __version__
+
+        # Errors are reported with the exit code of the build.
+        result = pyinstaller('nonexistent.py')
+        assert result.returncode == 1
+        assert "Script file 'nonexistent.py' does not exist." in result.stderr
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    # The server removes its socket when shutting down.
+    assert not os.path.exists(address)
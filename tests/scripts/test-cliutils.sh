@@ -17,8 +17,8 @@
 
 set -e # exit on error
 
-entrypoints="pyinstaller pyi-archive_viewer pyi-bindepend
-             pyi-makespec"
+entrypoints="pyinstaller pyi-archive_viewer pyi-bindepend pyi-cache
+             pyi-makespec pyi-prune_report pyi-render_graph"
 # pyi-grab_version pyi-set_version are windows only
 for ep in $entrypoints ; do
     echo -n $(which $ep )
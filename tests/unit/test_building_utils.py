@@ -152,3 +152,100 @@ def test_should_include_system_binary():
         expected = case[3]
 
         assert utils._should_include_system_binary(tuple, excepts) == expected
+
+
+def test_process_collected_binaries_cache(tmp_path, monkeypatch):
+    from PyInstaller.config import CONF
+
+    monkeypatch.setitem(CONF, 'cachedir', str(tmp_path / 'cache'))
+    monkeypatch.setitem(CONF, 'upx_dir', None)
+    monkeypatch.setattr(utils, '_file_digest_cache', None)
+    monkeypatch.setattr(utils.cache, '_stats', {})
+
+    # Replace the actual processing (strip) with a plain copy, and keep track of processed files.
+    processed_files = []
+
+    def _fake_process_binary_file(src_name, dest_name, cached_name, **kwargs):
+        processed_files.append(dest_name)
+        pathlib.Path(cached_name).write_bytes(pathlib.Path(src_name).read_bytes())
+
+    monkeypatch.setattr(utils, '_process_binary_file', _fake_process_binary_file)
+
+    hashed_files = []
+    orig_compute_file_digest = utils._compute_file_digest
+
+    def _counting_compute_file_digest(filename):
+        hashed_files.append(filename)
+        return orig_compute_file_digest(filename)
+
+    monkeypatch.setattr(utils, '_compute_file_digest', _counting_compute_file_digest)
+
+    src_dir = tmp_path / 'src'
+    src_dir.mkdir()
+    (src_dir / 'libfoo.so').write_bytes(b'foo')
+    (src_dir / 'libbar.so').write_bytes(b'bar')
+
+    binaries = [
+        (str(src_dir / 'libfoo.so'), 'libfoo.so', False),
+        (str(src_dir / 'libbar.so'), 'libbar.so', False),
+    ]
+    processed = utils.process_collected_binaries(binaries, use_strip=True, use_upx=False)
+    assert sorted(processed_files) == ['libbar.so', 'libfoo.so']
+    assert len(hashed_files) == 2
+    for src_name, dest_name, _ in binaries:
+        processed_name = processed[(src_name, dest_name)]
+        assert os.path.basename(processed_name) == dest_name
+        assert pathlib.Path(processed_name).read_bytes() == pathlib.Path(src_name).read_bytes()
+
+    # Second run, with fresh in-memory state: the files are served from cache, and the memoized digests are used.
+    monkeypatch.setattr(utils, '_file_digest_cache', None)
+    processed_files.clear()
+    hashed_files.clear()
+    assert utils.process_collected_binaries(binaries, use_strip=True, use_upx=False) == processed
+    assert processed_files == []
+    assert hashed_files == []
+    (cache_stats,) = utils.cache.get_stats(CONF['cachedir']).values()
+    assert (cache_stats['entries'], cache_stats['hits'], cache_stats['misses']) == (2, 2, 2)
+    assert cache_stats['bytes_saved'] == 6
+
+    # Modified source file is re-hashed and re-processed.
+    (src_dir / 'libfoo.so').write_bytes(b'foo2')
+    processed2 = utils.process_collected_binaries(binaries, use_strip=True, use_upx=False)
+    assert processed_files == ['libfoo.so']
+    assert hashed_files == [os.path.abspath(src_dir / 'libfoo.so')]
+    assert pathlib.Path(processed2[(str(src_dir / 'libfoo.so'), 'libfoo.so')]).read_bytes() == b'foo2'
+
+
+def test_file_digest_cache_pruning(tmp_path, monkeypatch):
+    import json
+    from PyInstaller.config import CONF
+
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setitem(CONF, 'cachedir', str(cache_dir))
+    monkeypatch.setattr(utils, '_file_digest_cache', None)
+    monkeypatch.setattr(utils, '_file_digest_cache_used', set())
+
+    files = {}
+    for name in ('used', 'unused', 'stale', 'deleted'):
+        files[name] = tmp_path / name
+        files[name].write_bytes(name.encode())
+        utils._get_file_digest(str(files[name]))
+    utils._save_file_digest_cache()
+
+    # Simulate a new process, in which only one of the files is used.
+    digests_file = cache_dir / utils.cache.DIGESTS_FILENAME
+    digests = json.loads(digests_file.read_text(encoding='utf-8'))
+    digests[str(files['used'])][3] = 0
+    digests[str(files['stale'])][3] = 0
+    utils.cache._write_json_atomic(str(digests_file), digests)
+    files['deleted'].unlink()
+    monkeypatch.setattr(utils, '_file_digest_cache', None)
+
+    utils._get_file_digest(str(files['used']))
+    utils._save_file_digest_cache()
+
+    # The record of the used file is kept (and its last use time refreshed); the records of the file that no longer
+    # exists and of the file that was not used for a long time are dropped.
+    digests = json.loads(digests_file.read_text(encoding='utf-8'))
+    assert sorted(digests) == [str(files['unused']), str(files['used'])]
+    assert digests[str(files['used'])][3] > 0
@@ -13,6 +13,8 @@
     recursive_function_calls,
     any_alias,
     finditer,
+    get_code_facts,
+    recursive_code_facts,
 )
 
 
@@ -211,3 +213,40 @@ def test_finditer():
     matches = list(finditer(re.compile(rb"\d+"), b"0123 4567 890 12 3 4"))
     aligned = [i.group() for i in matches]
     assert aligned == [b"0123", b"567", b"890", b"12"]
+
+
+def test_code_facts():
+    code = compile_(
+        """
+        import os.path
+        from . import sibling
+        from ctypes import cdll
+
+        x = os.path.join("a", "b")
+        cdll.foo
+        ctypes.windll.bar.baz
+
+        def function():
+            global y
+            y = cdll.LoadLibrary("libfoo.so")
+            return os.path.dirname("c")
+
+        class Klass:
+            pass
+        """
+    )
+    facts = get_code_facts(code)
+    # Facts are cached.
+    assert get_code_facts(code) is facts
+
+    assert ("os.path.join", ["a", "b"]) in facts.function_calls
+    assert ("cdll", ["foo"]) in facts.attribute_loads
+    assert ("ctypes", ["windll", "bar", "baz"]) in facts.attribute_loads
+
+    (function_code,) = [
+        const for const in code.co_consts if isinstance(const, CodeType) and const.co_name == "function"
+    ]
+    all_facts = recursive_code_facts(code)
+    assert all_facts[code] is facts
+    function_facts = all_facts[function_code]
+    assert function_facts.function_calls == [("cdll.LoadLibrary", ["libfoo.so"]), ("os.path.dirname", ["c"])]
@@ -0,0 +1,136 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+import json
+import os
+
+import pytest
+
+from PyInstaller.building import cache
+
+
+def _create_entry(cache_dir, cache_name, key, size, last_access):
+    entry_dir = cache_dir / cache_name / key[:2] / key
+    entry_dir.mkdir(parents=True)
+    (entry_dir / 'libfoo.so').write_bytes(b'x' * size)
+    os.utime(entry_dir, (last_access, last_access))
+    return entry_dir
+
+
+@pytest.mark.parametrize(
+    'value, expected', [
+        ('1024', 1024),
+        ('500M', 500 * 1024**2),
+        ('1.5g', int(1.5 * 1024**3)),
+        ('2 KiB', 2048),
+    ]
+)
+def test_parse_size(value, expected):
+    assert cache.parse_size(value) == expected
+
+
+def test_parse_size_invalid():
+    with pytest.raises(ValueError):
+        cache.parse_size('lots')
+
+
+def test_prune_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_stats', {})
+    old_entry = _create_entry(tmp_path, 'bincache10', 'aa0001', 1000, 1000)
+    new_entry = _create_entry(tmp_path, 'bincache10', 'bb0002', 1000, 3000)
+    mid_entry = _create_entry(tmp_path, 'bincache00', 'cc0003', 1000, 2000)
+
+    # A cache hit bumps the last-access record of an entry.
+    cache.record_hit('bincache10', old_entry, 100)
+
+    evicted = cache.prune(str(tmp_path), 2000)
+    assert [entry.path for entry in evicted] == [str(mid_entry)]
+    assert not mid_entry.exists()
+    assert old_entry.exists() and new_entry.exists()
+
+    # Nothing to evict if the cache is already under limit.
+    assert cache.prune(str(tmp_path), 2000) == []
+
+
+def test_prune_ignores_non_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_stats', {})
+    entry = _create_entry(tmp_path, 'blobcache', 'aa0001', 1000, 1000)
+    # Files that are not cache entries cannot be evicted, so they do not count towards the limit.
+    (tmp_path / cache.STATS_FILENAME).write_bytes(b'x' * 5000)
+    (tmp_path / 'bincache00py311').mkdir()
+    (tmp_path / 'bincache00py311' / 'libfoo.so').write_bytes(b'x' * 5000)
+
+    assert cache.prune(str(tmp_path), 2000) == []
+    assert entry.exists()
+
+
+def test_prune_compacts_json_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_stats', {})
+    existing_file = tmp_path / 'libfoo.so'
+    existing_file.write_bytes(b'x')
+    digests = {str(existing_file): [1, 0, 'digest'], str(tmp_path / 'missing.so'): [1, 0, 'digest']}
+    cache._write_json_atomic(str(tmp_path / cache.DIGESTS_FILENAME), digests)
+    hook_index = {str(tmp_path): [0, [], 0], str(tmp_path / 'missing'): [0, [], 0]}
+    cache._write_json_atomic(str(tmp_path / cache.HOOK_INDEX_FILENAME), hook_index)
+
+    # The records of files and directories that no longer exist are dropped.
+    cache.prune(str(tmp_path), 2000)
+    with open(tmp_path / cache.DIGESTS_FILENAME, encoding='utf-8') as fp:
+        assert list(json.load(fp)) == [str(existing_file)]
+    with open(tmp_path / cache.HOOK_INDEX_FILENAME, encoding='utf-8') as fp:
+        assert list(json.load(fp)) == [str(tmp_path)]
+
+
+def test_stats(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_stats', {})
+    _create_entry(tmp_path, 'bincache10', 'aa0001', 1000, 1000)
+    _create_entry(tmp_path, 'bincache10', 'bb0002', 500, 1000)
+
+    for _ in range(2):
+        cache.record_hit('bincache10', tmp_path / 'missing', 100)
+        cache.record_miss('bincache10')
+        cache.save_stats(str(tmp_path))
+
+    assert cache.get_stats(str(tmp_path)) == {
+        'bincache10': {
+            'entries': 2,
+            'size': 1500,
+            'hits': 2,
+            'misses': 2,
+            'bytes_saved': 200,
+        },
+    }
+
+
+def test_verify(tmp_path):
+    good_entry = _create_entry(tmp_path, 'bincache10', 'aa0001', 1000, 1000)
+    # Binaries with identical contents, collected under different base names, share an entry.
+    (good_entry / 'libfoo.so.1').write_bytes(b'x' * 1000)
+    missing_entry = tmp_path / 'bincache10' / 'cc' / 'cc0003'
+    missing_entry.mkdir(parents=True)
+    empty_entry = _create_entry(tmp_path, 'bincache10', 'bb0002', 0, 1000)
+    stale_tmpdir = good_entry / '.tmp-1234'
+    stale_tmpdir.mkdir()
+    os.utime(stale_tmpdir, (1000, 1000))
+    (tmp_path / cache.STATS_FILENAME).write_text('{')
+
+    problems = cache.verify(str(tmp_path))
+    assert sorted(path for path, problem in problems) == sorted([
+        str(empty_entry),
+        str(missing_entry),
+        str(stale_tmpdir),
+        str(tmp_path / cache.STATS_FILENAME),
+    ])
+
+    cache.verify(str(tmp_path), fix=True)
+    assert cache.verify(str(tmp_path)) == []
+    assert (good_entry / 'libfoo.so').exists()
+    assert (good_entry / 'libfoo.so.1').exists()
@@ -0,0 +1,274 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+import io
+import marshal
+import mmap
+import os
+import random
+
+import pytest
+
+from PyInstaller.archive.readers import CArchiveReader
+from PyInstaller.archive.writers import CArchiveWriter, ZlibArchiveWriter
+
+
+def _create_files(tmp_path):
+    rng = random.Random(0)
+    files = {
+        # Compressible data spanning several chunks, with partial last chunk.
+        'large.bin': b''.join(rng.choice([b'abc', b'def', b'xyz']) * rng.randint(1, 64) for _ in range(20000)),
+        # Incompressible data, spanning several chunks.
+        'random.bin': rng.randbytes(150000),
+        'small.txt': b'small data file\n' * 16,
+        'empty.txt': b'',
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    return files
+
+
+def _write_archive(filename, tmp_path, files, compress):
+    entries = [(name, str(tmp_path / name), compress, 'x') for name in files]
+    CArchiveWriter(str(filename), entries, 'libpython3.so')
+
+
+def test_carchive_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(CArchiveWriter, '_COMPRESSION_CHUNK_SIZE', 64 * 1024)
+    files = _create_files(tmp_path)
+
+    for compress in (False, True):
+        archive_file = tmp_path / f'archive-{int(compress)}.pkg'
+        _write_archive(archive_file, tmp_path, files, compress)
+
+        archive = CArchiveReader(str(archive_file))
+        assert list(archive.toc) == list(files)
+        for name, data in files.items():
+            assert archive.toc[name][3] == int(compress)
+            assert archive.extract(name) == data
+
+
+def test_carchive_output_independent_of_worker_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(CArchiveWriter, '_COMPRESSION_CHUNK_SIZE', 64 * 1024)
+    files = _create_files(tmp_path)
+
+    archives = []
+    for num_cpus in (1, 8):
+        monkeypatch.setattr(os, 'cpu_count', lambda: num_cpus)
+        archive_file = tmp_path / f'archive-{num_cpus}.pkg'
+        _write_archive(archive_file, tmp_path, files, True)
+        archives.append(archive_file.read_bytes())
+
+    assert archives[0] == archives[1]
+
+
+def test_carchive_compression_levels_and_min_ratio(tmp_path, monkeypatch):
+    monkeypatch.setattr(CArchiveWriter, '_COMPRESSION_CHUNK_SIZE', 64 * 1024)
+    files = _create_files(tmp_path)
+
+    archive_file = tmp_path / 'archive.pkg'
+    entries = [
+        ('large.bin', str(tmp_path / 'large.bin'), 1, 'x'),
+        ('random.bin', str(tmp_path / 'random.bin'), True, 'x'),
+        ('small.txt', str(tmp_path / 'small.txt'), 0, 'x'),
+        ('empty.txt', str(tmp_path / 'empty.txt'), True, 'x'),
+    ]
+    CArchiveWriter(str(archive_file), entries, 'libpython3.so', compress_min_ratio=1.05)
+
+    archive = CArchiveReader(str(archive_file))
+    compression_flags = {name: archive.toc[name][3] for name in files}
+    # Incompressible data is stored, and so is the entry with compression level 0.
+    assert compression_flags == {'large.bin': 1, 'random.bin': 0, 'small.txt': 0, 'empty.txt': 0}
+    for name, data in files.items():
+        assert archive.extract(name) == data
+
+
+def test_carchive_blob_cache(tmp_path, monkeypatch):
+    from PyInstaller.building import cache, utils
+    from PyInstaller.config import CONF
+
+    monkeypatch.setitem(CONF, 'cachedir', str(tmp_path / 'cache'))
+    monkeypatch.setattr(utils, '_file_digest_cache', None)
+    monkeypatch.setattr(cache, '_stats', {})
+    monkeypatch.setattr(CArchiveWriter, '_COMPRESSION_CHUNK_SIZE', 64 * 1024)
+    files = _create_files(tmp_path)
+
+    entries = [(name, str(tmp_path / name), True, 'x') for name in files]
+    entries.append(('script', str(tmp_path / 'small.txt'), True, 'n'))  # Blob entry (symbolic link target name).
+
+    archives = []
+    for i in range(3):
+        archive_file = tmp_path / f'archive-{i}.pkg'
+        blob_cache = cache.BlobCache(CONF['cachedir']) if i else None
+        CArchiveWriter(str(archive_file), entries, 'libpython3.so', blob_cache=blob_cache)
+        archives.append(archive_file.read_bytes())
+
+    # Output must not depend on whether the compressed data came from the cache or not.
+    assert archives[0] == archives[1] == archives[2]
+    # The first cached run stores the non-empty entries, the second one retrieves them.
+    bytes_saved = sum(map(len, files.values())) + len(str(tmp_path / 'small.txt').encode('utf-8')) + 1
+    assert cache._stats == {'blobcache': {'hits': 4, 'misses': 4, 'bytes_saved': bytes_saved}}
+
+    archive = CArchiveReader(str(tmp_path / 'archive-2.pkg'))
+    for name, data in files.items():
+        assert archive.extract(name) == data
+
+
+def test_carchive_blob_cache_min_ratio(tmp_path, monkeypatch):
+    from PyInstaller.building import cache, utils
+    from PyInstaller.config import CONF
+
+    monkeypatch.setitem(CONF, 'cachedir', str(tmp_path / 'cache'))
+    monkeypatch.setattr(utils, '_file_digest_cache', None)
+    monkeypatch.setattr(CArchiveWriter, '_COMPRESSION_CHUNK_SIZE', 64 * 1024)
+    files = _create_files(tmp_path)
+    entries = [('large.bin', str(tmp_path / 'large.bin'), True, 'x')]
+
+    archives = []
+    for i in range(2):
+        archive_file = tmp_path / f'archive-{i}.pkg'
+        with monkeypatch.context() as m:
+            if i:
+                # Cached entries that passed the trial compression are not read (nor trial-compressed) again.
+                m.setattr(CArchiveWriter, '_check_compression_ratio', lambda *args: pytest.fail("Trial compression!"))
+            CArchiveWriter(
+                str(archive_file),
+                entries,
+                'libpython3.so',
+                compress_min_ratio=1.05,
+                blob_cache=cache.BlobCache(CONF['cachedir']),
+            )
+        archives.append(archive_file.read_bytes())
+
+    assert archives[0] == archives[1]
+    assert CArchiveReader(str(tmp_path / 'archive-1.pkg')).extract('large.bin') == files['large.bin']
+
+
+def test_carchive_dedup(tmp_path, monkeypatch):
+    from PyInstaller.building import utils
+    from PyInstaller.config import CONF
+
+    monkeypatch.setitem(CONF, 'cachedir', str(tmp_path / 'cache'))
+    monkeypatch.setattr(utils, '_file_digest_cache', None)
+    monkeypatch.setattr(CArchiveWriter, '_COMPRESSION_CHUNK_SIZE', 64 * 1024)
+    files = _create_files(tmp_path)
+    (tmp_path / 'copy.bin').write_bytes(files['large.bin'])
+
+    entries = [(name, str(tmp_path / name), True, 'x') for name in files]
+    entries += [
+        ('copy-compressed.bin', str(tmp_path / 'copy.bin'), True, 'b'),
+        ('copy-stored.bin', str(tmp_path / 'copy.bin'), False, 'x'),  # Different compression setting.
+        ('empty-copy.txt', str(tmp_path / 'empty.txt'), True, 'x'),
+    ]
+    CArchiveWriter(str(tmp_path / 'archive.pkg'), entries, 'libpython3.so')
+    CArchiveWriter(str(tmp_path / 'archive-dedup.pkg'), entries, 'libpython3.so', dedup=True)
+
+    archive = CArchiveReader(str(tmp_path / 'archive-dedup.pkg'))
+    # Only the compressed copy shares the data with the original; the typecode is retained.
+    assert archive.toc['copy-compressed.bin'][:4] == archive.toc['large.bin'][:4]
+    assert archive.toc['copy-compressed.bin'][4] == 'b'
+    assert archive.toc['copy-stored.bin'][0] != archive.toc['large.bin'][0]
+    for name, data in files.items():
+        assert archive.extract(name) == data
+    for name in ('copy-compressed.bin', 'copy-stored.bin'):
+        assert archive.extract(name) == files['large.bin']
+
+    size_saved = archive.toc['large.bin'][1]
+    assert os.path.getsize(tmp_path / 'archive.pkg') - os.path.getsize(tmp_path / 'archive-dedup.pkg') == size_saved
+
+
+def test_carchive_extract_to(tmp_path, monkeypatch):
+    monkeypatch.setattr(CArchiveWriter, '_COMPRESSION_CHUNK_SIZE', 64 * 1024)
+    monkeypatch.setattr(CArchiveReader, '_EXTRACT_CHUNK_SIZE', 4096)
+    files = _create_files(tmp_path)
+
+    for compress in (False, True):
+        archive_file = tmp_path / f'archive-{int(compress)}.pkg'
+        _write_archive(archive_file, tmp_path, files, compress)
+
+        archive = CArchiveReader(str(archive_file))
+        with open(archive_file, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            for name, data in files.items():
+                for source in (None, mapping):
+                    output = io.BytesIO()
+                    assert archive.extract_to(name, output, mapping=source) == len(data)
+                    assert output.getvalue() == data
+
+
+def test_archive_viewer_extract_all(tmp_path):
+    from PyInstaller.compat import BYTECODE_MAGIC
+    from PyInstaller.utils.cliutils.archive_viewer import extract_archive
+
+    files = _create_files(tmp_path)
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / '__init__.py').write_text('')
+    code_dict = {
+        'pkg': compile('', 'pkg/__init__.py', 'exec'),
+        'pkg.mod': compile('x = 1', 'pkg/mod.py', 'exec'),
+    }
+    pyz_entries = [
+        ('pkg', str(tmp_path / 'pkg' / '__init__.py'), 'PYMODULE'),
+        ('pkg.mod', str(tmp_path / 'pkg' / 'mod.py'), 'PYMODULE'),
+        (os.path.join('pkg', 'large.bin'), str(tmp_path / 'large.bin'), 'DATA'),
+    ]
+    ZlibArchiveWriter(str(tmp_path / 'PYZ.pyz'), pyz_entries, code_dict=code_dict)
+
+    entries = [(name, str(tmp_path / name), True, 'x') for name in files]
+    entries.append(('PYZ.pyz', str(tmp_path / 'PYZ.pyz'), False, 'z'))
+    entries.append(('../escape.txt', str(tmp_path / 'small.txt'), True, 'x'))
+    CArchiveWriter(str(tmp_path / 'archive.pkg'), entries, 'libpython3.so')
+
+    output_dir = tmp_path / 'output'
+    errors = extract_archive(str(tmp_path / 'archive.pkg'), str(output_dir), jobs=4)
+    assert [name for name, error in errors] == ['../escape.txt']
+    assert not (tmp_path / 'escape.txt').exists()
+
+    for name, data in files.items():
+        assert (output_dir / name).read_bytes() == data
+    assert (output_dir / 'PYZ.pyz').read_bytes() == (tmp_path / 'PYZ.pyz').read_bytes()
+
+    pyz_dir = output_dir / 'PYZ.pyz_extracted'
+    assert (pyz_dir / 'pkg' / 'large.bin').read_bytes() == files['large.bin']
+    for name, pyc_file in (('pkg', pyz_dir / 'pkg' / '__init__.pyc'), ('pkg.mod', pyz_dir / 'pkg' / 'mod.pyc')):
+        pyc_data = pyc_file.read_bytes()
+        assert pyc_data[:4] == BYTECODE_MAGIC
+        assert marshal.loads(pyc_data[16:]) == code_dict[name]
+
+
+def test_pyz_shared_archive_links_only_used_modules(tmp_path):
+    from PyInstaller.archive.readers import ZlibArchiveReader
+
+    for name in ('foo', 'bar', 'baz'):
+        (tmp_path / f'{name}.py').write_text(f"name = {name!r}\n")
+    code_dict = {
+        name: compile((tmp_path / f'{name}.py').read_text(), f'{name}.py', 'exec')
+        for name in ('foo', 'bar', 'baz')
+    }
+
+    # The shared archive contains modules used by different executables; this one uses only `foo` (and has its own
+    # `baz`).
+    shared_pyz = tmp_path / 'shared.pyz'
+    ZlibArchiveWriter(
+        str(shared_pyz), [(name, str(tmp_path / f'{name}.py'), 'PYMODULE') for name in ('foo', 'bar', 'baz')],
+        code_dict=code_dict
+    )
+    entries = [
+        ('baz', str(tmp_path / 'baz.py'), 'PYMODULE'),
+        ('foo', str(shared_pyz), 'PYZ-SHARED'),
+        ('baz', str(shared_pyz), 'PYZ-SHARED'),
+    ]
+    ZlibArchiveWriter(str(tmp_path / 'PYZ.pyz'), entries, code_dict={'baz': code_dict['baz']})
+
+    archive = ZlibArchiveReader(str(tmp_path / 'PYZ.pyz'))
+    archive.link_shared_archives(str(tmp_path))
+    assert sorted(archive.toc) == ['baz', 'foo']
+    assert archive._shared_entries.keys() == {'foo'}
+    assert archive.extract('foo').co_filename == 'foo.py'
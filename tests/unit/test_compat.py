@@ -9,6 +9,10 @@
 # SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
 #-----------------------------------------------------------------------------
 
+import json
+import subprocess
+import sys
+
 import pytest
 
 from PyInstaller import compat
@@ -60,3 +64,58 @@ def test_windows_machine():
 def test_other_os_machine():
     assert _pyi_machine("foo", "Darwin") is None
     assert _pyi_machine("foo", "FreeBSD") is None
+
+
+# Importing the command-line entry point (as done by `pyinstaller --version`, `pyi-makespec`, etc.) must not probe the
+# environment; the probes (running `ldd`, `file` or `upx`, importing `importlib.metadata`) are evaluated lazily, when
+# they are actually needed.
+_IMPORT_PROBE_SCRIPT = """
+import json
+import subprocess
+import sys
+
+commands = []
+_orig_popen_init = subprocess.Popen.__init__
+
+
+def _popen_init(self, args, *posargs, **kwargs):
+    commands.append(args)
+    _orig_popen_init(self, args, *posargs, **kwargs)
+
+
+subprocess.Popen.__init__ = _popen_init
+
+import PyInstaller.__main__
+from PyInstaller import configure
+
+print(json.dumps({
+    'commands': commands,
+    'upx_probes': configure.get_upx_availability.cache_info().currsize,
+    'modules': sorted(sys.modules),
+    'compat': sorted(vars(PyInstaller.compat)),
+    'package': sorted(vars(PyInstaller)),
+}))
+"""
+
+
+def test_import_does_not_probe_environment():
+    output = subprocess.run([sys.executable, '-c', _IMPORT_PROBE_SCRIPT], check=True, capture_output=True, text=True)
+    result = json.loads(output.stdout)
+    assert result['commands'] == []
+    assert 'importlib.metadata' not in result['modules'] or sys.version_info < (3, 10)
+    assert 'is_musl' not in result['compat']
+    assert 'architecture' not in result['compat']
+    assert 'PLATFORM' not in result['package']
+    assert result['upx_probes'] == 0
+    # Neither is the build machinery imported (which, e.g., triggers the search for hook entry points).
+    for module_name in ('PyInstaller.building.build_main', 'PyInstaller.depend.analysis', 'PyInstaller.utils.hooks'):
+        assert module_name not in result['modules']
+
+
+def test_lazy_attributes():
+    assert isinstance(compat.is_musl, bool)
+    assert compat.architecture in ('32bit', '64bit')
+    # The computed values are stored in the module.
+    assert vars(compat)['is_musl'] is compat.is_musl
+    with pytest.raises(AttributeError):
+        compat.no_such_attribute
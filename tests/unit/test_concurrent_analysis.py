@@ -0,0 +1,32 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+from PyInstaller import log as logging
+from PyInstaller.building import build_main
+
+
+# The worker processes should use the log level of the build process, even if it differs from the one in the
+# environment (e.g., when it was set from a .spec file).
+def test_analysis_worker_log_level(monkeypatch):
+    pyi_logger = logging.getLogger('PyInstaller')
+    monkeypatch.setenv('PYI_LOG_LEVEL', 'INFO')
+    monkeypatch.setattr(build_main, '_analysis_executor', None)
+
+    orig_level = pyi_logger.level
+    pyi_logger.setLevel(logging.DEBUG)
+    try:
+        executor = build_main._get_analysis_executor(1)
+    finally:
+        pyi_logger.setLevel(orig_level)
+    try:
+        assert executor.submit(pyi_logger.getEffectiveLevel).result() == logging.DEBUG
+    finally:
+        executor.shutdown()
@@ -10,6 +10,7 @@
 #-----------------------------------------------------------------------------
 
 import os
+import shutil
 import pytest
 import textwrap
 
@@ -112,3 +113,31 @@ def test_ldconfig_cache():
             break
     assert libpath, 'libc.so not found'
     assert os.path.isfile(libpath)
+
+
+@pytest.mark.linux
+def test_find_ctypes_library(tmp_path, monkeypatch):
+    from PyInstaller.depend import bindepend
+
+    utils.load_ldconfig_cache()
+    libc = next((path for soname, path in utils.LDCONFIG_CACHE.items() if soname.startswith('libc.so.')), None)
+    if libc is None:
+        pytest.skip('libc.so not found in ldconfig cache')
+    assert bindepend._get_elf_soname(libc) == os.path.basename(libc)
+
+    # A library in one of the search paths; the development symbolic link resolves to the file named by the SONAME.
+    shutil.copyfile(libc, tmp_path / 'libc.so.6')
+    (tmp_path / 'libc.so').symlink_to('libc.so.6')
+    monkeypatch.setattr(utils, '_ctypes_library_cache', {})
+    old_environ = dict(os.environ)
+    assert utils.find_ctypes_library('c', [str(tmp_path)]) == str(tmp_path / 'libc.so.6')
+    assert os.environ == old_environ
+
+    # Results are memoized.
+    (tmp_path / 'libc.so').unlink()
+    (tmp_path / 'libc.so.6').unlink()
+    assert utils.find_ctypes_library('c', [str(tmp_path)]) == str(tmp_path / 'libc.so.6')
+
+    # Without search paths, the system library is found; unknown libraries are not.
+    assert os.path.basename(utils.find_ctypes_library('c')) == os.path.basename(libc)
+    assert utils.find_ctypes_library('pyinstaller-nonexistent') is None
@@ -18,7 +18,7 @@
     get_module_file_attribute, remove_prefix, remove_suffix, \
     remove_file_extension, is_module_or_submodule, \
     check_requirement
-from PyInstaller.compat import exec_python, is_win
+from PyInstaller.compat import exec_python, importlib_metadata, is_win
 from PyInstaller import log as logging
 
 
@@ -251,6 +251,94 @@ def test_check_requirement_package_not_installed():
     assert not check_requirement('magnumopus-no-package-test-case')
 
 
+def test_distribution_index(tmp_path, monkeypatch):
+    from PyInstaller.utils import hooks as hookutils
+
+    def _make_dist(path, name, version, requires=()):
+        dist_info = path / f'{name.replace("-", "_")}-{version}.dist-info'
+        dist_info.mkdir(parents=True)
+        metadata = ['Metadata-Version: 2.1', f'Name: {name}', f'Version: {version}']
+        metadata += [f'Requires-Dist: {req}' for req in requires]
+        (dist_info / 'METADATA').write_text('\n'.join(metadata) + '\n')
+        (dist_info / 'RECORD').write_text(f'{name.replace("-", "_")}/__init__.py,,\n')
+        return dist_info
+
+    dist_info = _make_dist(tmp_path / 'path1', 'pyi-test-dist', '1.2', ['pyi-test-dep >= 2; python_version >= "3"'])
+    dep_info = _make_dist(tmp_path / 'path1', 'pyi-test-dep', '2.0')
+    # A shadowed copy of the distribution, which must not be picked up.
+    _make_dist(tmp_path / 'path2', 'pyi-test-dist', '0.1')
+
+    monkeypatch.syspath_prepend(str(tmp_path / 'path2'))
+    monkeypatch.syspath_prepend(str(tmp_path / 'path1'))
+
+    assert check_requirement('pyi_test.dist >= 1.0')
+    assert not check_requirement('pyi-test-dist < 1.0')
+    assert hookutils.copy_metadata('PYI_TEST_DIST', recursive=True) == [
+        (str(dist_info), dist_info.name),
+        (str(dep_info), dep_info.name),
+    ]
+
+    distribution_index = hookutils._get_distribution_index()
+    assert set(distribution_index.packages_distributions()['pyi_test_dist']) == {'pyi-test-dist'}
+    package_file = tmp_path / 'path1' / 'pyi_test_dist' / '__init__.py'
+    assert distribution_index.file_distribution(str(package_file)) == 'pyi-test-dist'
+
+    # The index is reused as long as `sys.path` does not change, and rebuilt once it does.
+    assert hookutils._get_distribution_index() is distribution_index
+    monkeypatch.syspath_prepend(str(tmp_path / 'path2'))
+    assert hookutils._get_distribution_index() is not distribution_index
+    assert not check_requirement('pyi-test-dist >= 1.0')
+
+
+# Distributions are keyed by their canonicalized metadata names, so any spelling of the name that
+# ``importlib.metadata.distribution()`` accepts must resolve to the same distribution.
+def test_distribution_index_name_lookup(tmp_path, monkeypatch):
+    from PyInstaller.utils import hooks as hookutils
+
+    for name in ('pyi.test-dist_x', 'Pyi_Test.Other'):
+        # Installers escape the name in the directory name, but keep it verbatim in the metadata.
+        dist_info = tmp_path / f'{re.sub(r"[-_.]+", "_", name)}-1.0.dist-info'
+        dist_info.mkdir()
+        (dist_info / 'METADATA').write_text(f'Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    distribution_index = hookutils._get_distribution_index()
+    for query in (
+        'pyi.test-dist_x',
+        'pyi-test-dist-x',
+        'PYI_TEST_DIST_X',
+        'pyi..test__dist-x',
+        'Pyi_Test.Other',
+        'pyi-test-other',
+        'pyi.test.other',
+    ):
+        expected = importlib_metadata.distribution(query)
+        dist = distribution_index.distribution(query)
+        assert dist.metadata['Name'] == expected.metadata['Name']
+        assert dist._path == expected._path
+
+
+# ``get_installer`` should resolve submodules, which are not listed in the top-level package mapping, via the list of
+# installed files of the distribution.
+def test_get_installer_by_file(tmp_path, monkeypatch):
+    from PyInstaller.utils import hooks as hookutils
+
+    package_dir = tmp_path / 'pyi_test_installer'
+    (package_dir / 'sub').mkdir(parents=True)
+    (package_dir / '__init__.py').touch()
+    (package_dir / 'sub' / '__init__.py').touch()
+
+    dist_info = tmp_path / 'pyi_test_installer-1.0.dist-info'
+    dist_info.mkdir()
+    (dist_info / 'METADATA').write_text('Metadata-Version: 2.1\nName: pyi-test-installer\nVersion: 1.0\n')
+    (dist_info / 'INSTALLER').write_text('pyi-test-installer-tool\n')
+    (dist_info / 'RECORD').write_text('pyi_test_installer/__init__.py,,\npyi_test_installer/sub/__init__.py,,\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert hookutils.get_installer('pyi_test_installer') == 'pyi-test-installer-tool'
+    assert hookutils.get_installer('pyi_test_installer.sub') == 'pyi-test-installer-tool'
+
+
 # An error should be raised if a module, not a package, was passed.
 def test_collect_data_module():
     # 'os' is a module, not a package.
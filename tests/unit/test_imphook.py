@@ -0,0 +1,141 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+import glob
+import json
+import os
+
+import pytest
+
+from PyInstaller.building import cache
+from PyInstaller.depend import imphook
+
+
+class _FakeModuleGraph:
+    pass
+
+
+@pytest.fixture
+def hook_cache_dir(tmp_path, monkeypatch):
+    from PyInstaller.config import CONF
+
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setitem(CONF, 'cachedir', str(cache_dir))
+    # Start with empty in-process state.
+    monkeypatch.setattr(imphook, '_hook_index', {})
+    monkeypatch.setattr(imphook, '_hook_index_file', None)
+    monkeypatch.setattr(imphook, '_hook_index_used', set())
+    monkeypatch.setattr(imphook, '_hook_code_objects', {})
+    return cache_dir
+
+
+def _set_mtime(path, mtime):
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_hook_index(tmp_path, hook_cache_dir, monkeypatch):
+    hook_dir = tmp_path / 'hooks'
+    hook_dir.mkdir()
+    for name in ('foo', 'foo.bar', 'baz'):
+        (hook_dir / f'hook-{name}.py').write_text("hiddenimports = []\n")
+    (hook_dir / 'not-a-hook.py').write_text("")
+    _set_mtime(hook_dir, 10**18)
+
+    graph = _FakeModuleGraph()
+    hooks = imphook.ModuleHookCache(graph, [(str(hook_dir), 0)])
+    assert sorted(hooks) == ['baz', 'foo', 'foo.bar']
+    assert hooks['foo.bar'].hook_filename == str(hook_dir / 'hook-foo.bar.py')
+
+    # The index is persisted in the cache directory.
+    with open(hook_cache_dir / cache.HOOK_INDEX_FILENAME, encoding='utf-8') as fp:
+        index = json.load(fp)
+    assert list(index) == [str(hook_dir)]
+    assert index[str(hook_dir)][:2] == [10**18, ['baz', 'foo', 'foo.bar']]
+
+    # As long as the directory is not modified, it is not scanned again; not even in a new process (simulated by
+    # clearing the in-memory index).
+    def _fail(*args, **kwargs):
+        raise AssertionError("Hook directory was scanned!")
+
+    monkeypatch.setattr(imphook, '_hook_index', {})
+    monkeypatch.setattr(imphook, '_hook_index_file', None)
+    with monkeypatch.context() as m:
+        m.setattr(glob, 'glob', _fail)
+        assert sorted(imphook.ModuleHookCache(graph, [(str(hook_dir), 0)])) == ['baz', 'foo', 'foo.bar']
+
+    # Adding a hook modifies the directory, which invalidates the index entry.
+    (hook_dir / 'hook-qux.py').write_text("")
+    _set_mtime(hook_dir, 10**18 + 1)
+    assert sorted(imphook.ModuleHookCache(graph, [(str(hook_dir), 0)])) == ['baz', 'foo', 'foo.bar', 'qux']
+
+    # Recently modified directories are not indexed.
+    (hook_dir / 'hook-quux.py').write_text("")
+    assert 'quux' in imphook.ModuleHookCache(graph, [(str(hook_dir), 0)])
+    assert 'quux' not in imphook._hook_index[str(hook_dir)][1]
+
+    with pytest.raises(FileNotFoundError):
+        imphook.ModuleHookCache(graph, [(str(tmp_path / 'nonexistent'), 0)])
+
+
+def test_hook_index_pruning(tmp_path, hook_cache_dir, monkeypatch):
+    graph = _FakeModuleGraph()
+    hook_dirs = {}
+    for name in ('used', 'unused', 'stale', 'deleted'):
+        hook_dir = hook_dirs[name] = tmp_path / name
+        hook_dir.mkdir()
+        (hook_dir / f'hook-{name}.py').write_text("")
+        _set_mtime(hook_dir, 10**18)
+        imphook.ModuleHookCache(graph, [(str(hook_dir), 0)])
+    assert sorted(imphook._hook_index) == sorted(str(hook_dir) for hook_dir in hook_dirs.values())
+
+    # Simulate a new process, in which only one of the directories is used.
+    monkeypatch.setattr(imphook, '_hook_index', {})
+    monkeypatch.setattr(imphook, '_hook_index_file', None)
+    monkeypatch.setattr(imphook, '_hook_index_used', set())
+    with open(hook_cache_dir / cache.HOOK_INDEX_FILENAME, encoding='utf-8') as fp:
+        index = json.load(fp)
+    index[str(hook_dirs['used'])][2] = 0
+    index[str(hook_dirs['stale'])][2] = 0
+    cache._write_json_atomic(str(hook_cache_dir / cache.HOOK_INDEX_FILENAME), index)
+    (hook_dirs['deleted'] / 'hook-deleted.py').unlink()
+    hook_dirs['deleted'].rmdir()
+
+    imphook.ModuleHookCache(graph, [(str(hook_dirs['used']), 0)])
+
+    # The entry of the used directory is kept (and its last use time refreshed); the entries of the directory that no
+    # longer exists and of the directory that was not used for a long time are dropped.
+    with open(hook_cache_dir / cache.HOOK_INDEX_FILENAME, encoding='utf-8') as fp:
+        index = json.load(fp)
+    assert sorted(index) == [str(hook_dirs['unused']), str(hook_dirs['used'])]
+    assert index[str(hook_dirs['used'])][2] > 0
+
+
+def test_hook_code_memo(tmp_path, hook_cache_dir, monkeypatch):
+    hook_file = tmp_path / 'hook-foo.py'
+    hook_file.write_text("hiddenimports = ['bar']\nhook_file = __file__\n")
+
+    module = imphook._load_hook_script('hook_foo', str(hook_file))
+    assert module.hiddenimports == ['bar']
+    assert module.hook_file == str(hook_file)
+
+    # Within the process, the code object is reused.
+    with monkeypatch.context() as m:
+        m.setattr(imphook, 'compile', lambda *args, **kwargs: pytest.fail("Hook was compiled!"), raising=False)
+        module = imphook._load_hook_script('hook_foo', str(hook_file))
+    assert module.hiddenimports == ['bar']
+
+    # The code objects are not persisted in the cache directory, where they could be tampered with.
+    assert not hook_cache_dir.exists() or not any(hook_cache_dir.iterdir())
+
+    # A modified hook script is compiled again.
+    hook_file.write_text("hiddenimports = ['baz']\n")
+    _set_mtime(hook_file, 10**18)
+    assert imphook._load_hook_script('hook_foo', str(hook_file)).hiddenimports == ['baz']
@@ -0,0 +1,112 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+from PyInstaller.utils.cliutils import prune_report
+
+
+def _module(size, *importers, extension=False):
+    entry = {"path": "/src/module.py", "size": size, "importers": list(importers)}
+    if extension:
+        entry["extension"] = True
+    return entry
+
+
+def _origins():
+    return {
+        "modules": {
+            "app": _module(100, ("/src/app.py", "top-level", "script")),
+            "app.cli": _module(50, ("app", "top-level", None)),
+            "app.plugins": _module(200, ("app", "delayed", None)),
+            "app.plugins.extra": _module(300, ("app.plugins", "top-level", None)),
+            "heavy": _module(1000, ("app", "conditional", "/hooks/hook-app.py")),
+            "heavy.core": _module(2000, ("heavy", "top-level", None)),
+            "heavy._speedups": _module(0, ("heavy.core", "top-level", None), extension=True),
+            "shared": _module(10, ("app.plugins", "top-level", None), ("app.cli", "top-level", None)),
+        },
+        "binaries": {
+            "heavy/_speedups.so": {
+                "path": "/src/_speedups.so",
+                "size": 4096,
+                "module": "heavy._speedups"
+            },
+            "libfoo.so.1": {
+                "path": "/usr/lib/libfoo.so.1",
+                "size": 8192
+            },
+            "libbar.so": {
+                "path": "/usr/lib/libbar.so",
+                "size": 16384,
+                "hook": "app"
+            },
+        },
+    }
+
+
+def test_parse_trace():
+    trace = [
+        "import 'app.cli' # <pyimod02_importers.PyiFrozenLoader object at 0x7f>",
+        "import _imp # builtin",
+        "# extension module 'heavy._speedups' loaded from '/tmp/_MEI1234/heavy/_speedups.so'",
+        "     12345:     calling init: /tmp/_MEI1234/libfoo.so.1",
+        "some.module",
+        "# unrelated line",
+    ]
+    modules, libraries = prune_report.parse_trace(trace)
+    assert modules == {"_imp", "app", "app.cli", "heavy", "heavy._speedups", "some", "some.module"}
+    assert libraries == {"/tmp/_MEI1234/libfoo.so.1"}
+
+
+def test_compute_report():
+    modules, libraries = prune_report.parse_trace(["import 'app.cli'", "/tmp/_MEI1234/libfoo.so.1"])
+    report = prune_report.compute_report(_origins(), modules, libraries)
+
+    assert report["unused_modules"] == 6
+    groups = {(group["kind"], group["importer"]): group for group in report["groups"]}
+
+    # Hidden import from hook pulls in the whole `heavy` package.
+    hook_group = groups[("hook", "app")]
+    assert hook_group["hook_file"] == "/hooks/hook-app.py"
+    assert hook_group["exclusive_modules"] == ["heavy", "heavy._speedups", "heavy.core"]
+    assert hook_group["size"] == 3000
+    assert hook_group["extraction_size"] == 4096
+
+    # `app.plugins` pulls in its submodule and `shared`; the latter is also imported directly by loaded `app.cli`, so
+    # dropping `app.plugins` alone would not remove it.
+    import_group = groups[("import", "app")]
+    assert import_group["targets"] == [("app.plugins", "delayed")]
+    assert import_group["modules"] == ["app.plugins", "app.plugins.extra", "shared"]
+    assert import_group["exclusive_modules"] == ["app.plugins", "app.plugins.extra"]
+    assert groups[("import", "app.cli")]["exclusive_modules"] == []
+
+    assert [entry["name"] for entry in report["excludes"]] == ["heavy", "shared"]
+    assert report["excludedimports"] == [{
+        "module": "app",
+        "excludedimports": ["app.plugins"],
+        "size": 500,
+        "extraction_size": 0,
+    }]
+
+    assert report["unused_binaries"] == {
+        "extension module heavy._speedups": [("heavy/_speedups.so", 4096)],
+        "hook for app": [("libbar.so", 16384)],
+    }
+
+
+def test_compute_report_without_library_records():
+    modules, libraries = prune_report.parse_trace(["app", "app.cli", "app.plugins"])
+    report = prune_report.compute_report(_origins(), modules, libraries)
+    assert report["unused_binaries"] is None
+    assert report["excludedimports"] == [{
+        "module": "app.plugins",
+        "excludedimports": ["app.plugins.extra", "shared"],
+        "size": 300,
+        "extraction_size": 0,
+    }]
@@ -9,6 +9,8 @@
 # SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
 #-----------------------------------------------------------------------------
 
+import os
+import pickle
 import types
 import pytest
 import itertools
@@ -257,3 +259,122 @@ def test_metadata_searching():
 
     self = FakeGraph("import pkg_resources; pkg_resources.require('pyinstaller')")
     assert with_dependencies == self.metadata_required()
+
+
+def test_base_modules_snapshot(monkeypatch, tmp_path):
+    from PyInstaller import compat
+    from PyInstaller.building import cache
+    from PyInstaller.depend.utils import create_py3_base_library
+
+    monkeypatch.setattr('PyInstaller.config.CONF', {'cachedir': str(tmp_path / 'cache'), 'pathex': []})
+    monkeypatch.setattr(analysis, '_cached_module_graph_', None)
+    monkeypatch.setattr(cache, '_stats', {})
+    # Speed up the analysis by using a subset of base modules.
+    monkeypatch.setattr(analysis, 'PY3_BASE_MODULES', {'codecs', 'textwrap', 'pyi_snapshot_pkg'})
+    monkeypatch.setattr(compat, 'PY3_BASE_MODULES', {'codecs', 'textwrap', 'pyi_snapshot_pkg'})
+    # Directory on the search path in which a base module will be shadowed after the snapshot was created, and which
+    # contains a package whose modules will be modified.
+    monkeypatch.syspath_prepend(str(tmp_path / 'shadow'))
+    pkg_dir = tmp_path / 'shadow' / 'pyi_snapshot_pkg'
+    pkg_dir.mkdir(parents=True)
+    (pkg_dir /
+     '__init__.py').write_text('from . import sub\ntry:\n    from . import extra\nexcept ImportError:\n    pass\n')
+    (pkg_dir / 'sub.py').write_text('')
+
+    def _get_nodes(mg):
+        return sorted((n.identifier, type(n).__name__, n.filename) for n in mg.iter_graph())
+
+    mg1 = analysis.initialize_modgraph()
+    assert cache._stats['snapshots'] == {'hits': 0, 'misses': 1, 'bytes_saved': 0}
+
+    monkeypatch.setattr(analysis, '_cached_module_graph_', None)
+    mg2 = analysis.initialize_modgraph()
+    assert cache._stats['snapshots'] == {'hits': 1, 'misses': 1, 'bytes_saved': 0}
+    assert _get_nodes(mg2) == _get_nodes(mg1)
+    assert mg2._hooks is not None
+
+    # The base_library.zip created from the graph loaded from the snapshot is reused as well.
+    create_py3_base_library(str(tmp_path / 'base_library1.zip'), mg1)
+    create_py3_base_library(str(tmp_path / 'base_library2.zip'), mg2)
+    assert cache._stats['snapshots']['hits'] == 2
+    assert (tmp_path / 'base_library1.zip').read_bytes() == (tmp_path / 'base_library2.zip').read_bytes()
+
+    # Modifying a submodule of a package invalidates the snapshot.
+    (pkg_dir / 'sub.py').write_text('import textwrap\n')
+    os.utime(pkg_dir / 'sub.py', ns=(10**18, 10**18))
+    monkeypatch.setattr(analysis, '_cached_module_graph_', None)
+    mg3 = analysis.initialize_modgraph()
+    assert 'textwrap' in mg3.find_node('pyi_snapshot_pkg.sub').code.co_names
+
+    # So does adding a submodule that was missing when the snapshot was created.
+    (pkg_dir / 'extra.py').write_text('')
+    os.utime(pkg_dir, ns=(10**18, 10**18))
+    monkeypatch.setattr(analysis, '_cached_module_graph_', None)
+    mg4 = analysis.initialize_modgraph()
+    assert type(mg4.find_node('pyi_snapshot_pkg.extra')).__name__ == 'SourceModule'
+
+    # Shadowing a base module invalidates the snapshot.
+    (tmp_path / 'shadow' / 'codecs.py').write_text('')
+    monkeypatch.setattr(analysis, '_cached_module_graph_', None)
+    mg5 = analysis.initialize_modgraph()
+    assert mg5.find_node('codecs').filename == str(tmp_path / 'shadow' / 'codecs.py')
+
+
+class _SnapshotPayload:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (os.mkdir, (self.path,))
+
+
+def test_base_modules_snapshot_globals(tmp_path):
+    from PyInstaller.building import cache
+
+    # A snapshot that references anything but the module graph classes is rejected, without instantiating anything.
+    snapshot_cache = cache.SnapshotCache(str(tmp_path / 'cache'))
+    snapshot_cache.store(
+        snapshot_cache.make_key('fingerprint', analysis.BASE_MODULEGRAPH_SNAPSHOT_NAME),
+        pickle.dumps(_SnapshotPayload(str(tmp_path / 'payload'))),
+    )
+    assert analysis._read_base_snapshot(str(tmp_path / 'cache'), 'fingerprint') is None
+    assert not (tmp_path / 'payload').exists()
+
+
+def test_graph_dump(fresh_pyi_modgraph, tmpdir):
+    import io
+    from PyInstaller.utils.cliutils import render_graph
+
+    mg = fresh_pyi_modgraph
+    tmpdir.join('pyi_dumpmod.py').write('import pyi_dumpmod_missing\n')
+    script = tmpdir.join('script.py')
+    script.write('try:\n    import pyi_dumpmod\nexcept ImportError:\n    pass\n')
+    mg.path = [str(tmpdir)] + mg.path
+    mg.add_script(str(script))
+
+    fp = io.StringIO()
+    mg.write_graph_dump(fp)
+    scripts, nodes, edges = render_graph.load_graph(fp.getvalue().splitlines())
+
+    assert scripts == [str(script)]
+    assert nodes['pyi_dumpmod']['type'] == 'SourceModule'
+    assert nodes['pyi_dumpmod']['size'] == len('import pyi_dumpmod_missing\n')
+    assert nodes['pyi_dumpmod_missing']['type'] == 'MissingModule'
+    assert nodes['pyi_dumpmod_missing']['filename'] is None
+
+    edges = {tuple(edge['edge']): edge for edge in edges}
+    script_edge = edges[(str(script), 'pyi_dumpmod')]
+    assert script_edge['flags']['tryexcept'] and not script_edge['flags']['function']
+    assert script_edge['origin'] == 'script'
+    assert not edges[('pyi_dumpmod', 'pyi_dumpmod_missing')]['flags']['tryexcept']
+
+    # The importers of the missing module, as reported in the warnings file.
+    assert [name for name, _ in mg.get_importers('pyi_dumpmod_missing')] == ['pyi_dumpmod']
+
+    # Render the dump.
+    out = io.StringIO()
+    render_graph.render_xref(scripts, nodes, list(edges.values()), out)
+    assert '<a href="#pyi_dumpmod_missing">pyi_dumpmod_missing</a>' in out.getvalue()
+    out = io.StringIO()
+    render_graph.render_dot(scripts, nodes, list(edges.values()), out)
+    assert '-> "pyi_dumpmod" [style="dashed"];' in out.getvalue()
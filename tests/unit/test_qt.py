@@ -0,0 +1,101 @@
+#-----------------------------------------------------------------------------
+# Copyright (c) 2024, PyInstaller Development Team.
+#
+# Distributed under the terms of the GNU General Public License (version 2
+# or later) with exception for distributing the bootloader.
+#
+# The full license is in the file COPYING.txt, distributed with this software.
+#
+# SPDX-License-Identifier: (GPL-2.0-or-later WITH Bootloader-exception)
+#-----------------------------------------------------------------------------
+
+import os
+import pathlib
+
+import pytest
+
+from PyInstaller import compat
+from PyInstaller.depend import bindepend
+from PyInstaller.utils.hooks.qt import QtLibraryInfo
+
+
+# Create a fake PySide6 installation with two image format plugins and two QML plugins; one of each links against a Qt
+# library that is missing from the Qt library directory.
+def _create_qt_installation(tmp_path):
+    qt_lib_dir = tmp_path / 'lib'
+    qt_lib_dir.mkdir(parents=True)
+    (qt_lib_dir / 'libQt6Gui.so.6').touch()
+
+    plugins_dir = tmp_path / 'plugins' / 'imageformats'
+    plugins_dir.mkdir(parents=True)
+    (plugins_dir / 'libqgif.so').touch()
+    (plugins_dir / 'libqpdf.so').touch()
+
+    qml_dir = tmp_path / 'qml'
+    for name in ('QtQuick', 'QtPdf'):
+        (qml_dir / name).mkdir(parents=True)
+        (qml_dir / name / 'qmldir').write_text(f"module {name}\nplugin {name.lower()}plugin\n")
+        (qml_dir / name / f'lib{name.lower()}plugin.so').touch()
+        (qml_dir / name / 'plugins.qmltypes').touch()
+
+    imports = {
+        'libqgif.so': 'libQt6Gui.so.6',
+        'libqpdf.so': 'libQt6Pdf.so.6',
+        'libqtquickplugin.so': 'libQt6Gui.so.6',
+        'libqtpdfplugin.so': 'libQt6Pdf.so.6',
+    }
+
+    def _get_imports(filename, search_paths=None):
+        lib_name = imports[os.path.basename(filename)]
+        lib_path = qt_lib_dir / lib_name
+        return {(lib_name, str(lib_path) if lib_path.exists() else None), ('libc.so.6', '/lib/libc.so.6')}
+
+    return _get_imports
+
+
+def _create_qt_library_info(tmp_path):
+    info = QtLibraryInfo('PySide6')
+    info.version = [6, 6, 0]
+    info.location = {'PluginsPath': str(tmp_path / 'plugins'), 'QmlImportsPath': str(tmp_path / 'qml')}
+    info.qt_lib_dir = (tmp_path / 'lib').resolve()
+    return info
+
+
+@pytest.mark.skipif(not compat.is_linux, reason="Fake Qt installation uses Linux shared library names.")
+def test_qt_plugin_dependency_graph(tmp_path, monkeypatch):
+    from PyInstaller.config import CONF
+
+    monkeypatch.setitem(CONF, 'cachedir', str(tmp_path / 'cache'))
+    get_imports = _create_qt_installation(tmp_path / 'qt')
+    info = _create_qt_library_info(tmp_path / 'qt')
+
+    analyzed_files = []
+
+    def _get_imports_counted(filename, search_paths=None):
+        analyzed_files.append(os.path.basename(filename))
+        return get_imports(filename, search_paths)
+
+    monkeypatch.setattr(bindepend, 'get_imports', _get_imports_counted)
+
+    plugins = info.collect_plugins('imageformats')
+    assert [os.path.basename(src) for src, dest in plugins] == ['libqgif.so']
+    binaries, datas = info.collect_qtqml_files()
+    assert [pathlib.Path(src).name for src, dest in binaries] == ['libqtquickplugin.so']
+    assert sorted(pathlib.Path(src).name for src, dest in datas) == ['plugins.qmltypes', 'qmldir']
+
+    # All plugin binaries are analyzed once, and validated via graph lookups.
+    assert sorted(analyzed_files) == sorted(['libqgif.so', 'libqpdf.so', 'libqtquickplugin.so', 'libqtpdfplugin.so'])
+    assert info.collect_plugins('imageformats') == plugins
+    assert len(analyzed_files) == 4
+
+    # Another instance (e.g., in a subsequent build) reads the graph from the cache.
+    analyzed_files.clear()
+    other_info = _create_qt_library_info(tmp_path / 'qt')
+    assert other_info.collect_plugins('imageformats') == plugins
+    assert analyzed_files == []
+
+    # A modified plugin binary invalidates the cached graph.
+    os.utime(tmp_path / 'qt' / 'plugins' / 'imageformats' / 'libqpdf.so', ns=(0, 0))
+    other_info._plugin_dependencies = None
+    assert other_info.collect_plugins('imageformats') == plugins
+    assert len(analyzed_files) == 4
@@ -154,6 +154,37 @@ def test_normalize_toc_with_parent_pardir_loops():
     assert sorted(normalized_toc) == sorted(expected_toc)
 
 
+def test_normalize_toc_multiple_tocs():
+    # Normalizing multiple TOCs must be equivalent to normalizing their concatenation.
+    toc1 = copy.copy(_BASE_TOC)
+    toc2 = [
+        ('README', '/home/user/tmp/README', 'BINARY'),
+        ('libsomething.so', '/opt/something/lib/libsomething.so', 'BINARY'),
+        ('new-file.txt', '/home/user/tmp/new-file.txt', 'DATA'),
+    ]
+    expected_toc = normalize_toc(toc1 + toc2)
+
+    assert normalize_toc(toc1, toc2) == expected_toc
+    # Same when the first TOC is an already-normalized TOC (with index).
+    assert normalize_toc(normalize_toc(toc1), toc2) == expected_toc
+
+
+def test_normalize_toc_indexed_toc_modifications():
+    # In-place modifications of a normalized TOC must be taken into account by subsequent normalization.
+    toc = normalize_toc(_BASE_TOC)
+    toc.append(('README', '/home/user/tmp/README', 'BINARY'))
+    toc[0] = ('libpython3.10.so', '/usr/lib64/libpython3.10.so', 'DATA')
+    toc.insert(0, ('libpython3.10.so', '/usr/lib64/libpython3.10.so', 'BINARY'))
+    toc += [('dependency.bin', 'dependency.bin', 'DATA')]
+
+    assert normalize_toc(toc) == normalize_toc(list(toc))
+
+    # Normalized TOC behaves as a plain list, and is pickled as such.
+    assert normalize_toc(_BASE_TOC) == _BASE_TOC
+    assert normalize_toc(_BASE_TOC) + [] == _BASE_TOC
+    assert type(copy.copy(normalize_toc(_BASE_TOC))) is list
+
+
 # Tests for PYZ TOC normalization.
 _BASE_PYZ_TOC = [
     ('copy', '/usr/lib64/python3.11/copy.py', 'PYMODULE'),